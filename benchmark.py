@@ -0,0 +1,212 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+
+import prereq_alg as pa
+import class_algorithmn as ca
+from synthetic_catalog import generate_catalog
+
+
+# Benchmarks the parser and scheduler hot paths on seeded synthetic
+# catalogs. Each stage reports throughput, per-call latency
+# percentiles and peak traced memory; results are compared against
+# benchmark_baseline.json (written with --save-baseline) and any stage
+# that got slower or bigger than the tolerance is flagged.
+#
+#   python benchmark.py                      # default sizes, compare
+#   python benchmark.py --sizes 1000 20000
+#   python benchmark.py --save-baseline
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_SIZES = [1000, 5000, 20000]
+TOLERANCE = 0.25
+
+# the original build_schedule rescans every remaining course each
+# semester (quadratic); above this it is left to the ready queue
+SCHEDULE_MAX_COURSES = 2000
+
+
+# ───────────────────────── Measuring ─────────────────────────
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def peak_memory(fn):
+    # KiB allocated at the high-water mark of one untimed run
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def measure_each(fn, items):
+    # one call per item, each call timed
+    latencies = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for item in items:
+        t0 = clock()
+        fn(item)
+        latencies.append(clock() - t0)
+    seconds = (clock() - start) / 1e9
+
+    latencies.sort()
+    return {
+        "items": len(items),
+        "seconds": seconds,
+        "per_sec": len(items) / seconds if seconds else float("inf"),
+        "p50_us": percentile(latencies, 0.50) / 1000,
+        "p95_us": percentile(latencies, 0.95) / 1000,
+        "p99_us": percentile(latencies, 0.99) / 1000,
+        "peak_kib": peak_memory(lambda: [fn(item) for item in items])
+    }
+
+
+def measure_whole(fn, items, repeats):
+    # fn works on the whole catalog; each repeat is one latency sample
+    latencies = []
+    for _ in range(repeats):
+        t0 = time.perf_counter_ns()
+        fn()
+        latencies.append(time.perf_counter_ns() - t0)
+    seconds = sum(latencies) / 1e9
+
+    latencies.sort()
+    return {
+        "items": items * repeats,
+        "seconds": seconds,
+        "per_sec": items * repeats / seconds if seconds else float("inf"),
+        "p50_us": percentile(latencies, 0.50) / 1000,
+        "p95_us": percentile(latencies, 0.95) / 1000,
+        "p99_us": percentile(latencies, 0.99) / 1000,
+        "peak_kib": peak_memory(fn)
+    }
+
+
+# ───────────────────────── Stages ─────────────────────────
+
+def run_size(n_courses, seed, repeats):
+    codes, texts = generate_catalog(n_courses, seed=seed)
+    token_lists = [pa.tokenize(t) for t in texts]
+    non_empty = [t for t in token_lists if t]
+    trees = [pa.parse(t)[1] for t in non_empty]
+    prereqs = pa.parse_prereq_json(codes, texts)
+    circuit = ca.compile_prerequisites(prereqs)
+    nodes = list(prereqs.values())
+
+    results = {
+        "tokenize": measure_each(pa.tokenize, texts),
+        "tokenize_fast": measure_each(pa.tokenize_fast, texts),
+        "parse": measure_each(pa.parse, non_empty),
+        "parse_iterative": measure_each(pa.parse_iterative, non_empty),
+        "build_json": measure_each(lambda t: pa.build_json(t, pa.part_label_gen()), trees),
+        "resolve_prereq": measure_each(lambda node: ca.resolve_prereq(node, set()), nodes),
+        "collect_all_courses": measure_whole(
+            lambda: ca.collect_all_courses(prereqs), len(prereqs), repeats
+        ),
+        "compile_prerequisites": measure_whole(
+            lambda: ca.compile_prerequisites(prereqs), len(prereqs), repeats
+        ),
+        "build_schedule_ready": measure_whole(
+            lambda: ca.build_schedule_ready(0, circuit), len(circuit.courses), repeats
+        ),
+    }
+    if n_courses <= SCHEDULE_MAX_COURSES:
+        results["build_schedule"] = measure_whole(
+            lambda: ca.build_schedule(0, circuit), len(circuit.courses), 1
+        )
+    return results
+
+
+def run_suite(sizes=DEFAULT_SIZES, seed=0, repeats=3):
+    report = {
+        "meta": {
+            "seed": seed,
+            "sizes": list(sizes),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "when": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": {}
+    }
+    for n in sizes:
+        for stage, stats in run_size(n, seed, repeats).items():
+            report["results"][f"{n}/{stage}"] = stats
+            print(f"{n:>6} {stage:<22} {stats['per_sec']:>12,.0f}/s  "
+                  f"p50 {stats['p50_us']:>10.1f}us  p95 {stats['p95_us']:>10.1f}us  "
+                  f"p99 {stats['p99_us']:>10.1f}us  peak {stats['peak_kib']:>9.0f} KiB")
+    return report
+
+
+# ───────────────────────── Baseline ─────────────────────────
+
+def compare(report, baseline, tolerance=TOLERANCE):
+    # -> [(key, metric, baseline value, current value)] past tolerance
+    regressions = []
+    for key, now in report["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        if now["per_sec"] < before["per_sec"] * (1 - tolerance):
+            regressions.append((key, "per_sec", before["per_sec"], now["per_sec"]))
+        for metric in ("p95_us", "peak_kib"):
+            if now[metric] > before[metric] * (1 + tolerance):
+                regressions.append((key, metric, before[metric], now[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parser and scheduler benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--report", help="also write this run's results to a JSON file")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.seed, args.repeats)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["meta"]["seed"] != args.seed:
+        print(f"⚠️ Baseline used seed {baseline['meta']['seed']}; catalogs differ")
+
+    regressions = compare(report, baseline, args.tolerance)
+    for key, metric, before, now in regressions:
+        print(f"❌ {key} {metric}: {before:,.1f} -> {now:,.1f}")
+    if regressions:
+        return 1
+    print(f"✅ No stage regressed more than {args.tolerance:.0%} against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+import os
+import sys
+import mmap
+import json
+import time
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from functools import cached_property
+
+import class_algorithmn as ca
+
+
+# Compiled catalog file: the PrereqCircuit arrays written out flat so
+# a scheduler can mmap them instead of loading parsed_prereqs.json and
+# recompiling. Course codes are interned once in a sorted string
+# table; every node refers to courses by index.
+#
+#   header   magic, version, byte order, then (offset, length) per section
+#   sections 8-byte aligned native-endian arrays, in SECTIONS order
+#
+# Worker processes that open the same file share its pages through the
+# OS cache; a MappedCircuit pickles as just its path.
+
+MAGIC = b"REGCAT\0\0"
+VERSION = 1
+
+SECTIONS = [
+    # name          typecode  contents
+    ("str_offsets", "I"),     # n_courses + 1 byte offsets into str_data
+    ("str_data",    "B"),     # UTF-8 course codes, sorted
+    ("kind",        "B"),     # NODE_* per node
+    ("ref",         "i"),     # course index for SINGLE/COURSE nodes, else -1
+    ("child_start", "I"),
+    ("child_end",   "I"),
+    ("children",    "I"),
+    ("first",       "i"),     # per course: first node of its tree
+    ("root",        "i"),     # per course: root node, -1 without a tree
+    ("parent",      "i"),     # per node
+    ("owner",       "i"),     # per node: course whose tree it is in
+    ("dep_start",   "I"),     # n_courses + 1 offsets into dep_nodes
+    ("dep_nodes",   "I"),     # leaf nodes mentioning each course
+]
+HEADER = struct.Struct("<8sHB5x" + "QQ" * len(SECTIONS))
+BYTE_ORDER = {"little": 0, "big": 1}
+
+
+# ───────────────────────── Writing ─────────────────────────
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def write_catalog(prereqs, path: str):
+    # prereqs: build_json output per course (parse_prereq_json result)
+    circuit = ca.compile_prerequisites(prereqs)
+
+    encoded = [c.encode("utf-8") for c in circuit.courses]
+    str_offsets = array("I", [0])
+    for code in encoded:
+        str_offsets.append(str_offsets[-1] + len(code))
+
+    dep_start = array("I", [0])
+    dep_nodes = array("I")
+    for nodes in circuit.dependents:
+        dep_nodes.extend(nodes)
+        dep_start.append(len(dep_nodes))
+
+    data = {
+        "str_offsets": str_offsets,
+        "str_data": array("B", b"".join(encoded)),
+        "kind": array("B", circuit.kind),
+        "ref": array("i", [b.bit_length() - 1 for b in circuit.bit]),
+        "child_start": array("I", circuit.child_start),
+        "child_end": array("I", circuit.child_end),
+        "children": array("I", circuit.children),
+        "first": array("i", circuit.first),
+        "root": array("i", circuit.root),
+        "parent": array("i", circuit.parent),
+        "owner": array("i", circuit.owner),
+        "dep_start": dep_start,
+        "dep_nodes": dep_nodes,
+    }
+
+    table = []
+    offset = _align(HEADER.size)
+    for name, _ in SECTIONS:
+        length = len(data[name]) * data[name].itemsize
+        table += [offset, length]
+        offset = _align(offset + length)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDER[sys.byteorder], *table))
+        for (name, _), start in zip(SECTIONS, table[::2]):
+            f.write(b"\0" * (start - f.tell()))
+            data[name].tofile(f)
+    os.replace(tmp, path)
+    return len(circuit.courses)
+
+
+# ───────────────────────── Lazy Views ─────────────────────────
+
+class CourseTable(Sequence):
+    # course codes decoded from the string table on first access
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+        self.cache = [None] * (len(offsets) - 1)
+
+    def __len__(self):
+        return len(self.cache)
+
+    def __getitem__(self, i):
+        code = self.cache[i]
+        if code is None:
+            code = self.cache[i] = str(self.data[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+        return code
+
+
+class CourseIndex(Mapping):
+    # code -> index by binary search over the sorted table; no dict
+    def __init__(self, courses):
+        self.courses = courses
+
+    def __getitem__(self, code):
+        i = bisect_left(self.courses, code)
+        if i < len(self.courses) and self.courses[i] == code:
+            return i
+        raise KeyError(code)
+
+    def __iter__(self):
+        return iter(self.courses)
+
+    def __len__(self):
+        return len(self.courses)
+
+
+class Ragged(Sequence):
+    # [values[start[i]:start[i + 1]]] without building the lists
+    def __init__(self, start, values):
+        self.start = start
+        self.values = values
+
+    def __len__(self):
+        return len(self.start) - 1
+
+    def __getitem__(self, i):
+        return self.values[self.start[i]:self.start[i + 1]]
+
+
+# ───────────────────────── Loading ─────────────────────────
+
+class MappedCircuit(ca.PrereqCircuit):
+    # drop-in PrereqCircuit backed by a compiled catalog file; the
+    # arrays are memoryviews straight into the mapping
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, order, *table = HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled catalog")
+        if version != VERSION:
+            raise ValueError(f"{path} is catalog format {version}, expected {VERSION}")
+        if order != BYTE_ORDER[sys.byteorder]:
+            raise ValueError(f"{path} was written on a machine with the other byte order")
+
+        view = memoryview(self._mm)
+        arrays = {
+            name: view[start:start + length].cast(code)
+            for (name, code), start, length in zip(SECTIONS, table[::2], table[1::2])
+        }
+
+        self.courses = CourseTable(arrays["str_offsets"], arrays["str_data"])
+        self.index = CourseIndex(self.courses)
+        self.full_mask = (1 << len(self.courses)) - 1
+
+        self.kind = arrays["kind"]
+        self.ref = arrays["ref"]
+        self.child_start = arrays["child_start"]
+        self.child_end = arrays["child_end"]
+        self.children = arrays["children"]
+        self.first = arrays["first"]
+        self.root = arrays["root"]
+        self.parent = arrays["parent"]
+        self.owner = arrays["owner"]
+        self.dependents = Ragged(arrays["dep_start"], arrays["dep_nodes"])
+
+    @cached_property
+    def bit(self):
+        # masks are Python ints; built on the first evaluation
+        return [1 << r if r >= 0 else 0 for r in self.ref]
+
+    def __reduce__(self):
+        return (MappedCircuit, (self.path,))
+
+    def tree(self, course: str):
+        # the course's prerequisite dict, rebuilt in resolve_prereq's
+        # shape ("courses" before "parts"); labels and notes are not kept
+        i = self.index.get(course)
+        if i is None or self.root[i] < 0:
+            return None
+        return self._node_dict(self.root[i])
+
+    def _node_dict(self, k):
+        t = self.kind[k]
+        if t == ca.NODE_SINGLE:
+            return {"type": "single", "course": self.courses[self.ref[k]]}
+        if t == ca.NODE_NONE:
+            return {"type": "none"}
+
+        node = {"type": "or" if t == ca.NODE_OR else "and"}
+        kids = self.children[self.child_start[k]:self.child_end[k]]
+        courses = [self.courses[self.ref[j]] for j in kids if self.kind[j] == ca.NODE_COURSE]
+        parts = [self._node_dict(j) for j in kids if self.kind[j] != ca.NODE_COURSE]
+        if courses:
+            node["courses"] = courses
+        if parts:
+            node["parts"] = parts
+        return node
+
+    def prerequisites(self):
+        return {
+            self.courses[i]: self._node_dict(r)
+            for i, r in enumerate(self.root) if r >= 0
+        }
+
+
+def load_catalog(path: str) -> MappedCircuit:
+    return MappedCircuit(path)
+
+
+# ───────────────────────── Convert ─────────────────────────
+
+def convert_json(json_file: str, catalog_file: str):
+    with open(json_file) as f:
+        prereqs = json.load(f)
+    return write_catalog(prereqs, catalog_file)
+
+
+if __name__ == "__main__":
+    save_dir = r"C:/Users/PC4/OneDrive/Desktop/reg classproject"
+    json_file = save_dir + "/parsed_prereqs.json"
+    catalog_file = save_dir + "/catalog.rgc"
+
+    n = convert_json(json_file, catalog_file)
+
+    t0 = time.perf_counter()
+    circuit = load_catalog(catalog_file)
+    t1 = time.perf_counter()
+    print(f"✅ {n} courses compiled to {catalog_file} "
+          f"({os.path.getsize(catalog_file)} bytes, loads in {(t1 - t0) * 1000:.2f} ms)")
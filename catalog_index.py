@@ -0,0 +1,217 @@
+import json
+import hashlib
+from collections import deque
+
+import class_algorithmn as ca
+
+
+# Precomputed catalog-wide facts, all as course bitmasks over the
+# circuit's course order:
+#   prereq_closure[i]   every course mentioned anywhere below course i,
+#                       transitively (all options of an OR count)
+#   unlocks_direct[i]   courses whose own tree mentions course i
+#   unlocks_closure[i]  courses that transitively build on course i
+#   height[i]           longest prerequisite chain below course i
+#   tail[i]             longest chain of courses that can follow course i
+#   order               course indices, prerequisites first (None on a
+#                       prerequisite cycle); position[i] is i's place in it
+# Built once per circuit (and once per prerequisites content through
+# index_for_prerequisites); every lookup afterwards is a list index.
+
+class CatalogIndex:
+    def __init__(self, circuit):
+        self.circuit = circuit
+        n = len(circuit.courses)
+        kind, bit = circuit.kind, circuit.bit
+
+        # direct edges: courses mentioned in i's tree, and the reverse
+        self.mentions = [0] * n
+        for i in range(n):
+            r = circuit.root[i]
+            m = 0
+            for k in range(circuit.first[i], r + 1):
+                if kind[k] == ca.NODE_SINGLE or kind[k] == ca.NODE_COURSE:
+                    m |= bit[k]
+            self.mentions[i] = m
+
+        below = [list(circuit.indices_of(m)) for m in self.mentions]
+        above = [[] for _ in range(n)]
+        self.unlocks_direct = [0] * n
+        for i, js in enumerate(below):
+            for j in js:
+                above[j].append(i)
+                self.unlocks_direct[j] |= 1 << i
+
+        order = _topological_order(below, above)
+        self.order = self.position = None
+        if len(order) == n:
+            self.order = order
+            self.position = [0] * n
+            for p, i in enumerate(order):
+                self.position[i] = p
+            self.prereq_closure = _closure(order, below, self.mentions)
+            self.unlocks_closure = _closure(order[::-1], above, self.unlocks_direct)
+            self.height = _chain(order, below)
+            self.tail = _chain(order[::-1], above)
+        else:
+            # a prerequisite cycle: relax everything to a fixpoint
+            # (chains through a cycle are capped at n)
+            self.prereq_closure = _closure_fixpoint(below, self.mentions)
+            self.unlocks_closure = _closure_fixpoint(above, self.unlocks_direct)
+            self.height = _chain_fixpoint(below)
+            self.tail = _chain_fixpoint(above)
+
+    # ---------- lookups ----------
+
+    def unlocks_mask(self, course, transitive=True):
+        i = self.circuit.index.get(course)
+        if i is None:
+            return 0
+        return (self.unlocks_closure if transitive else self.unlocks_direct)[i]
+
+    def unlocks(self, course, transitive=True):
+        return self.circuit.courses_of(self.unlocks_mask(course, transitive))
+
+    def requires_mask(self, course):
+        i = self.circuit.index.get(course)
+        return 0 if i is None else self.prereq_closure[i]
+
+    def requires(self, course):
+        return self.circuit.courses_of(self.requires_mask(course))
+
+    def depth(self, course):
+        # longest chain still ahead once the course is taken
+        i = self.circuit.index.get(course)
+        return 0 if i is None else self.tail[i]
+
+    def priority(self, course):
+        # ScheduleEngine priority: longest remaining chain first, then code
+        i = self.circuit.index.get(course)
+        return (-self.tail[i] if i is not None else 0, course)
+
+
+# ───────────────────────── Graph Passes ─────────────────────────
+
+def _topological_order(below, above):
+    # Kahn's algorithm, prerequisites first; shorter than n on a cycle
+    pending = [len(js) for js in below]
+    queue = deque(i for i, p in enumerate(pending) if not p)
+    order = []
+    while queue:
+        j = queue.popleft()
+        order.append(j)
+        for i in above[j]:
+            pending[i] -= 1
+            if not pending[i]:
+                queue.append(i)
+    return order
+
+
+def _closure(order, edges, direct):
+    closure = list(direct)
+    for i in order:
+        m = closure[i]
+        for j in edges[i]:
+            m |= closure[j]
+        closure[i] = m
+    return closure
+
+
+def _chain(order, edges):
+    length = [0] * len(edges)
+    for i in order:
+        length[i] = max((length[j] + 1 for j in edges[i]), default=0)
+    return length
+
+
+def _closure_fixpoint(edges, direct):
+    closure = list(direct)
+    changed = True
+    while changed:
+        changed = False
+        for i, js in enumerate(edges):
+            m = closure[i]
+            for j in js:
+                m |= closure[j]
+            if m != closure[i]:
+                closure[i] = m
+                changed = True
+    return closure
+
+
+def _chain_fixpoint(edges):
+    # same relaxation as optimal_planner used to run for every search
+    n = len(edges)
+    length = [0] * n
+    for _ in range(n + 1):
+        changed = False
+        for i in range(n):
+            t = max((length[j] + 1 for j in edges[i]), default=0)
+            if t > length[i]:
+                length[i] = min(t, n)
+                changed = True
+        if not changed:
+            break
+    return length
+
+
+# ───────────────────────── Caching ─────────────────────────
+
+_by_fingerprint = {}
+_last_seen = None   # (prereqs dict, shallow copy of it, fingerprint)
+
+
+def catalog_index(circuit) -> CatalogIndex:
+    # one index per compiled circuit, kept on the circuit itself
+    index = circuit.__dict__.get("_catalog_index")
+    if index is None:
+        index = circuit.__dict__["_catalog_index"] = CatalogIndex(circuit)
+    return index
+
+
+def prerequisites_fingerprint(prereqs) -> str:
+    return hashlib.sha256(json.dumps(prereqs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _fingerprint_once(prereqs) -> str:
+    # hashed once per loaded catalog: the same dict passed again, with the
+    # same trees under the same keys, keeps its fingerprint. Comparing the
+    # shallow copy only compares references. Edit a tree in place and the
+    # change goes unseen; replace the tree (or the dict) instead.
+    global _last_seen
+    if _last_seen is not None and _last_seen[0] is prereqs and _last_seen[1] == prereqs:
+        return _last_seen[2]
+    key = prerequisites_fingerprint(prereqs)
+    _last_seen = (prereqs, dict(prereqs), key)
+    return key
+
+
+def index_for_prerequisites(prereqs) -> CatalogIndex:
+    # rebuilt only when the prerequisite content changes
+    key = _fingerprint_once(prereqs)
+    index = _by_fingerprint.get(key)
+    if index is None:
+        _by_fingerprint.clear()
+        index = _by_fingerprint[key] = catalog_index(ca.compile_prerequisites(prereqs))
+    return index
+
+
+# ───────────────────────── Scheduler Mode ─────────────────────────
+
+def build_schedule_critical(start_units, circuit=None, completed=()):
+    # ready-queue plan that starts the longest chains first
+    if circuit is None:
+        circuit = index_for_prerequisites(ca.prerequisites).circuit
+    return ca.build_schedule_ready(
+        start_units, circuit, completed, priority=catalog_index(circuit).priority
+    )
+
+
+if __name__ == "__main__":
+    index = index_for_prerequisites(ca.prerequisites)
+    for course in ("STA 035A", "MAT 021B", "STA 013"):
+        print(f"{course} unlocks: {', '.join(index.unlocks(course)) or 'nothing'} "
+              f"(chain depth {index.depth(course)})")
+
+    for s in build_schedule_critical(start_units=32):
+        print(f"Semester {s['semester']} (Pass 1 day {s['pass1_day']}): {', '.join(s['courses'])}")
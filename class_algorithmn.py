@@ -18,7 +18,12 @@ MAX_COURSES_PER_SEMESTER = 4
 # None  -> does NOT fill during Pass 1
 # Int N -> fills on Pass 1 day N
 # ─────────────────────────────────────────────────────────────
+import os
 import csv
+import json
+import heapq
+
+import instrumentation as inst
 
 #COURSE_TRACKER_CSV = (
 #    "C:/Users/PC4/OneDrive/Desktop/reg classproject/course_open_tracker.csv"
@@ -45,6 +50,31 @@ COURSE_FILL_DAYS = {
     "GE HUM": None,
 }
 
+# Fill days fitted from the seat history by fill_model.refit(); when the
+# table exists its courses override the embedded values above.
+FILL_DAYS_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fill_days.json")
+
+_EMBEDDED_FILL_DAYS = dict(COURSE_FILL_DAYS)
+
+def read_fill_days(path=FILL_DAYS_TABLE):
+    # -> a new {course: fill day} dict: the embedded values, overridden
+    # by the fitted table when it exists
+    fill_days = dict(_EMBEDDED_FILL_DAYS)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            fill_days.update(json.load(f)["fill_days"])
+    return fill_days
+
+def load_fill_days(path=FILL_DAYS_TABLE):
+    # swaps in a freshly read table as one assignment, so a reload drops
+    # courses that left the table and code planning meanwhile sees the
+    # old table or the new one, never a half-filled one. Read it as
+    # ca.COURSE_FILL_DAYS, not through a reference taken at import.
+    global COURSE_FILL_DAYS
+    COURSE_FILL_DAYS = read_fill_days(path)
+
+load_fill_days()
+
 # ─────────────────────────────────────────────────────────────
 # PREREQUISITE STRUCTURE
 # ─────────────────────────────────────────────────────────────
@@ -107,10 +137,12 @@ def course_available(course, pass1_day):
 # ─────────────────────────────────────────────────────────────
 
 def resolve_prereq(node, completed):
-    if node["type"] == "single":
+    if inst.ENABLED:
+        inst.count("resolve_prereq_calls")
+    if node.get("type") == "single":   # {} = no prerequisite text
         return set() if node["course"] in completed else {node["course"]}
 
-    if node["type"] == "or":
+    if node.get("type") == "or":
         best = None
         for opt in node.get("courses", []) + node.get("parts", []):
             needed = {opt} if isinstance(opt, str) else resolve_prereq(opt, completed)
@@ -118,7 +150,7 @@ def resolve_prereq(node, completed):
                 best = needed
         return best or set()
 
-    if node["type"] == "and":
+    if node.get("type") == "and":
         req = set()
         for part in node.get("courses", []) + node.get("parts", []):
             req |= {part} if isinstance(part, str) else resolve_prereq(part, completed)
@@ -132,21 +164,183 @@ def collect_all_courses(prereqs):
         stack = [p]
         while stack:
             n = stack.pop()
-            if n["type"] == "single":
+            if n.get("type") == "single":
                 courses.add(n["course"])
             else:
                 stack.extend(n.get("parts", []))
                 courses.update(n.get("courses", []))
     return courses
 
+# ─────────────────────────────────────────────────────────────
+# COMPILED PREREQUISITE CIRCUIT
+# Every course gets a bit (sorted course code order). Each tree
+# is flattened post-order into parallel int lists, so a course's
+# nodes are the contiguous range first[i] .. root[i] and children
+# always come before their parent. resolve_prereq() above is the
+# reference; needed_mask() gives the same set as a bitmask.
+# ─────────────────────────────────────────────────────────────
+
+NODE_NONE = 0     # unknown / "none" type  -> needs nothing
+NODE_SINGLE = 1   # {"type": "single"}     -> needs course unless completed
+NODE_COURSE = 2   # bare string option     -> always needs course
+NODE_OR = 3
+NODE_AND = 4
+
+
+def _options(node):
+    if node["type"] in ("or", "and"):
+        return node.get("courses", []) + node.get("parts", [])
+    return []
+
+
+class PrereqCircuit:
+    def __init__(self, prereqs):
+        self.courses = sorted(collect_all_courses(prereqs))
+        self.index = {c: i for i, c in enumerate(self.courses)}
+        self.full_mask = (1 << len(self.courses)) - 1
+
+        self.kind = []
+        self.bit = []
+        self.child_start = []
+        self.child_end = []
+        self.children = []
+        self.first = [0] * len(self.courses)
+        self.root = [-1] * len(self.courses)
+
+        for course, tree in prereqs.items():
+            if not tree:
+                continue   # {}: no prerequisite text, or it failed to parse
+            i = self.index[course]
+            self.first[i] = len(self.kind)
+            self.root[i] = self._emit(tree)
+
+        # reverse edges: node -> parent, node -> owning course,
+        # course -> leaf nodes that mention it
+        self.parent = [-1] * len(self.kind)
+        self.owner = [-1] * len(self.kind)
+        self.dependents = [[] for _ in self.courses]
+
+        for i, r in enumerate(self.root):
+            for k in range(self.first[i], r + 1):
+                self.owner[k] = i
+                for j in range(self.child_start[k], self.child_end[k]):
+                    self.parent[self.children[j]] = k
+                if self.kind[k] in (NODE_SINGLE, NODE_COURSE):
+                    self.dependents[self.bit[k].bit_length() - 1].append(k)
+
+    def _add(self, kind, bit=0, kids=()):
+        self.kind.append(kind)
+        self.bit.append(bit)
+        self.child_start.append(len(self.children))
+        self.children.extend(kids)
+        self.child_end.append(len(self.children))
+        return len(self.kind) - 1
+
+    def _emit(self, tree):
+        # iterative post-order walk; returns the node id of `tree`
+        frames = [(tree, iter(_options(tree)), [])]
+        while True:
+            node, it, kids = frames[-1]
+            opt = next(it, None)
+
+            if opt is None:
+                frames.pop()
+                if node["type"] == "single":
+                    k = self._add(NODE_SINGLE, 1 << self.index[node["course"]])
+                elif node["type"] == "or":
+                    k = self._add(NODE_OR, kids=kids)
+                elif node["type"] == "and":
+                    k = self._add(NODE_AND, kids=kids)
+                else:
+                    k = self._add(NODE_NONE)
+                if not frames:
+                    return k
+                frames[-1][2].append(k)
+
+            elif isinstance(opt, str):
+                kids.append(self._add(NODE_COURSE, 1 << self.index[opt]))
+            else:
+                frames.append((opt, iter(_options(opt)), []))
+
+    # ---------- masks <-> course codes ----------
+
+    def mask_of(self, courses):
+        m = 0
+        for c in courses:
+            i = self.index.get(c)
+            if i is not None:
+                m |= 1 << i
+        return m
+
+    def indices_of(self, mask):
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def courses_of(self, mask):
+        return [self.courses[i] for i in self.indices_of(mask)]
+
+    # ---------- evaluation ----------
+
+    def needed_mask(self, i, completed):
+        # the compiled resolve_prereq, so it counts as one
+        if inst.ENABLED:
+            inst.count("resolve_prereq_calls")
+        r = self.root[i]
+        if r < 0:
+            return 0
+
+        lo = self.first[i]
+        val = [0] * (r - lo + 1)
+        kind, bit = self.kind, self.bit
+        start, end, children = self.child_start, self.child_end, self.children
+
+        for k in range(lo, r + 1):
+            t = kind[k]
+            if t == NODE_SINGLE:
+                val[k - lo] = 0 if completed & bit[k] else bit[k]
+            elif t == NODE_COURSE:
+                val[k - lo] = bit[k]
+            elif t == NODE_AND:
+                m = 0
+                for j in range(start[k], end[k]):
+                    m |= val[children[j] - lo]
+                val[k - lo] = m
+            elif t == NODE_OR:
+                # first option with the fewest courses wins, as in resolve_prereq
+                best, best_n = 0, -1
+                for j in range(start[k], end[k]):
+                    v = val[children[j] - lo]
+                    n = v.bit_count()
+                    if best_n < 0 or n < best_n:
+                        best, best_n = v, n
+                val[k - lo] = best
+
+        return val[r - lo]
+
+    def resolve(self, course, completed):
+        # set-in / set-out wrapper matching resolve_prereq(prereqs[course], completed)
+        i = self.index.get(course)
+        if i is None:
+            return set()
+        return set(self.courses_of(self.needed_mask(i, self.mask_of(completed))))
+
+
+def compile_prerequisites(prereqs):
+    return PrereqCircuit(prereqs)
+
 # ─────────────────────────────────────────────────────────────
 # SCHEDULER CORE
 # ─────────────────────────────────────────────────────────────
 
-def build_schedule(start_units):
-    all_courses = collect_all_courses(prerequisites)
-    completed = set()
-    remaining = set(all_courses)
+@inst.timed()
+def build_schedule(start_units, circuit=None, completed=()):
+    if circuit is None:
+        circuit = compile_prerequisites(prerequisites)
+
+    completed = circuit.mask_of(completed)
+    remaining = circuit.full_mask & ~completed
     total_units = start_units
     semester = 1
     plan = []
@@ -155,20 +349,18 @@ def build_schedule(start_units):
         pass1_day = estimate_pass1_day(total_units)
         available = []
 
-        for c in sorted(remaining):
+        for i in circuit.indices_of(remaining):
+            c = circuit.courses[i]
             if not course_available(c, pass1_day):
                 continue
 
-            if c not in prerequisites:
+            needed = circuit.needed_mask(i, completed)
+            if not needed & ~completed:
                 available.append(c)
             else:
-                needed = resolve_prereq(prerequisites[c], completed)
-                if needed.issubset(completed):
-                    available.append(c)
-                else:
-                    for n in needed:
-                        if n in remaining and course_available(n, pass1_day):
-                            available.append(n)
+                for n in circuit.courses_of(needed & remaining):
+                    if course_available(n, pass1_day):
+                        available.append(n)
 
         if not available:
             raise RuntimeError(
@@ -184,11 +376,181 @@ def build_schedule(start_units):
             "courses": taking
         })
 
-        completed |= set(taking)
-        remaining -= set(taking)
+        taken = circuit.mask_of(taking)
+        completed |= taken
+        remaining &= ~taken
         total_units += len(taking) * UNITS_PER_COURSE
         semester += 1
 
+    inst.count("semesters_simulated", len(plan))
+    return plan
+
+# ─────────────────────────────────────────────────────────────
+# READY-QUEUE SCHEDULER
+# Event driven: every circuit node keeps its current needed mask
+# and AND nodes keep a count of unsatisfied children. Completing a
+# course only re-evaluates the nodes above the leaves that mention
+# it; a course whose root becomes satisfied is pushed on a heap.
+# Unlike build_schedule() a course is only taken once its own
+# prerequisites are met (no pulling needed courses forward), so
+# nothing is listed twice.
+# ─────────────────────────────────────────────────────────────
+
+class ScheduleEngine:
+    def __init__(self, circuit, completed=0, priority=None):
+        self.circuit = circuit
+        self.completed = completed
+        self.priority = priority or (lambda course: course)
+
+        n = len(circuit.kind)
+        self.val = [0] * n
+        self.sat = [False] * n
+        self.unsat = [0] * n
+
+        self.ready = [False] * len(circuit.courses)
+        self.heap = []
+        self.blocked = []
+        self.blocked_day = None
+
+        for k in range(n):
+            self._evaluate(k)
+        for i in range(len(circuit.courses)):
+            self._update_ready(i)
+
+    def _evaluate(self, k):
+        c = self.circuit
+        t = c.kind[k]
+
+        if t == NODE_SINGLE:
+            v = 0 if self.completed & c.bit[k] else c.bit[k]
+        elif t == NODE_COURSE:
+            v = c.bit[k]
+        elif t == NODE_AND:
+            v = 0
+            unsat = 0
+            for j in range(c.child_start[k], c.child_end[k]):
+                ch = c.children[j]
+                v |= self.val[ch]
+                unsat += not self.sat[ch]
+            self.unsat[k] = unsat
+        elif t == NODE_OR:
+            v, best_n = 0, -1
+            for j in range(c.child_start[k], c.child_end[k]):
+                cv = self.val[c.children[j]]
+                cn = cv.bit_count()
+                if best_n < 0 or cn < best_n:
+                    v, best_n = cv, cn
+        else:
+            v = 0
+
+        if t == NODE_AND:
+            s = self.unsat[k] == 0
+        else:
+            s = not v & ~self.completed
+
+        changed = v != self.val[k] or s != self.sat[k]
+        self.val[k] = v
+        self.sat[k] = s
+        return changed
+
+    def _update_ready(self, i):
+        if self.completed >> i & 1:
+            return
+        r = self.circuit.root[i]
+        ok = r < 0 or self.sat[r]
+        if ok and not self.ready[i]:
+            heapq.heappush(self.heap, (self.priority(self.circuit.courses[i]), i))
+        self.ready[i] = ok
+
+    def complete(self, indices):
+        c = self.circuit
+        for i in indices:
+            self.completed |= 1 << i
+            self.ready[i] = False
+
+        # children have lower ids than parents, so popping the
+        # smallest dirty node first settles a node before its parent
+        dirty = []
+        queued = set()
+        for i in indices:
+            for k in c.dependents[i]:
+                if k not in queued:
+                    queued.add(k)
+                    heapq.heappush(dirty, k)
+
+        touched = set()
+        while dirty:
+            k = heapq.heappop(dirty)
+            if not self._evaluate(k):
+                continue
+            p = c.parent[k]
+            if p < 0:
+                touched.add(c.owner[k])
+            elif p not in queued:
+                queued.add(p)
+                heapq.heappush(dirty, p)
+
+        for i in sorted(touched):
+            self._update_ready(i)
+
+    def take(self, pass1_day, limit):
+        c = self.circuit
+
+        # fill days only loosen as units grow, so blocked courses
+        # are only worth another look once the Pass 1 day moves
+        if self.blocked and pass1_day != self.blocked_day:
+            for item in self.blocked:
+                heapq.heappush(self.heap, item)
+            self.blocked = []
+        self.blocked_day = pass1_day
+
+        taking = []
+        while self.heap and len(taking) < limit:
+            item = heapq.heappop(self.heap)
+            i = item[1]
+            if not self.ready[i] or i in taking:
+                continue
+            if not course_available(c.courses[i], pass1_day):
+                self.blocked.append(item)
+                continue
+            taking.append(i)
+        return taking
+
+
+@inst.timed()
+def build_schedule_ready(start_units, circuit=None, completed=(), priority=None):
+    if circuit is None:
+        circuit = compile_prerequisites(prerequisites)
+
+    engine = ScheduleEngine(circuit, circuit.mask_of(completed), priority)
+    remaining = circuit.full_mask & ~engine.completed
+    total_units = start_units
+    semester = 1
+    plan = []
+
+    while remaining:
+        pass1_day = estimate_pass1_day(total_units)
+        taking = engine.take(pass1_day, MAX_COURSES_PER_SEMESTER)
+
+        if not taking:
+            raise RuntimeError(
+                f"No feasible courses (semester {semester}, Pass 1 day {pass1_day})"
+            )
+
+        plan.append({
+            "semester": semester,
+            "units_before": total_units,
+            "pass1_day": pass1_day,
+            "courses": [circuit.courses[i] for i in taking]
+        })
+
+        engine.complete(taking)
+        for i in taking:
+            remaining &= ~(1 << i)
+        total_units += len(taking) * UNITS_PER_COURSE
+        semester += 1
+
+    inst.count("semesters_simulated", len(plan))
     return plan
 
 # ─────────────────────────────────────────────────────────────
@@ -204,3 +566,6 @@ if __name__ == "__main__":
         print(f"  Pass 1 day:   {s['pass1_day']}")
         for c in s["courses"]:
             print(f"   - {c}")
+
+    if inst.ENABLED:
+        inst.write_run_files("schedule")
@@ -0,0 +1,103 @@
+import os
+import time
+from multiprocessing import freeze_support
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import class_algorithmn as ca
+
+
+# ───────────────────────── Worker Side ─────────────────────────
+
+# each worker process unpickles the compiled catalog once
+_circuit = None
+_planner = None
+
+
+def _init_worker(circuit, planner):
+    global _circuit, _planner
+    _circuit = circuit
+    _planner = planner
+
+
+def _plan_one(circuit, planner, key):
+    start_units, completed = key
+    try:
+        return planner(start_units, circuit=circuit, completed=completed)
+    except RuntimeError as e:
+        return e
+
+
+def _plan_chunk(keys):
+    return [(key, _plan_one(_circuit, _planner, key)) for key in keys]
+
+
+# ───────────────────────── Batch Entry Point ─────────────────────────
+
+def profile_key(start_units, already_completed=()):
+    return (start_units, frozenset(already_completed))
+
+
+# profiles: iterable of (start_units, already_completed).
+# Yields (index, plan) as plans finish, not in input order. A student
+# with no feasible plan gets the RuntimeError back as `plan`.
+# Identical profiles are planned once and yielded for every index.
+def plan_cohort(profiles, circuit=None, planner=ca.build_schedule,
+                max_workers=None, chunk_size=64):
+    if circuit is None:
+        circuit = ca.compile_prerequisites(ca.prerequisites)
+
+    by_key = {}
+    for i, (start_units, done) in enumerate(profiles):
+        by_key.setdefault(profile_key(start_units, done), []).append(i)
+
+    keys = list(by_key)
+    workers = max_workers or os.cpu_count() or 1
+
+    # not worth spinning up processes for a handful of students
+    if workers == 1 or len(keys) <= chunk_size:
+        for key in keys:
+            plan = _plan_one(circuit, planner, key)
+            for i in by_key[key]:
+                yield i, plan
+        return
+
+    chunks = [keys[j:j + chunk_size] for j in range(0, len(keys), chunk_size)]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(circuit, planner)
+    ) as pool:
+        futures = [pool.submit(_plan_chunk, chunk) for chunk in chunks]
+        for fut in as_completed(futures):
+            for key, plan in fut.result():
+                for i in by_key[key]:
+                    yield i, plan
+
+
+# ───────────────────────── Demo ─────────────────────────
+
+def main():
+    freeze_support()
+
+    core = ["STA 013", "ECS 032A", "MAT 021B"]
+    profiles = [
+        (units, core[:k])
+        for units in range(0, 140, 4)
+        for k in range(len(core) + 1)
+    ] * 50
+
+    t0 = time.perf_counter()
+    plans = [None] * len(profiles)
+    for i, plan in plan_cohort(profiles):
+        plans[i] = plan
+    elapsed = time.perf_counter() - t0
+
+    unique = len({profile_key(*p) for p in profiles})
+    failed = sum(isinstance(p, RuntimeError) for p in plans)
+    print(f"✅ Planned {len(profiles)} students ({unique} unique) in {elapsed:.2f}s")
+    print(f"⚠️ No feasible plan for {failed} students")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
 import os
 import csv
+import json
+import time
+import hashlib
+import heapq
+import queue
+import threading
+import multiprocessing as mp
+from multiprocessing import connection
+from contextlib import contextmanager
 from multiprocessing import freeze_support
-from concurrent.futures import ThreadPoolExecutor
-from collections import defaultdict
-from datetime import date
+from collections import defaultdict, deque
+from datetime import datetime
 
 import undetected_chromedriver as uc
 from selenium import webdriver
@@ -11,6 +19,33 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 
+from seat_http import HttpSession, scrape_subject_http, search_options
+from seat_store import SeatStore, parse_seat_counts
+from seat_watcher import backoff_delay
+import fill_model
+import instrumentation as inst
+
+# "selenium" drives headless Chrome; "http" posts the search form
+# directly (see seat_http.py) and needs no browser at all
+SCRAPE_BACKEND = "selenium"
+
+MAX_WORKERS = 5         # scraper processes
+PAGES_PER_DRIVER = 50   # recycle a browser after this many subjects
+
+# A <select> of the search form that splits one subject's sections into
+# disjoint parts. Subjects that had at least SHARD_MIN_ROWS rows last run
+# are fetched as one request per option; without the select nothing is
+# sharded.
+SHARD_FIELD = "level"
+SHARD_MIN_ROWS = 300
+
+MAX_ATTEMPTS = 4        # per shard, transient failures included
+RETRY_BASE = 2          # seconds before the first retry, doubling
+RETRY_MAX = 30
+TASK_TIMEOUT = 120      # seconds one shard may take before its worker is replaced
+STOP_GRACE = 15         # seconds a stopped worker gets to close its browser
+POLL_INTERVAL = 5 * 60  # a full scrape should fit in one Pass 1 poll
+
 
 # ───────────────────────── Chrome Setup ─────────────────────────
 
@@ -35,93 +70,268 @@ def create_driver(driver_path: str):
     )
 
 
-# ───────────────────────── Scraping Logic ─────────────────────────
+# ───────────────────────── Driver Pool ─────────────────────────
+
+class DriverPool:
+    # At most `size` warm browsers shared by the scraping threads. A
+    # driver goes back to the pool after each subject and is replaced
+    # when it fails a health check, raises, or has served max_pages.
+    # close() also quits drivers that are checked out, so a scrape stuck
+    # in one can be ended from another thread.
+
+    def __init__(self, size: int, driver_path: str, max_pages: int = PAGES_PER_DRIVER):
+        self.size = size
+        self.driver_path = driver_path
+        self.max_pages = max_pages
+
+        self.idle = queue.LifoQueue()   # most recently used first: warmest cache
+        self.busy = {}                  # id -> driver, checked out
+        self.pages = {}
+        self.live = 0
+        self.lock = threading.Lock()
+        self.closed = False
+
+        self.launches = 0
+        self.recycled = 0
+        self.startup_seconds = 0.0
+
+    def warm_up(self):
+        # the very first launch is what unpacks chromedriver to
+        # driver_path; keep that browser instead of quitting it
+        with self.lock:
+            self.live += 1
+        self.idle.put(self._launch(unpack=True))
+
+    def _launch(self, unpack: bool = False):
+        t0 = time.perf_counter()
+        try:
+            with inst.span("chrome_startup"):
+                if unpack:
+                    driver = uc.Chrome(options=make_chrome_options(), use_subprocess=False)
+                else:
+                    driver = create_driver(self.driver_path)
+        except Exception:
+            with self.lock:
+                self.live -= 1
+            raise
+        with self.lock:
+            self.launches += 1
+            self.startup_seconds += time.perf_counter() - t0
+            self.pages[id(driver)] = 0
+        return driver
+
+    def _healthy(self, driver) -> bool:
+        # a crashed chromedriver surfaces as a urllib3 / socket error,
+        # not a WebDriverException
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        with self.lock:
+            self.pages.pop(id(driver), None)
+            self.live -= 1
+            self.recycled += 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def acquire(self):
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                with self.lock:
+                    can_launch = self.live < self.size
+                    if can_launch:
+                        self.live += 1
+                if can_launch:
+                    return self._checkout(self._launch())
+                driver = self.idle.get()
 
-def scrape_subject(subject_code: str, driver_path: str):
-    driver = create_driver(driver_path)
-    data = []
+            try:
+                healthy = self._healthy(driver)
+            except BaseException:
+                self._discard(driver)
+                raise
+            if healthy:
+                return self._checkout(driver)
+            self._discard(driver)
+
+    def _checkout(self, driver):
+        with self.lock:
+            closed = self.closed
+            if not closed:
+                self.busy[id(driver)] = driver
+        if closed:
+            self._discard(driver)
+            raise RuntimeError("driver pool is closed")
+        return driver
+
+    def release(self, driver, failed: bool = False):
+        with self.lock:
+            if self.busy.pop(id(driver), None) is None:
+                return   # close() has quit it already
+            self.pages[id(driver)] = self.pages.get(id(driver), 0) + 1
+            worn_out = self.pages[id(driver)] >= self.max_pages
+        if failed or worn_out or self.closed:
+            self._discard(driver)
+        else:
+            self.idle.put(driver)
+
+    @contextmanager
+    def driver(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, failed=True)
+            raise
+        self.release(driver)
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            drivers = list(self.busy.values())
+            self.busy.clear()
+        while True:
+            try:
+                drivers.append(self.idle.get_nowait())
+            except queue.Empty:
+                break
+        for driver in drivers:
+            with self.lock:
+                self.pages.pop(id(driver), None)
+                self.live -= 1
+            try:
+                driver.quit()
+            except Exception:
+                pass
 
-    try:
-        driver.get("https://registrar-apps.ucdavis.edu/courses/search/index.cfm")
+    def stats(self):
+        return {
+            "launches": self.launches,
+            "recycled": self.recycled,
+            "startup_seconds": self.startup_seconds
+        }
 
-        Select(WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.NAME, "termCode"))
-        )).select_by_value("202603")
 
-        Select(driver.find_element(By.NAME, "subject")) \
-            .select_by_value(subject_code)
+# ───────────────────────── Scraping Logic ─────────────────────────
 
-        driver.execute_script(
-            "arguments[0].click();",
-            driver.find_element(By.NAME, "search")
-        )
+# [crn, time/days, course, section, open/wait, instructor] per
+# tr[bgcolor]; null where the cell is missing
+ROW_EXTRACT_JS = """
+return Array.from(document.querySelectorAll("tr[bgcolor]"), function (tr) {
+    function text(sel) {
+        var el = tr.querySelector(sel);
+        return el ? el.innerText.trim() : null;
+    }
+    return [
+        text("td:nth-child(1) strong"),
+        text("td:nth-child(1) em"),
+        text("td:nth-child(2)"),
+        text("td:nth-child(3)"),
+        text("td:nth-child(3) em"),
+        text("td:nth-child(5)")
+    ];
+});
+"""
+
+
+@inst.timed()
+def scrape_subject(subject_code: str, driver_path: str = None, pool: DriverPool = None,
+                   stats=None, extra=None):
+    if pool is not None:
+        with pool.driver() as driver:
+            return scrape_with_driver(driver, subject_code, stats, extra)
 
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "table#mc_win tbody"))
-        )
+    driver = create_driver(driver_path)
+    try:
+        return scrape_with_driver(driver, subject_code, stats, extra)
+    finally:
+        driver.quit()
 
-        rows = driver.find_elements(By.CSS_SELECTOR, "tr[bgcolor]")
 
-        for row in rows:
-            try:
-                crn = row.find_element(By.CSS_SELECTOR, "td:nth-child(1) strong").text.strip()
-                if not crn.isdigit():
-                    continue
+def open_search_page(driver):
+    driver.get("https://registrar-apps.ucdavis.edu/courses/search/index.cfm")
+    inst.count("pages_loaded")
 
-                time_days = (
-                    row.find_elements(By.CSS_SELECTOR, "td:nth-child(1) em") and
-                    row.find_element(By.CSS_SELECTOR, "td:nth-child(1) em").text
-                    or "N/A"
-                )
+    with inst.span("webdriver_wait"):
+        return WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.NAME, "termCode"))
+        )
 
-                course = row.find_element(By.CSS_SELECTOR, "td:nth-child(2)") \
-                    .text.split("\n")[0]
 
-                section = row.find_element(By.CSS_SELECTOR, "td:nth-child(3)") \
-                    .text.split("\n")[0]
+def list_options(driver, field: str):
+    # non-blank option values of a search-form <select>, [] if absent
+    open_search_page(driver)
+    selects = driver.find_elements(By.NAME, field)
+    if not selects:
+        return []
+    values = (o.get_attribute("value") for o in Select(selects[0]).options)
+    return [v.strip() for v in values if v and v.strip()]
 
-                open_wait = (
-                    row.find_elements(By.CSS_SELECTOR, "td:nth-child(3) em") and
-                    row.find_element(By.CSS_SELECTOR, "td:nth-child(3) em").text
-                    or "N/A"
-                )
 
-                instructor = (
-                    row.find_element(By.CSS_SELECTOR, "td:nth-child(5)")
-                       .text.split("\n")[0]
-                       or "TBA"
-                )
+def scrape_with_driver(driver, subject_code: str, stats=None, extra=None):
+    # extra: further search fields, e.g. one shard of a large subject
+    data = []
 
-                data.append([
-                    subject_code,
-                    crn,
-                    time_days,
-                    course,
-                    section,
-                    open_wait,
-                    instructor
-                ])
+    term_select = open_search_page(driver)
+    Select(term_select).select_by_value("202603")
 
-            except Exception:
-                continue
+    Select(driver.find_element(By.NAME, "subject")) \
+        .select_by_value(subject_code)
+    for field, value in (extra or {}).items():
+        Select(driver.find_element(By.NAME, field)).select_by_value(value)
 
-        return data
+    driver.execute_script(
+        "arguments[0].click();",
+        driver.find_element(By.NAME, "search")
+    )
 
-    finally:
-        driver.quit()
+    with inst.span("webdriver_wait"):
+        WebDriverWait(driver, 20).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "table#mc_win tbody"))
+        )
+    inst.count("pages_loaded")
+
+    # one round trip for the whole table instead of ~10 per row
+    with inst.span("row_extraction"):
+        rows = driver.execute_script(ROW_EXTRACT_JS)
+
+    failed = 0
+    for crn, time_days, course, section, open_wait, instructor in rows:
+        if crn is None or not crn.isdigit():
+            continue    # header / note rows have no numeric CRN
+
+        if course is None or section is None or instructor is None:
+            failed += 1
+            continue
+
+        data.append([
+            subject_code,
+            crn,
+            time_days or "N/A",
+            course.split("\n")[0],
+            section.split("\n")[0],
+            open_wait or "N/A",
+            instructor.split("\n")[0] or "TBA"
+        ])
 
+    if failed:
+        print(f"⚠️ {subject_code}: {failed} section rows could not be read")
+        inst.count("rows_dropped", failed)
+    if stats is not None:
+        stats["rows"] = stats.get("rows", 0) + len(data)
+        stats["failed_rows"] = stats.get("failed_rows", 0) + failed
 
-# ───────────────────────── Helpers ─────────────────────────
+    return data
 
-def extract_open_count(text: str) -> int:
-    try:
-        for part in text.split("/"):
-            if "Open" in part:
-                return int(part.split(":")[1].strip())
-    except Exception:
-        pass
-    return 0
 
+# ───────────────────────── Helpers ─────────────────────────
 
 def deduplicate_rows(rows):
     seen = set()
@@ -136,108 +346,551 @@ def deduplicate_rows(rows):
     return deduped
 
 
-def aggregate_open_by_course(rows):
-    course_open = defaultdict(int)
-    for row in rows:
-        course_open[row[3]] += extract_open_count(row[5])
-    return course_open
-
-
-def update_course_open_tracker(course_open, tracker_file):
-    today = date.today().isoformat()
-    existing = {}
-
-    if os.path.exists(tracker_file):
-        with open(tracker_file, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for r in reader:
-                existing[r["Course"]] = r
-
-    updated = {}
-
-    for course, total_open in course_open.items():
-        if course not in existing:
-            updated[course] = {
-                "Course": course,
-                "First Seen": today,
-                "Total Open": total_open,
-                "Days to Zero": 0 if total_open == 0 else ""
-            }
+# ───────────────────────── Checkpoints ─────────────────────────
+# checkpoint_dir/<SUBJECT>.json keeps each subject's last rows and
+# their fingerprint. scrape_state.json records which subjects the
+# current run has finished, so an interrupted run picks up where it
+# stopped. Subjects whose rows hash the same as last time skip
+# post-processing; if none changed the CSVs are left alone.
+
+def rows_fingerprint(rows) -> str:
+    return hashlib.sha256(json.dumps(rows).encode("utf-8")).hexdigest()
+
+
+def _write_json_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_run_state(state_file, subjects):
+    state = _read_json(state_file, {})
+    if state.get("subjects") == list(subjects):
+        return state
+    return {"subjects": list(subjects), "done": [], "changed": []}
+
+
+def load_subject_checkpoint(checkpoint_dir, subject):
+    return _read_json(os.path.join(checkpoint_dir, f"{subject}.json"), None)
+
+
+def subject_changed(checkpoint_dir, subject, fingerprint):
+    # True when the subject's rows differ from its last checkpoint
+    previous = load_subject_checkpoint(checkpoint_dir, subject)
+    return previous is None or previous["fingerprint"] != fingerprint
+
+
+def save_subject_checkpoint(checkpoint_dir, subject, rows, fingerprint=None):
+    _write_json_atomic(os.path.join(checkpoint_dir, f"{subject}.json"), {
+        "fingerprint": fingerprint or rows_fingerprint(rows),
+        "rows": deduplicate_rows(rows)
+    })
+
+
+# ───────────────────────── Scrape Scheduler ─────────────────────────
+# Every subject (large ones split into shards) goes on one task queue
+# in the parent, largest first, feeding MAX_WORKERS processes; a process
+# is sent the next task as soon as it is free, so one slow subject only
+# holds up its own process. The parent hands each task to one worker
+# over that worker's pipe, so it always knows what a dead worker was
+# holding. Failures come back to the parent, which puts the shard back
+# on the queue after a jittered backoff. A subject is handed on as soon
+# as all of its shards are in, in whatever order that happens.
+
+def _scrape_worker(backend, driver_path, conn, stop, instrument):
+    # runs in a child process; each one keeps its own session / browser.
+    # conn is this worker's own pipe: tasks come in (None to finish) and
+    # (kind, pid, task, payload, stats) go out. The parent sets stop to end a
+    # task that hangs: a watchdog thread then closes the browser (a
+    # signal would skip it and leave Chrome running) and sends the exit
+    # report before the process exits.
+    pid = os.getpid()
+    inst.enable(instrument)
+    inst.reset()   # a forked child starts with the parent's numbers
+    drivers = session = None
+    if callable(backend):
+        scrape = backend   # a stand-in, e.g. in tests
+    elif backend == "http":
+        session = HttpSession()
+        scrape = lambda subject, extra, stats: scrape_subject_http(subject, session, extra=extra)
+    else:
+        drivers = DriverPool(1, driver_path)
+        scrape = lambda subject, extra, stats: scrape_subject(
+            subject, pool=drivers, stats=stats, extra=extra
+        )
+
+    lock = threading.Lock()
+    finished = False
+
+    def send(message):
+        with lock:
+            if not finished:
+                conn.send(message)
+
+    def finish():
+        # once, from whichever thread gets here first
+        nonlocal finished
+        with lock:
+            if finished:
+                return
+            finished = True
+            browser = {}
+            if drivers is not None:
+                drivers.close()
+                browser = drivers.stats()
+            elif session is not None:
+                session.close()
+            try:
+                conn.send(("exit", pid, None, {"browser": browser, "report": inst.report()}, {}))
+            except OSError:
+                pass   # the parent is gone
+            conn.close()
+
+    def watchdog():
+        stop.wait()
+        finish()
+        os._exit(1)
+
+    threading.Thread(target=watchdog, daemon=True).start()
+    try:
+        while True:
+            task = conn.recv()
+            if task is None:
+                break
+            subject, shard, extra, attempt = task
+            stats = {}
+            try:
+                rows = scrape(subject, extra, stats) or []
+            except Exception as e:
+                # exceptions from selenium do not always pickle
+                send(("failed", pid, task, f"{type(e).__name__}: {e}", stats))
+                continue
+            send(("done", pid, task, rows, stats))
+    finally:
+        finish()
+
+
+def plan_shards(subjects, sizes, shard_values):
+    # -> tasks (subject, shard, extra fields, attempt), largest subjects
+    #    first; subjects never seen before count as large
+    tasks = []
+    for subject in sorted(subjects, key=lambda s: -sizes.get(s, SHARD_MIN_ROWS)):
+        if shard_values and sizes.get(subject, 0) >= SHARD_MIN_ROWS:
+            for shard, value in enumerate(shard_values):
+                tasks.append((subject, shard, {SHARD_FIELD: value}, 0))
         else:
-            record = existing[course]
-            record["Total Open"] = total_open
+            tasks.append((subject, 0, None, 0))
+    return tasks
+
+
+def scrape_all(subjects, backend, driver_path=None, workers=MAX_WORKERS, sizes=None,
+               shard_values=(), errors=None, totals=None, task_timeout=TASK_TIMEOUT):
+    # (subject, rows) as subjects complete. A subject whose shard still
+    # fails after MAX_ATTEMPTS goes to errors; totals collects the
+    # worker row counts, browser stats and retries. A worker that dies,
+    # or holds one task longer than task_timeout seconds, is replaced
+    # and its task counts as a failed attempt. backend is "selenium",
+    # "http", or a picklable scrape(subject, extra, stats) -> rows.
+    errors = [] if errors is None else errors
+    totals = {} if totals is None else totals
+    tasks = plan_shards(subjects, sizes or {}, shard_values)
+    if not tasks:
+        return
+
+    shards_left = defaultdict(int)
+    for subject, *_ in tasks:
+        shards_left[subject] += 1
+    parts = {s: {} for s in shards_left}
+    failed = set()
+    pending = {}         # (subject, shard) -> latest attempt's task
+    ready = deque()      # tasks waiting for a free worker
+    in_flight = {}       # pid -> (task, sent at)
+    overdue = {}         # pid -> when it was stopped for running past task_timeout
+    killed = set()       # overdue pids that had to be terminated after all
+
+    ctx = mp.get_context()
+    procs = {}
+    conns = {}           # pid -> the parent's end of the worker's pipe
+    stops = {}           # pid -> Event that makes the worker give up and exit
+    idle = []            # pids waiting for a task
+    restarts = 0
+
+    def start_worker():
+        # one pipe per worker: a worker dying mid-send cannot block the
+        # others, and EOF on it tells the parent the worker is gone
+        conn, child = ctx.Pipe()
+        stop = ctx.Event()
+        p = ctx.Process(target=_scrape_worker,
+                        args=(backend, driver_path, child, stop, inst.ENABLED),
+                        daemon=True)
+        p.start()
+        child.close()
+        procs[p.pid] = p
+        conns[p.pid] = conn
+        stops[p.pid] = stop
+        idle.append(p.pid)
+
+    def worker_gone(pid):
+        # -> the task it was holding, with the reason, or None
+        conns.pop(pid).close()
+        stops.pop(pid)
+        p = procs.pop(pid)
+        p.join()
+        if pid in idle:
+            idle.remove(pid)
+        running = in_flight.pop(pid, None)
+        if running is None:
+            return None
+        if pid in overdue:
+            return running[0], f"no result after {task_timeout}s"
+        return running[0], f"scraper process exited with code {p.exitcode}"
+
+    def dispatch():
+        while ready and idle:
+            pid = idle.pop()
+            task = ready.popleft()
+            try:
+                conns[pid].send(task)
+            except OSError:
+                ready.appendleft(task)   # already gone; its EOF is read next
+                continue
+            in_flight[pid] = (task, time.monotonic())
+
+    n_workers = min(workers, len(tasks))
+    for _ in range(n_workers):
+        start_worker()
+    for task in tasks:
+        pending[task[:2]] = task
+        ready.append(task)
+
+    delayed = []   # (due, seq, task) waiting out their backoff
+    seq = 0
+    outstanding = len(tasks)
+
+    def settle_failure(task, message):
+        # -> True when the shard is finished (given up on)
+        nonlocal seq
+        subject, shard, extra, attempt = task
+        if attempt + 1 < MAX_ATTEMPTS and subject not in failed:
+            delay = backoff_delay(attempt + 1, RETRY_BASE, RETRY_MAX)
+            print(f"🔁 {subject} shard {shard}: {message}; retrying in {delay:.1f}s")
+            retry = pending[(subject, shard)] = (subject, shard, extra, attempt + 1)
+            heapq.heappush(delayed, (time.monotonic() + delay, seq, retry))
+            seq += 1
+            totals["retries"] = totals.get("retries", 0) + 1
+            inst.count("scrape_retries")
+            return False
+        if subject not in failed:
+            failed.add(subject)
+            errors.append((subject, message))
+            print(f"❌ {subject} failed: {message}")
+        return True
 
-            if record["Days to Zero"] == "" and total_open == 0:
-                first_seen = date.fromisoformat(record["First Seen"])
-                record["Days to Zero"] = (date.today() - first_seen).days
+    try:
+        while outstanding:
+            now = time.monotonic()
+            while delayed and delayed[0][0] <= now:
+                ready.append(heapq.heappop(delayed)[2])
+            dispatch()
+
+            for pid, (task, sent) in in_flight.items():
+                if now - sent > task_timeout and pid not in overdue:
+                    overdue[pid] = now
+                    stops[pid].set()   # its pipe reports EOF once it has cleaned up
+                elif pid in overdue and now - overdue[pid] > STOP_GRACE and pid not in killed:
+                    killed.add(pid)
+                    procs[pid].terminate()   # even its watchdog is stuck
+
+            if not conns:
+                raise RuntimeError("every scraper process has exited")
+
+            wait = min(1.0, delayed[0][0] - now) if delayed else 1.0
+            by_conn = {conn: pid for pid, conn in conns.items()}
+            messages = []
+            for conn in connection.wait(list(by_conn), timeout=max(wait, 0.01)):
+                try:
+                    messages.append(conn.recv())
+                except (EOFError, OSError):
+                    lost = worker_gone(by_conn[conn])
+                    if lost is not None:
+                        messages.append(("failed", None, lost[0], lost[1], {}))
+                    if restarts < n_workers * MAX_ATTEMPTS:
+                        restarts += 1
+                        start_worker()
+
+            for kind, pid, task, payload, stats in messages:
+                _add_counts(totals, stats)
+                if kind == "exit":
+                    _merge_worker_report(totals, payload)
+                    continue
+                if pid is not None and pid in in_flight:
+                    del in_flight[pid]
+                    if pid in conns and pid not in overdue:
+                        idle.append(pid)
+
+                subject, shard, extra, attempt = task
+                if pending.get((subject, shard)) != task:
+                    continue   # a late answer from an attempt already replaced or settled
+                if kind == "failed" and not settle_failure(task, payload):
+                    continue
+                if kind == "failed":
+                    payload = []
+
+                del pending[(subject, shard)]
+                outstanding -= 1
+                parts[subject][shard] = payload
+                shards_left[subject] -= 1
+                if not shards_left[subject] and subject not in failed:
+                    # shards in a fixed order, so unchanged subjects fingerprint the same
+                    shard_rows = parts.pop(subject)
+                    yield subject, [row for k in sorted(shard_rows) for row in shard_rows[k]]
+    finally:
+        for pid, conn in conns.items():
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            if pid in in_flight:
+                stops[pid].set()   # abandoned mid-task
+        # read until every worker has sent its exit report and closed its pipe
+        deadline = time.monotonic() + STOP_GRACE
+        while conns and time.monotonic() < deadline:
+            by_conn = {conn: pid for pid, conn in conns.items()}
+            for conn in connection.wait(list(by_conn), timeout=0.2):
+                try:
+                    kind, _, _, payload, _ = conn.recv()
+                except (EOFError, OSError):
+                    worker_gone(by_conn[conn])
+                    continue
+                if kind == "exit":
+                    _merge_worker_report(totals, payload)
+        for pid in list(conns):
+            procs[pid].terminate()   # last resort; its browser may be left behind
+            worker_gone(pid)
+
+
+def _merge_worker_report(totals, payload):
+    # browser stats into totals, spans and counters into this process
+    _add_counts(totals, payload["browser"])
+    inst.merge_report(payload["report"])
+
+
+def _add_counts(totals, counts):
+    for key, value in counts.items():
+        totals[key] = totals.get(key, 0) + value
+
+
+# ───────────────────────── Streaming Pipeline ─────────────────────────
+# scrape_all -> checkpointed_batches -> parse_batches -> write_snapshot
+# Each subject's rows are checkpointed, deduplicated, parsed once and
+# written out as soon as that subject finishes; only the seen keys and
+# the per-course totals grow with the number of subjects.
+
+SNAPSHOT_HEADER = [
+    "Subject",
+    "CRN",
+    "Time/Days",
+    "Course",
+    "Section",
+    "Open/Reserved/Waitlist",
+    "Instructor"
+]
+
+
+def checkpointed_batches(scraped, state, state_file, checkpoint_dir):
+    # (subject, rows, record) -- record is True when the rows changed and
+    # still have to go into the seat history. Subjects finished by an
+    # interrupted run come back from their checkpoints first; they were
+    # recorded by that run.
+    for subject in list(state["done"]):
+        yield subject, load_subject_checkpoint(checkpoint_dir, subject)["rows"], False
+
+    for subject, rows in scraped:
+        fingerprint = rows_fingerprint(rows)
+        changed = subject_changed(checkpoint_dir, subject, fingerprint)
+        yield subject, rows, changed
+        # only checkpointed and marked done once the consumer has written
+        # the batch; if recording fails the next run still sees it changed
+        if changed:
+            save_subject_checkpoint(checkpoint_dir, subject, rows, fingerprint)
+            state["changed"].append(subject)
+        state["done"].append(subject)
+        _write_json_atomic(state_file, state)
+
+
+def parse_batches(batches):
+    # drops rows already seen in an earlier batch (same key as
+    # deduplicate_rows) and parses the seat counts once, at ingest
+    seen = set()
+    for subject, rows, record in batches:
+        parsed = []
+        for row in rows:
+            key = (row[1], row[3])  # (CRN, Course)
+            if key not in seen:
+                seen.add(key)
+                parsed.append((row, parse_seat_counts(row[5])))
+        inst.count("rows_dropped", len(rows) - len(parsed))
+        yield subject, parsed, record
 
-            updated[course] = record
 
-    with open(tracker_file, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["Course", "First Seen", "Total Open", "Days to Zero"]
-        )
-        writer.writeheader()
-        writer.writerows(updated.values())
+def write_snapshot(batches, snapshot_file, store, when=None):
+    # -> (open seats per course, rows written)
+    when = when or datetime.now()
+    course_open = defaultdict(int)
+    written = 0
+
+    with open(snapshot_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(SNAPSHOT_HEADER)
+        for subject, parsed, record in batches:
+            writer.writerows(row for row, _ in parsed)
+            f.flush()
+            for row, counts in parsed:
+                course_open[row[3]] += counts[0]
+            if record:
+                store.record_counts(
+                    [(row[0], row[3], row[1], *counts) for row, counts in parsed],
+                    when
+                )
+            written += len(parsed)
+
+    return course_open, written
 
 
 # ───────────────────────── Main ─────────────────────────
 
+def enumerate_subjects(backend, driver_path=None, totals=None):
+    # -> (subject codes, SHARD_FIELD option values) from the search form
+    if backend == "http":
+        session = HttpSession()
+        try:
+            return search_options(session, "subject"), search_options(session, SHARD_FIELD)
+        finally:
+            session.close()
+
+    # the first launch also unpacks chromedriver to driver_path for the workers
+    drivers = DriverPool(1, driver_path)
+    drivers.warm_up()
+    try:
+        with drivers.driver() as driver:
+            return list_options(driver, "subject"), list_options(driver, SHARD_FIELD)
+    finally:
+        drivers.close()
+        if totals is not None:
+            _add_counts(totals, drivers.stats())
+
+
+def checkpoint_sizes(checkpoint_dir, subjects):
+    # rows per subject in the last run, used to order and shard the work
+    sizes = {}
+    for subject in subjects:
+        checkpoint = load_subject_checkpoint(checkpoint_dir, subject)
+        if checkpoint is not None:
+            sizes[subject] = len(checkpoint["rows"])
+    return sizes
+
+
 def main():
     freeze_support()
 
-    # unpack chromedriver once
-    tmp = uc.Chrome(options=make_chrome_options(), use_subprocess=False)
-    tmp.quit()
-
-    driver_path = os.path.join(
-        os.getenv("APPDATA"),
-        "undetected_chromedriver",
-        "undetected_chromedriver.exe"
-    )
+    driver_path = None
+    if SCRAPE_BACKEND != "http":
+        driver_path = os.path.join(
+            os.getenv("APPDATA"),
+            "undetected_chromedriver",
+            "undetected_chromedriver.exe"
+        )
+    totals = {}
+    subjects, shard_values = enumerate_subjects(SCRAPE_BACKEND, driver_path, totals)
+    if not subjects:
+        raise RuntimeError("No subjects found in the search form's subject dropdown")
+    print(f"📚 {len(subjects)} subjects in the search form")
 
     save_dir = r"C:/Users/PC4/OneDrive/Desktop/reg classproject"
     os.makedirs(save_dir, exist_ok=True)
 
     courses_csv = os.path.join(save_dir, "all_courses.csv")
     tracker_csv = os.path.join(save_dir, "course_open_tracker.csv")
-
-    subjects = ["ECL"]  # extend as needed
-
-    with ThreadPoolExecutor(max_workers=5) as pool:
-        batches = pool.map(
-            lambda s: scrape_subject(s, driver_path),
-            subjects
+    seat_db = os.path.join(save_dir, "seat_history.sqlite")
+    checkpoint_dir = os.path.join(save_dir, "scrape_checkpoint")
+    state_file = os.path.join(checkpoint_dir, "scrape_state.json")
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    state = load_run_state(state_file, subjects)
+    todo = [s for s in subjects if s not in state["done"]]
+    if len(todo) < len(subjects):
+        print(f"↩️ Resuming: {len(subjects) - len(todo)} of {len(subjects)} subjects already done")
+
+    # rows go to a temporary snapshot while subjects are still loading;
+    # it only replaces courses_csv once the run has finished cleanly
+    snapshot_tmp = courses_csv + ".tmp"
+    store = SeatStore(seat_db)
+    errors = []
+    try:
+        store.import_tracker_csv(tracker_csv)   # seeds before the first append
+        t0 = time.monotonic()
+        scraped = scrape_all(
+            todo, SCRAPE_BACKEND, driver_path, MAX_WORKERS,
+            sizes=checkpoint_sizes(checkpoint_dir, todo),
+            shard_values=shard_values, errors=errors, totals=totals
         )
+        batches = parse_batches(checkpointed_batches(scraped, state, state_file, checkpoint_dir))
+        course_open, written = write_snapshot(batches, snapshot_tmp, store)
+        elapsed = time.monotonic() - t0
+
+        print(f"⏱️ {len(todo)} subjects scraped in {elapsed:.1f}s "
+              f"({totals.get('retries', 0)} retries)")
+        if elapsed > POLL_INTERVAL:
+            print(f"⚠️ Longer than the {POLL_INTERVAL}s Pass 1 polling interval")
+        if SCRAPE_BACKEND != "http":
+            print(f"🧾 Rows read: {totals.get('rows', 0)} kept, "
+                  f"{totals.get('failed_rows', 0)} unreadable")
+            print(f"🚀 Browser startup: {totals.get('launches', 0)} launches, "
+                  f"{totals.get('startup_seconds', 0.0):.1f}s, {totals.get('recycled', 0)} recycled")
+
+        if errors:
+            # finished subjects stay checkpointed; the next run retries the rest
+            os.remove(snapshot_tmp)
+            raise RuntimeError(f"{len(errors)} subject(s) failed: "
+                               + ", ".join(s for s, _ in errors))
+
+        changed = state["changed"]
+        outputs_exist = os.path.exists(courses_csv) and os.path.exists(tracker_csv)
+        os.remove(state_file)
+
+        if not changed and outputs_exist:
+            os.remove(snapshot_tmp)
+            print("💤 No subject changed since the last run; CSVs left as they are")
+            return
+
+        os.replace(snapshot_tmp, courses_csv)
+
+        # history is append-only; the tracker CSV is exported from it
+        store.export_tracker_csv(tracker_csv)
+    finally:
+        store.close()
 
-    all_rows = []
-    for batch in batches:
-        if batch:
-            all_rows.extend(batch)
-
-    all_rows = deduplicate_rows(all_rows)
-
-    # overwrite snapshot CSV
-    with open(courses_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            "Subject",
-            "CRN",
-            "Time/Days",
-            "Course",
-            "Section",
-            "Open/Reserved/Waitlist",
-            "Instructor"
-        ])
-        writer.writerows(all_rows)
-
-    course_open = aggregate_open_by_course(all_rows)
-    update_course_open_tracker(course_open, tracker_csv)
+    print(f"✅ Snapshot saved to {courses_csv} ({written} rows, {len(changed)} subject(s) changed)")
+    print(f"📊 Course OPEN tracker updated: {tracker_csv} "
+          f"({sum(course_open.values())} open seats across {len(course_open)} courses)")
 
-    print(f"✅ Snapshot saved to {courses_csv}")
-    print(f"📊 Course OPEN tracker updated: {tracker_csv}")
+    # refit the scheduler's fill days from the updated history
+    if fill_model.PASS1_START is not None:
+        fit = fill_model.refit(seat_db)
+        print(f"📈 Fill days refitted for {fit['courses']} courses in {fit['fit_ms']:.1f} ms")
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        if inst.ENABLED:
+            inst.write_run_files("scrape")
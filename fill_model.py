@@ -0,0 +1,163 @@
+import os
+import json
+import time
+import sqlite3
+from datetime import date, datetime
+
+import numpy as np
+
+from class_algorithmn import PASS1_TOTAL_DAYS, FILL_DAYS_TABLE
+
+
+# Replaces the hand-kept COURSE_FILL_DAYS with fill days fitted from
+# the seat history (seat_store.SeatStore). Every course gets a straight
+# line open(t) = a + b*t fitted over its Pass 1 polls, all courses at
+# once through grouped sums; the first Pass 1 day the line (or an
+# observed zero) reaches 0 is its fill day. The result is written to
+# FILL_DAYS_TABLE, which class_algorithmn reads at import.
+
+PASS1_START = None   # date of Pass 1 day 1 for the term being tracked, e.g. date(2026, 2, 9)
+
+
+# ───────────────────────── Loading ─────────────────────────
+
+def load_history(db_path: str, pass1_start: date):
+    # -> (course names, course index per poll, Pass 1 day per poll as a
+    #    float (day 1 starts at midnight of pass1_start), total open)
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT course, ts, SUM(open) FROM snapshots GROUP BY course, ts"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    if not rows:
+        return np.array([], dtype=object), np.array([], dtype=np.int64), \
+            np.array([]), np.array([])
+
+    courses, stamps, totals = zip(*rows)
+    names, idx = np.unique(np.array(courses, dtype=object), return_inverse=True)
+
+    ts = np.array(stamps, dtype="datetime64[us]")
+    start = np.datetime64(pass1_start.isoformat(), "us")
+    t = (ts - start) / np.timedelta64(1, "D") + 1.0
+
+    return names, idx, t, np.array(totals, dtype=np.float64)
+
+
+# ───────────────────────── Fitting ─────────────────────────
+
+def in_window(idx, t, y, total_days=PASS1_TOTAL_DAYS):
+    # polls taken during Pass 1 only
+    keep = (t >= 1) & (t < total_days + 1)
+    return idx[keep], t[keep], y[keep]
+
+
+def fit_lines(idx, t, y, n_courses):
+    # -> (polls, slope, intercept, residual sd, fitted) per course;
+    #    fitted is False where there are too few distinct poll times
+    n = np.bincount(idx, minlength=n_courses).astype(np.float64)
+    st = np.bincount(idx, t, n_courses)
+    sy = np.bincount(idx, y, n_courses)
+    stt = np.bincount(idx, t * t, n_courses)
+    sty = np.bincount(idx, t * y, n_courses)
+    syy = np.bincount(idx, y * y, n_courses)
+
+    denom = n * stt - st * st
+    ok = (n >= 2) & (denom > 1e-9)
+    slope = np.zeros(n_courses)
+    slope[ok] = (n[ok] * sty[ok] - st[ok] * sy[ok]) / denom[ok]
+    intercept = np.where(n > 0, (sy - slope * st) / np.maximum(n, 1), np.inf)
+
+    # sum of squared residuals from the same grouped sums
+    a = np.where(n > 0, intercept, 0.0)
+    sse = syy - 2 * a * sy - 2 * slope * sty \
+        + a * a * n + 2 * a * slope * st + slope * slope * stt
+    resid_sd = np.zeros(n_courses)
+    dof = n > 2
+    resid_sd[ok & dof] = np.sqrt(np.maximum(sse[ok & dof], 0) / (n[ok & dof] - 2))
+    return n, slope, intercept, resid_sd, ok
+
+
+def observed_fill_days(idx, t, y, n_courses, total_days=PASS1_TOTAL_DAYS):
+    # -> first Pass 1 day a poll saw 0 open seats, total_days + 1 if none did
+    observed_day = np.full(n_courses, total_days + 1, dtype=np.int64)
+    zero = y <= 0
+    np.minimum.at(observed_day, idx[zero], np.floor(t[zero]).astype(np.int64))
+    return observed_day
+
+
+def fit_fill_days(idx, t, y, n_courses, total_days=PASS1_TOTAL_DAYS):
+    # -> int array, fill day per course, 0 where it does not fill and
+    #    -1 where the history cannot tell (fewer than 2 Pass 1 polls and
+    #    no observed zero)
+    idx, t, y = in_window(idx, t, y, total_days)
+    _, slope, intercept, _, ok = fit_lines(idx, t, y, n_courses)
+
+    # predicted open seats at the end of every Pass 1 day (day d runs
+    # from t = d to d + 1), so a line reaching 0 during day d gives day d,
+    # the same day a poll seeing the zero would
+    days = np.arange(1, total_days + 1, dtype=np.float64)
+    predicted = intercept[:, None] + slope[:, None] * (days[None, :] + 1)
+    full = predicted <= 0
+    predicted_day = np.where(full.any(axis=1), full.argmax(axis=1) + 1, 0)
+    predicted_day[~ok] = 0
+
+    # an observed zero beats the line
+    observed_day = observed_fill_days(idx, t, y, n_courses, total_days)
+    observed = observed_day <= total_days
+
+    fill_day = predicted_day.copy()
+    both = observed & (fill_day > 0)
+    fill_day[both] = np.minimum(fill_day[both], observed_day[both])
+    fill_day[observed & (fill_day == 0)] = observed_day[observed & (fill_day == 0)]
+    fill_day[~ok & ~observed] = -1
+    return fill_day
+
+
+# ───────────────────────── Lookup Table ─────────────────────────
+
+def save_fill_table(path: str, names, fill_day, pass1_start: date):
+    table = {
+        "pass1_start": pass1_start.isoformat(),
+        "fitted_at": datetime.now().isoformat(timespec="seconds"),
+        # unknown courses are left out, so COURSE_FILL_DAYS still covers them
+        "fill_days": {
+            str(name): (int(d) if d > 0 else None)
+            for name, d in zip(names, fill_day) if d >= 0
+        }
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(table, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def refit(db_path: str, table_path: str = FILL_DAYS_TABLE, pass1_start: date = None):
+    pass1_start = pass1_start or PASS1_START
+    if pass1_start is None:
+        raise RuntimeError("Set fill_model.PASS1_START to the first day of Pass 1")
+
+    t0 = time.perf_counter()
+    names, idx, t, y = load_history(db_path, pass1_start)
+    t1 = time.perf_counter()
+    fill_day = fit_fill_days(idx, t, y, len(names))
+    t2 = time.perf_counter()
+    save_fill_table(table_path, names, fill_day, pass1_start)
+
+    return {
+        "courses": len(names),
+        "polls": len(t),
+        "filling": int((fill_day > 0).sum()),
+        "unknown": int((fill_day < 0).sum()),
+        "load_ms": (t1 - t0) * 1000,
+        "fit_ms": (t2 - t1) * 1000
+    }
+
+
+if __name__ == "__main__":
+    db = r"C:/Users/PC4/OneDrive/Desktop/reg classproject/seat_history.sqlite"
+    stats = refit(db)
+    print(f"✅ Fill days for {stats['courses']} courses ({stats['filling']} fill in Pass 1) "
+          f"fitted in {stats['fit_ms']:.1f} ms, saved to {FILL_DAYS_TABLE}")
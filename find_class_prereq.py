@@ -4,30 +4,78 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote
+import threading
 import logging
 import re
 import json
 from prereq_alg import parse_prereq_json  # your custom parser function
+from prereq_cache import PrereqCache
+from catalog_format import write_catalog
+import instrumentation as inst
 
 # --- Chrome driver setup ---
-chrome_options = Options()
-chrome_options.add_argument("--headless")
-chrome_options.add_argument("--disable-gpu")
-chrome_options.add_argument("--window-size=1920x1080")
-chrome_options.add_argument("--no-sandbox")
-chrome_options.add_argument("--disable-dev-shm-usage")
-
-driver = webdriver.Chrome(options=chrome_options)
+def make_chrome_options():
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920x1080")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    return chrome_options
+
+def make_driver():
+    return webdriver.Chrome(options=make_chrome_options())
 
 # --- Define course codes to scrape ---
 course_codes = [
      "STA 035B", "STA 035C"
 ]
 
+CATALOG_SEARCH_URL = "https://catalog.ucdavis.edu/course-search/"
+# CourseLeaf jumps straight to a course's block for ?P=<code>; set to
+# None to always go through the search page
+COURSE_DETAIL_URL = "https://catalog.ucdavis.edu/search/?P={code}"
+PREREQ_SELECTOR = "p.text.courseblockdetail.detail-prerequisite"
+
+def course_detail_url(course_code):
+    if COURSE_DETAIL_URL is None:
+        return None
+    return COURSE_DETAIL_URL.format(code=quote(course_code))
+
+def _read_prereq_text(driver, course_code, timeout=10):
+    try:
+        with inst.span("webdriver_wait"):
+            prereq_element = WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, PREREQ_SELECTOR))
+            )
+        prereq_text = prereq_element.text.strip()
+        prereq_text = re.sub(r'^Prerequisite\(s\):\s*', '', prereq_text)
+        print(f"Prerequisites for {course_code}: {prereq_text}")
+        return prereq_text
+    except TimeoutException:
+        print(f"No prerequisites found for {course_code}")
+        return ""
+
 # --- Scraping Function ---
+@inst.timed()
 def scrape_course_prerequisites(driver, course_code):
     try:
-        driver.get("https://catalog.ucdavis.edu/course-search/")
+        # Direct detail page: only trusted if the course block rendered
+        url = course_detail_url(course_code)
+        if url:
+            driver.get(url)
+            inst.count("pages_loaded")
+            blocks = driver.find_elements(By.CSS_SELECTOR, "div.courseblock")
+            if blocks:
+                if not driver.find_elements(By.CSS_SELECTOR, PREREQ_SELECTOR):
+                    print(f"No prerequisites found for {course_code}")
+                    return ""
+                return _read_prereq_text(driver, course_code, timeout=0)
+
+        driver.get(CATALOG_SEARCH_URL)
+        inst.count("pages_loaded")
 
         # Find search box
         search_box = WebDriverWait(driver, 10).until(
@@ -42,56 +90,91 @@ def scrape_course_prerequisites(driver, course_code):
             EC.element_to_be_clickable((By.CLASS_NAME, "result__link"))
         )
         first_result.click()
+        inst.count("pages_loaded")
 
         # Find prerequisites
-        try:
-            prereq_element = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "p.text.courseblockdetail.detail-prerequisite")
-                )
-            )
-            prereq_text = prereq_element.text.strip()
-            prereq_text = re.sub(r'^Prerequisite\(s\):\s*', '', prereq_text)
-            print(f"Prerequisites for {course_code}: {prereq_text}")
-            return prereq_text
-        except TimeoutException:
-            print(f"No prerequisites found for {course_code}")
-            return ""
+        return _read_prereq_text(driver, course_code)
 
     except Exception as e:
         logging.error(f"Error while processing {course_code}: {e}")
         return ""
 
-# --- Scrape prerequisites for each course ---
-prereq_texts = []
-for code in course_codes:
-    prereq = scrape_course_prerequisites(driver, code)
-    prereq_texts.append(prereq)
-
-# --- Parse using prereq_alg ---
-output = {}
-
-for code, text in zip(course_codes, prereq_texts):
-    print(f"Processing {code} with text: '{text}'")
-
+# --- Parse one scraped text (same rules as the old script loop) ---
+def parse_scraped(code, text, cache=None):
     if not text.strip():
         print(f"Skipping {code} because no prereq text found.")
-        output[code] = {}
-        continue
-
+        return {}
     try:
-        parsed_json = parse_prereq_json([code], [text])
-        output.update(parsed_json)
+        return parse_prereq_json([code], [text], cache=cache)[code]
     except Exception as e:
         logging.error(f"Failed to parse {code}: {e}")
-        output[code] = {}
+        return {}
+
+# --- Concurrent scraper ---
+# Each worker thread keeps its own Chrome for all the courses it is
+# handed. Yields (course_code, prereq_text, parsed_json) as soon as a
+# course finishes, so parsing overlaps with the remaining scraping.
+def scrape_catalog_prereqs(codes, workers=4, cache=None, driver_factory=make_driver):
+    local = threading.local()
+    drivers = []
+    drivers_lock = threading.Lock()
+
+    def scrape(code):
+        driver = getattr(local, "driver", None)
+        if driver is None:
+            driver = local.driver = driver_factory()
+            with drivers_lock:
+                drivers.append(driver)
+        return scrape_course_prerequisites(driver, code)
 
-# --- Save to JSON ---
-output_file = r"C:\\Users\\PC4\\OneDrive\\Desktop\\reg classproject\\parsed_prereqs.json"
-with open(output_file, "w") as f:
-    json.dump(output, f, indent=2)
-
-print(f"\u2705 Prerequisite structure saved to {output_file}")
-
-# --- Cleanup ---
-driver.quit()
\ No newline at end of file
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(scrape, code): code for code in codes}
+            for fut in as_completed(futures):
+                code = futures[fut]
+                text = fut.result()
+                print(f"Processing {code} with text: '{text}'")
+                yield code, text, parse_scraped(code, text, cache)
+    finally:
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+# --- Run: scrape, parse and save ---
+def main(codes=course_codes, workers=4):
+    save_dir = r"C:\\Users\\PC4\\OneDrive\\Desktop\\reg classproject"
+    output_file = save_dir + r"\\parsed_prereqs.json"
+    catalog_file = save_dir + r"\\catalog.rgc"
+
+    # unchanged text comes from the cache
+    cache = PrereqCache(save_dir + r"\\prereq_cache.sqlite")
+
+    results = {}
+    for code, _, parsed in scrape_catalog_prereqs(codes, workers=workers, cache=cache):
+        results[code] = parsed
+
+    # keep the input order in the saved file
+    output = {code: results[code] for code in codes}
+
+    with open(output_file, "w") as f:
+        json.dump(output, f, indent=2)
+
+    print(f"\u2705 Prerequisite structure saved to {output_file}")
+
+    # compiled copy for the schedulers (catalog_format.load_catalog)
+    write_catalog(output, catalog_file)
+    print(f"\u2705 Compiled catalog saved to {catalog_file}")
+
+    stats = cache.stats()
+    print(f"Parse cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['entries']} entries")
+    cache.close()
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        if inst.ENABLED:
+            inst.write_run_files("prereqs")
@@ -0,0 +1,238 @@
+import json
+import time
+import hashlib
+
+import class_algorithmn as ca
+from catalog_index import catalog_index, index_for_prerequisites
+
+
+# Re-planning after a student's completed courses or units change,
+# giving exactly what build_schedule() would give from scratch.
+# build_schedule is a pure function of its state at the start of each
+# semester, (completed mask, units so far):
+#   - replaying the old plan gives the state before each of its
+#     semesters; as soon as the new run reaches one of those states the
+#     rest of the old plan is reused as is (renumbered)
+#   - a semester that has to be computed goes through a cache keyed by
+#     that state, shared by every student planned with this object
+#   - needed_mask(i, completed) only looks at the completed bits of
+#     courses in i's own tree, so it is cached on (i, those bits)
+# The old plan must come from the same catalog. Fill days and limits
+# can change between the two runs (fill days are refitted after polls):
+# plan_config() fingerprints them, and replan() only reuses an old plan
+# built under the fingerprint it is given. The semester cache is
+# dropped whenever they change.
+
+EVAL_CACHE_SIZE = 200_000
+SEMESTER_CACHE_SIZE = 50_000
+
+
+class IncrementalPlanner:
+    def __init__(self, circuit=None):
+        if circuit is None:
+            circuit = index_for_prerequisites(ca.prerequisites).circuit
+        self.circuit = circuit
+        self.mentions = catalog_index(circuit).mentions
+
+        self.evals = {}       # (course index, completed & mentions) -> needed mask
+        self.semesters = {}   # (completed, units) -> courses taken, None if infeasible
+        self.config = None
+        self.fingerprint = None
+
+        self.eval_hits = 0
+        self.eval_misses = 0
+        self.reused = 0       # semesters copied from the old plan
+        self.computed = 0     # semesters evaluated
+        self.cached = 0       # semesters served from the semester cache
+
+    def _check_config(self):
+        config = (dict(ca.COURSE_FILL_DAYS), ca.MAX_COURSES_PER_SEMESTER, ca.UNITS_PER_COURSE)
+        if config != self.config:
+            self.config = config
+            self.fingerprint = hashlib.sha256(json.dumps(
+                [sorted(config[0].items()), config[1], config[2]]
+            ).encode("utf-8")).hexdigest()
+            self.semesters.clear()
+        return self.fingerprint
+
+    # ---------- evaluation ----------
+
+    def _needed(self, i, completed):
+        key = (i, completed & self.mentions[i])
+        needed = self.evals.get(key)
+        if needed is None:
+            self.eval_misses += 1
+            if len(self.evals) >= EVAL_CACHE_SIZE:
+                self.evals.clear()
+            needed = self.evals[key] = self.circuit.needed_mask(i, completed)
+        else:
+            self.eval_hits += 1
+        return needed
+
+    def _semester(self, completed, total_units):
+        # one iteration of build_schedule's loop
+        key = (completed, total_units)
+        if key in self.semesters:
+            self.cached += 1
+            return self.semesters[key]
+
+        self.computed += 1
+        circuit = self.circuit
+        remaining = circuit.full_mask & ~completed
+        pass1_day = ca.estimate_pass1_day(total_units)
+        available = []
+
+        for i in circuit.indices_of(remaining):
+            c = circuit.courses[i]
+            if not ca.course_available(c, pass1_day):
+                continue
+
+            needed = self._needed(i, completed)
+            if not needed & ~completed:
+                available.append(c)
+            else:
+                for n in circuit.courses_of(needed & remaining):
+                    if ca.course_available(n, pass1_day):
+                        available.append(n)
+
+        taking = available[:ca.MAX_COURSES_PER_SEMESTER] or None
+        if len(self.semesters) >= SEMESTER_CACHE_SIZE:
+            self.semesters.clear()
+        self.semesters[key] = taking
+        return taking
+
+    def _run(self, completed, total_units, plan, reuse=None):
+        # extends plan from the given state; reuse maps an old plan's
+        # states to (old plan, position)
+        circuit = self.circuit
+        while completed != circuit.full_mask:
+            if reuse is not None and (completed, total_units) in reuse:
+                old, j = reuse[(completed, total_units)]
+                for s in old[j:]:
+                    plan.append({
+                        "semester": len(plan) + 1,
+                        "units_before": s["units_before"],
+                        "pass1_day": s["pass1_day"],
+                        "courses": list(s["courses"])
+                    })
+                self.reused += len(old) - j
+                return plan
+
+            taking = self._semester(completed, total_units)
+            pass1_day = ca.estimate_pass1_day(total_units)
+            if taking is None:
+                raise RuntimeError(
+                    f"No feasible courses (semester {len(plan) + 1}, Pass 1 day {pass1_day})"
+                )
+
+            plan.append({
+                "semester": len(plan) + 1,
+                "units_before": total_units,
+                "pass1_day": pass1_day,
+                "courses": list(taking)
+            })
+            completed |= circuit.mask_of(taking)
+            total_units += len(taking) * ca.UNITS_PER_COURSE
+        return plan
+
+    # ---------- planning ----------
+
+    def plan_config(self):
+        # fingerprint of the fill days and limits plans are built under now;
+        # store it with a plan and hand it back to replan()
+        return self._check_config()
+
+    def plan(self, start_units, completed=()):
+        # same result as build_schedule(start_units, circuit, completed)
+        self._check_config()
+        return self._run(self.circuit.mask_of(completed), start_units, [])
+
+    def replan(self, plan, start_units, completed=(), added=(), removed=(),
+               new_start_units=None, config=None):
+        # plan: build_schedule(start_units, circuit, completed) from before the
+        # change, built under config (a plan_config() fingerprint). -> the
+        # plan for completed - removed + added, starting at new_start_units
+        # (start_units when None). A plan from another config, or without
+        # one, is not reused.
+        circuit = self.circuit
+        done = (set(completed) - set(removed)) | set(added)
+        units = start_units if new_start_units is None else new_start_units
+        if config is None or config != self._check_config():
+            return self._run(circuit.mask_of(done), units, [])
+
+        reuse = {}
+        state = circuit.mask_of(completed)
+        before = start_units
+        for j, s in enumerate(plan):
+            if s["units_before"] != before:
+                raise ValueError(
+                    f"plan semester {s['semester']} starts at {s['units_before']} units, "
+                    f"expected {before}; it was not built from these start_units/completed"
+                )
+            reuse.setdefault((state, before), (plan, j))
+            state |= circuit.mask_of(s["courses"])
+            before += len(s["courses"]) * ca.UNITS_PER_COURSE
+
+        return self._run(circuit.mask_of(done), units, [], reuse)
+
+    def stats(self):
+        lookups = self.eval_hits + self.eval_misses
+        return {
+            "semesters_reused": self.reused,
+            "semesters_computed": self.computed,
+            "semesters_cached": self.cached,
+            "eval_hit_rate": self.eval_hits / lookups if lookups else 0.0,
+            "eval_entries": len(self.evals),
+            "semester_entries": len(self.semesters)
+        }
+
+
+def planner_for(circuit) -> IncrementalPlanner:
+    # one planner (and its caches) per compiled circuit
+    planner = circuit.__dict__.get("_incremental_planner")
+    if planner is None:
+        planner = circuit.__dict__["_incremental_planner"] = IncrementalPlanner(circuit)
+    return planner
+
+
+def replan(plan, start_units, completed=(), added=(), removed=(), new_start_units=None,
+           circuit=None, config=None):
+    if circuit is None:
+        circuit = index_for_prerequisites(ca.prerequisites).circuit
+    return planner_for(circuit).replan(plan, start_units, completed, added, removed,
+                                       new_start_units, config)
+
+
+if __name__ == "__main__":
+    # a nightly sync: every student finished their first planned semester,
+    # a few also dropped one of those courses
+    circuit = index_for_prerequisites(ca.prerequisites).circuit
+    students = [(units, ()) for units in range(0, 140, 4)] * 100
+    plans = [ca.build_schedule(u, circuit, done) for u, done in students]
+    config = planner_for(circuit).plan_config()   # stored with the plans
+
+    deltas = []
+    for n, ((units, done), plan) in enumerate(zip(students, plans)):
+        first = plan[0]["courses"]
+        taken = first[1:] if n % 10 == 0 else first
+        deltas.append((taken, units + len(taken) * ca.UNITS_PER_COURSE))
+
+    t0 = time.perf_counter()
+    rebuilt = [
+        ca.build_schedule(new_units, circuit, tuple(done) + tuple(taken))
+        for (units, done), (taken, new_units) in zip(students, deltas)
+    ]
+    t1 = time.perf_counter()
+    planner = planner_for(circuit)
+    updated = [
+        planner.replan(plan, units, done, added=taken, new_start_units=new_units,
+                       config=config)
+        for (units, done), plan, (taken, new_units) in zip(students, plans, deltas)
+    ]
+    t2 = time.perf_counter()
+
+    print(f"✅ Re-planned {len(students)} students in {t2 - t1:.2f}s "
+          f"(full rebuild {t1 - t0:.2f}s), identical: {updated == rebuilt}")
+    stats = planner.stats()
+    print(f"   {stats['semesters_reused']} semesters reused, "
+          f"{stats['semesters_computed']} computed, {stats['semesters_cached']} from cache")
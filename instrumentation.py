@@ -0,0 +1,193 @@
+import os
+import json
+import time
+import threading
+from functools import wraps
+
+
+# Spans and counters for finding where a run's time went. Off unless
+# REG_INSTRUMENT=1 (or enable() is called): span() then hands back one
+# shared no-op context and count()/timed() return after a single flag
+# check. Hot loops guard with `if inst.ENABLED:` before counting.
+#
+# write_run_files() leaves <run>_report.json and <run>.prom (Prometheus
+# text format, for the node exporter's textfile collector) in
+# REG_METRICS_DIR or the given directory.
+
+ENABLED = os.getenv("REG_INSTRUMENT", "") not in ("", "0")
+METRIC_PREFIX = "reg_classproject"
+
+_lock = threading.Lock()
+_spans = {}       # name -> [calls, total seconds, max seconds]
+_counters = {}
+_started = time.time()
+
+
+def enable(on: bool = True):
+    global ENABLED
+    ENABLED = on
+
+
+def reset():
+    global _started
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _started = time.time()
+
+
+# ───────────────────────── Recording ─────────────────────────
+
+def record_span(name: str, seconds: float):
+    with _lock:
+        s = _spans.get(name)
+        if s is None:
+            s = _spans[name] = [0, 0.0, 0.0]
+        s[0] += 1
+        s[1] += seconds
+        if seconds > s[2]:
+            s[2] = seconds
+
+
+def count(name: str, n: int = 1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def merge_report(data):
+    # folds in a report() taken in another process (e.g. a scraper worker)
+    with _lock:
+        for name, r in data.get("spans", {}).items():
+            s = _spans.get(name)
+            if s is None:
+                s = _spans[name] = [0, 0.0, 0.0]
+            s[0] += r["calls"]
+            s[1] += r["total_seconds"]
+            if r["max_seconds"] > s[2]:
+                s[2] = r["max_seconds"]
+        for name, value in data.get("counters", {}).items():
+            _counters[name] = _counters.get(name, 0) + value
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record_span(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str):
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+def timed(name: str = None):
+    # decorator: the whole call becomes one span
+    def wrap(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record_span(label, time.perf_counter() - t0)
+        return inner
+    return wrap
+
+
+# ───────────────────────── Reports ─────────────────────────
+
+def report():
+    with _lock:
+        spans = {
+            name: {
+                "calls": calls,
+                "total_seconds": total,
+                "mean_seconds": total / calls if calls else 0.0,
+                "max_seconds": longest
+            }
+            for name, (calls, total, longest) in sorted(_spans.items())
+        }
+        counters = dict(sorted(_counters.items()))
+    return {
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(_started)),
+        "wall_seconds": time.time() - _started,
+        "spans": spans,
+        "counters": counters
+    }
+
+
+def prometheus_text(run: str, data=None) -> str:
+    data = data or report()
+    p = METRIC_PREFIX
+    lines = [
+        f"# HELP {p}_span_seconds Time spent in instrumented stages",
+        f"# TYPE {p}_span_seconds summary",
+    ]
+    for name, s in data["spans"].items():
+        labels = f'run="{run}",span="{name}"'
+        lines.append(f"{p}_span_seconds_sum{{{labels}}} {s['total_seconds']:.6f}")
+        lines.append(f"{p}_span_seconds_count{{{labels}}} {s['calls']}")
+
+    lines += [
+        f"# HELP {p}_span_max_seconds Longest single call per stage",
+        f"# TYPE {p}_span_max_seconds gauge",
+    ]
+    for name, s in data["spans"].items():
+        lines.append(f'{p}_span_max_seconds{{run="{run}",span="{name}"}} {s["max_seconds"]:.6f}')
+
+    for name, value in data["counters"].items():
+        lines.append(f"# TYPE {p}_{name}_total counter")
+        lines.append(f'{p}_{name}_total{{run="{run}"}} {value}')
+
+    lines += [
+        f"# TYPE {p}_run_wall_seconds gauge",
+        f'{p}_run_wall_seconds{{run="{run}"}} {data["wall_seconds"]:.3f}',
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path, text):
+    # the textfile collector must never see a half-written file
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def write_run_files(run: str, directory: str = "."):
+    # -> (json path, prom path)
+    directory = os.getenv("REG_METRICS_DIR") or directory
+    os.makedirs(directory, exist_ok=True)
+    data = report()
+    json_path = os.path.join(directory, f"{run}_report.json")
+    prom_path = os.path.join(directory, f"{run}.prom")
+    _write_atomic(json_path, json.dumps(data, indent=2))
+    _write_atomic(prom_path, prometheus_text(run, data))
+    return json_path, prom_path
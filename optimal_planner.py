@@ -0,0 +1,265 @@
+import time
+from itertools import combinations
+
+import class_algorithmn as ca
+from catalog_index import catalog_index
+
+
+# ───────────────────────── Bounds ─────────────────────────
+# Both bounds ignore fill days and the per-semester cap, so they
+# never over-estimate how many semesters are still needed.
+
+def _course_earliest(circuit, i, earliest, ready_at):
+    # 1 + the semester course i's tree is first satisfied in. A node is
+    # ready once all (AND) or any (OR) of its children are.
+    kind, bit = circuit.kind, circuit.bit
+    start, end, children = circuit.child_start, circuit.child_end, circuit.children
+    r = circuit.root[i]
+    if r < 0:
+        return 1
+
+    for k in range(circuit.first[i], r + 1):
+        t = kind[k]
+        if t == ca.NODE_SINGLE or t == ca.NODE_COURSE:
+            ready_at[k] = earliest[bit[k].bit_length() - 1]
+        elif t == ca.NODE_AND:
+            ready_at[k] = max(
+                (ready_at[children[j]] for j in range(start[k], end[k])),
+                default=0
+            )
+        elif t == ca.NODE_OR:
+            ready_at[k] = min(
+                (ready_at[children[j]] for j in range(start[k], end[k])),
+                default=0
+            )
+        else:
+            ready_at[k] = 0
+    return 1 + ready_at[r]
+
+
+def earliest_semesters(circuit, completed, previous=None, taken=0):
+    # earliest[i] = first semester course i could possibly be taken
+    # (critical-path length). One pass in catalog_index's topological
+    # order, prerequisites first. previous: the result for
+    # completed & ~taken; then only courses built on the taken ones
+    # (unlocks_closure) are looked at, in the same order.
+    index = catalog_index(circuit)
+    if index.order is None:
+        return _earliest_fixpoint(circuit, completed)
+
+    if previous is None:
+        earliest = [0] * len(circuit.courses)
+        ready_at = [0] * len(circuit.kind)
+        for i in index.order:
+            earliest[i] = 0 if completed >> i & 1 else _course_earliest(circuit, i, earliest, ready_at)
+        return earliest
+
+    # a course only moves when something in its own tree moved
+    earliest = list(previous)
+    moved = 0
+    for i in circuit.indices_of(taken):
+        if earliest[i]:
+            earliest[i] = 0
+            moved |= 1 << i
+    affected = 0
+    for j in circuit.indices_of(moved):
+        affected |= index.unlocks_closure[j]
+
+    ready_at = [0] * len(circuit.kind)
+    mentions = index.mentions
+    for i in sorted(circuit.indices_of(affected & ~completed), key=index.position.__getitem__):
+        if mentions[i] & moved:
+            e = _course_earliest(circuit, i, earliest, ready_at)
+            if e != earliest[i]:
+                earliest[i] = e
+                moved |= 1 << i
+    return earliest
+
+
+def _earliest_fixpoint(circuit, completed):
+    # same, relaxed to a fixpoint when the catalog has a prerequisite
+    # cycle; the cycle pushes its courses past n and marks them unreachable
+    n = len(circuit.courses)
+    earliest = [0 if completed >> i & 1 else 1 for i in range(n)]
+    ready_at = [0] * len(circuit.kind)
+
+    for _ in range(n + 1):
+        changed = False
+        for i in range(n):
+            if completed >> i & 1 or circuit.root[i] < 0:
+                continue
+            e = min(_course_earliest(circuit, i, earliest, ready_at), n + 1)
+            if e > earliest[i]:
+                earliest[i] = e
+                changed = True
+        if not changed:
+            break
+
+    return earliest
+
+
+def chain_tails(circuit):
+    # tail[i] = longest chain of courses that still has to follow
+    # course i, used to try critical courses first
+    return catalog_index(circuit).tail
+
+
+def lower_bound(circuit, completed, remaining_count, earliest=None):
+    if not remaining_count:
+        return 0
+    if earliest is None:
+        earliest = earliest_semesters(circuit, completed)
+    critical = max(earliest)
+    by_count = -(-remaining_count // ca.MAX_COURSES_PER_SEMESTER)
+    return max(critical, by_count)
+
+
+# ───────────────────────── Search ─────────────────────────
+
+def _ready(circuit, completed, previous=None, taken=0):
+    # courses whose prerequisites completed satisfies. needed_mask only
+    # looks at the course's own tree, so from the result for
+    # completed & ~taken only the courses mentioning a taken one are
+    # evaluated again (either way: an OR can switch options).
+    if previous is None:
+        candidates = circuit.full_mask
+        ready = 0
+    else:
+        unlocks_direct = catalog_index(circuit).unlocks_direct
+        candidates = 0
+        for j in circuit.indices_of(taken):
+            candidates |= unlocks_direct[j]
+        ready = previous & ~candidates
+
+    for i in circuit.indices_of(candidates):
+        if not circuit.needed_mask(i, completed) & ~completed:
+            ready |= 1 << i
+    return ready
+
+
+def _eligible(circuit, ready, remaining, pass1_day):
+    return [
+        i for i in circuit.indices_of(ready & remaining)
+        if ca.course_available(circuit.courses[i], pass1_day)
+    ]
+
+
+def _to_plan(circuit, start_units, semesters):
+    plan = []
+    total_units = start_units
+    for n, taking in enumerate(semesters, start=1):
+        plan.append({
+            "semester": n,
+            "units_before": total_units,
+            "pass1_day": ca.estimate_pass1_day(total_units),
+            "courses": [circuit.courses[i] for i in taking]
+        })
+        total_units += len(taking) * ca.UNITS_PER_COURSE
+    return plan
+
+
+# Depth-first branch and bound over completed-course bitmasks.
+# Dominance: taking more courses never hurts (units only move the
+# Pass 1 day earlier and prerequisites only get more satisfied), so
+# each semester only branches on full-size course sets. A completed
+# mask already reached in as few semesters is not expanded again.
+# When max_nodes or time_limit runs out the best plan so far is
+# returned; search_stats records whether it was proven optimal.
+def build_schedule_optimal(start_units, circuit=None, completed=(),
+                           max_nodes=200_000, time_limit=5.0,
+                           search_stats=None):
+    if circuit is None:
+        circuit = ca.compile_prerequisites(ca.prerequisites)
+
+    start_mask = circuit.mask_of(completed)
+    tail = chain_tails(circuit)
+
+    best = None
+    try:
+        greedy = ca.build_schedule_ready(start_units, circuit, completed)
+        best = [[circuit.index[c] for c in s["courses"]] for s in greedy]
+    except RuntimeError:
+        pass
+
+    seen = {}
+    nodes = 0
+    deadline = time.perf_counter() + time_limit
+    exhausted = False
+    path = []
+
+    def search(done, units, earliest, ready, taken):
+        nonlocal best, nodes, exhausted
+
+        remaining = circuit.full_mask & ~done
+        if not remaining:
+            if best is None or len(path) < len(best):
+                best = [list(s) for s in path]
+            return
+
+        nodes += 1
+        if nodes > max_nodes or time.perf_counter() > deadline:
+            exhausted = True
+            return
+
+        depth = len(path)
+        if seen.get(done, depth + 1) <= depth:
+            return
+        seen[done] = depth
+
+        # the parent's bound, updated for the courses just taken
+        earliest = earliest_semesters(circuit, done, earliest, taken)
+        bound = lower_bound(circuit, done, remaining.bit_count(), earliest)
+        if bound > len(circuit.courses):
+            return   # something is unreachable from here
+        if best is not None and depth + bound >= len(best):
+            return
+
+        pass1_day = ca.estimate_pass1_day(units)
+        ready = _ready(circuit, done, ready, taken)
+        eligible = _eligible(circuit, ready, remaining, pass1_day)
+        if not eligible:
+            return
+
+        eligible.sort(key=lambda i: (-tail[i], i))
+        size = min(len(eligible), ca.MAX_COURSES_PER_SEMESTER)
+
+        for taking in combinations(eligible, size):
+            path.append(taking)
+            mask = 0
+            for i in taking:
+                mask |= 1 << i
+            search(done | mask, units + size * ca.UNITS_PER_COURSE, earliest, ready, mask)
+            path.pop()
+            if exhausted:
+                return
+
+    search(start_mask, start_units, None, None, 0)
+
+    if search_stats is not None:
+        search_stats.update({
+            "nodes": nodes,
+            "optimal": not exhausted,
+            "semesters": len(best) if best is not None else None
+        })
+
+    if best is None:
+        raise RuntimeError(
+            "No feasible plan found"
+            + (" within the search budget" if exhausted else "")
+        )
+
+    return _to_plan(circuit, start_units, best)
+
+
+if __name__ == "__main__":
+    stats = {}
+    schedule = build_schedule_optimal(start_units=32, search_stats=stats)
+
+    for s in schedule:
+        print(f"\nSemester {s['semester']}")
+        print(f"  Units before: {s['units_before']}")
+        print(f"  Pass 1 day:   {s['pass1_day']}")
+        for c in s["courses"]:
+            print(f"   - {c}")
+
+    print(f"\nSearched {stats['nodes']} states, optimal: {stats['optimal']}")
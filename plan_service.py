@@ -0,0 +1,259 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import class_algorithmn as ca
+import optimal_planner as op
+from catalog_index import build_schedule_critical
+from catalog_format import load_catalog
+
+
+# Long-running planner for the advising front-end. The compiled
+# catalog and fill days stay in memory; finished plans are kept as
+# encoded JSON in an LRU keyed by (start_units, completed courses,
+# config). Reloading the catalog or the fill-day table clears it.
+#
+#   GET  /plan?start_units=32&completed=STA+013&completed=MAT+021B[&planner=ready]
+#   POST /plan      {"start_units": 32, "completed": [...], "planner": "greedy"}
+#   GET  /stats
+#   POST /reload
+
+PORT = 8765
+CACHE_SIZE = 4096
+RELOAD_CHECK_SECONDS = 1.0   # how often file mtimes are looked at
+
+PLANNERS = {
+    "greedy": ca.build_schedule,
+    "ready": ca.build_schedule_ready,
+    "critical": build_schedule_critical,
+    "optimal": op.build_schedule_optimal,
+}
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+class PlanService:
+    def __init__(self, catalog_file: str = None, fill_table: str = ca.FILL_DAYS_TABLE,
+                 cache_size: int = CACHE_SIZE):
+        self.catalog_file = catalog_file
+        self.fill_table = fill_table
+        self.cache_size = cache_size
+
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()
+        self.latencies = deque(maxlen=2000)   # seconds, most recent requests
+        self.started = time.time()
+        self.requests = 0
+        self.hits = 0
+        self.errors = 0
+        self.reloads = 0
+        self.last_check = 0.0
+        self.reload()
+
+    # ---------- data ----------
+
+    def reload(self):
+        if self.catalog_file and os.path.exists(self.catalog_file):
+            circuit = load_catalog(self.catalog_file)
+        else:
+            circuit = ca.compile_prerequisites(ca.prerequisites)
+        fill_days = ca.read_fill_days(self.fill_table)
+
+        with self.lock:
+            # one swap, so plans running meanwhile never see a half-loaded table
+            ca.COURSE_FILL_DAYS = fill_days
+            self.circuit = circuit
+            self.mtimes = (_mtime(self.catalog_file), _mtime(self.fill_table))
+            self.cache.clear()
+            self.reloads += 1
+
+    def _check_files(self):
+        now = time.monotonic()
+        if now - self.last_check < RELOAD_CHECK_SECONDS:
+            return
+        self.last_check = now
+        if (_mtime(self.catalog_file), _mtime(self.fill_table)) != self.mtimes:
+            self.reload()
+
+    def config(self, planner):
+        return (planner, ca.UNITS_PER_COURSE, ca.MAX_COURSES_PER_SEMESTER, ca.PASS1_TOTAL_DAYS)
+
+    # ---------- planning ----------
+
+    def plan_json(self, start_units, completed=(), planner="greedy"):
+        # -> (HTTP status, encoded body, served from cache)
+        t0 = time.perf_counter()
+        self._check_files()
+        if not isinstance(planner, str) or planner not in PLANNERS:
+            raise ValueError(f"unknown planner {planner!r}; use one of {', '.join(PLANNERS)}")
+        if isinstance(start_units, bool) or not isinstance(start_units, (int, str)):
+            raise TypeError(f"start_units must be a whole number, not {start_units!r}")
+        if isinstance(completed, (str, bytes, dict)):
+            raise TypeError("completed must be a list of course codes")
+        completed = list(completed)
+        if not all(isinstance(c, str) for c in completed):
+            raise TypeError("completed must be a list of course codes")
+
+        circuit = self.circuit
+        # courses outside the catalog never change a plan
+        done = tuple(sorted({c for c in completed if c in circuit.index}))
+        key = (int(start_units), done, self.config(planner))
+
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+        hit = cached is not None
+
+        if not hit:
+            try:
+                plan = PLANNERS[planner](key[0], circuit, done)
+                cached = (200, json.dumps({"plan": plan}).encode())
+            except RuntimeError as e:
+                cached = (422, json.dumps({"error": str(e)}).encode())
+            with self.lock:
+                if circuit is self.circuit:   # not reloaded meanwhile
+                    self.cache[key] = cached
+                    if len(self.cache) > self.cache_size:
+                        self.cache.popitem(last=False)
+
+        with self.lock:
+            self.requests += 1
+            self.hits += hit
+            self.latencies.append(time.perf_counter() - t0)
+        return cached[0], cached[1], hit
+
+    def plan(self, start_units, completed=(), planner="greedy"):
+        status, body, _ = self.plan_json(start_units, completed, planner)
+        data = json.loads(body)
+        if status != 200:
+            raise RuntimeError(data["error"])
+        return data["plan"]
+
+    def stats(self):
+        with self.lock:
+            lat = sorted(self.latencies)
+            uptime = time.time() - self.started
+            pick = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))] * 1000 if lat else 0.0
+            return {
+                "uptime_seconds": uptime,
+                "requests": self.requests,
+                "cache_hits": self.hits,
+                "hit_rate": self.hits / self.requests if self.requests else 0.0,
+                "errors": self.errors,
+                "requests_per_sec": self.requests / uptime if uptime else 0.0,
+                "latency_ms": {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)},
+                "cache_entries": len(self.cache),
+                "reloads": self.reloads,
+                "courses": len(self.circuit.courses)
+            }
+
+
+# ───────────────────────── HTTP ─────────────────────────
+
+def make_handler(service: PlanService):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _send(self, status, body, extra=()):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in extra:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status, message):
+            with service.lock:
+                service.errors += 1
+            self._send(status, json.dumps({"error": message}).encode())
+
+        def _plan(self, start_units, completed, planner):
+            try:
+                status, body, hit = service.plan_json(start_units, completed, planner)
+            except (TypeError, ValueError) as e:
+                self._error(400, str(e))
+                return
+            self._send(status, body, [("X-Cache", "hit" if hit else "miss")])
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == "/plan":
+                query = parse_qs(parts.query)
+                self._plan(
+                    query.get("start_units", ["0"])[0],
+                    query.get("completed", []),
+                    query.get("planner", ["greedy"])[0]
+                )
+            elif parts.path == "/stats":
+                self._send(200, json.dumps(service.stats()).encode())
+            else:
+                self._error(404, f"no route {parts.path}")
+
+        def do_POST(self):
+            path = urlsplit(self.path).path
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length) if length else b""
+
+            if path == "/plan":
+                try:
+                    req = json.loads(raw or b"{}")
+                except ValueError:
+                    self._error(400, "body is not JSON")
+                    return
+                if not isinstance(req, dict):
+                    self._error(400, "body must be a JSON object")
+                    return
+                self._plan(
+                    req.get("start_units", 0),
+                    req.get("completed", []),
+                    req.get("planner", "greedy")
+                )
+            elif path == "/reload":
+                service.reload()
+                self._send(200, json.dumps(service.stats()).encode())
+            else:
+                self._error(404, f"no route {path}")
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(service: PlanService, port: int = PORT, host: str = "127.0.0.1"):
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    return server
+
+
+def main(port: int = PORT):
+    save_dir = r"C:/Users/PC4/OneDrive/Desktop/reg classproject"
+    service = PlanService(catalog_file=save_dir + "/catalog.rgc")
+    server = serve(service, port)
+    print(f"🗓️ Planning service on http://127.0.0.1:{port} "
+          f"({len(service.circuit.courses)} courses)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        stats = service.stats()
+        print(f"Served {stats['requests']} plans, {stats['hit_rate']:.0%} from cache, "
+              f"p95 {stats['latency_ms']['p95']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
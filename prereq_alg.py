@@ -1,6 +1,15 @@
 import re
+import os
 import json
-from itertools import count
+import time
+from itertools import count, repeat
+from concurrent.futures import ProcessPoolExecutor
+
+import instrumentation as inst
+
+# Bump whenever tokenize/parse/build_json output changes; cached
+# results keyed on an older version are then ignored.
+PARSER_VERSION = 1
 
 # --- Tokenizer ---
 def tokenize(expr):
@@ -18,6 +27,33 @@ def tokenize(expr):
     tokens = expr.split()
     return [t.replace('_', ' ') for t in tokens if t.strip() and t != '.']
 
+# --- Compiled tokenizer ---
+# Same output as tokenize() with the patterns compiled once and the
+# eight passes folded into four. Only passes that commute are merged:
+# the note/brace removal can join words ("A{x}B" -> "AB") so it stays
+# ahead of the grade removal, and grade removal can bring a subject
+# and number together ("STA B 035A") so code joining stays after it.
+_DROP_NOTES = re.compile(r'(?i:\(can be concurrent\))|\{.*?\}')
+_GRADE_OR_BETTER = r'\b(?:C-|B|A|D|F)\s*or\s*better\b'
+_DROP_GRADES = re.compile(
+    # "C-" is the one grade whose removal changes its neighbours: before
+    # another "<grade> or better" it loses its trailing word boundary
+    # once that phrase is gone, and removing it from "or C-better"
+    # leaves an "or better" for the last pass to strip
+    _GRADE_OR_BETTER
+    + r'|\bC-\b(?!' + _GRADE_OR_BETTER[2:] + r')|\b(?:B|A|D|F)\b'
+    + r'|\bor (?:C-)*better\b',
+    re.IGNORECASE
+)
+_COURSE_CODE = re.compile(r'\b([A-Z]{2,4})\s+(\d{3}[A-Z]{0,2})\b')
+_TOKEN = re.compile(r'[(),;]|\.|[^\s(),;.]+')
+
+def tokenize_fast(expr):
+    expr = _DROP_NOTES.sub('', expr)
+    expr = _DROP_GRADES.sub('', expr)
+    expr = _COURSE_CODE.sub(r'\1_\2', expr)
+    return [t.replace('_', ' ') for t in _TOKEN.findall(expr) if t != '.']
+
 # --- Parser ---
 def parse_expr(tokens, index=0):
     elements = []
@@ -104,6 +140,128 @@ def parse(tokens):
 
     return 0, {'and': parsed_groups} if len(parsed_groups) > 1 else parsed_groups[0]
 
+# --- Iterative parser ---
+# Single pass over the tokens with an explicit stack of open
+# parentheses instead of recursion and a separate ';' split. With
+# strict=False it builds exactly what parse() builds, quirks included
+# (text after a stray ')' is ignored up to the next top-level ';').
+# With strict=True malformed text raises PrereqSyntaxError pointing at
+# the offending token instead.
+class PrereqSyntaxError(ValueError):
+    def __init__(self, message, position, tokens):
+        self.position = position
+        self.token = tokens[position] if position < len(tokens) else None
+        near = ' '.join(tokens[max(0, position - 3):position + 4])
+        super().__init__(f"{message} at token {position} (near '{near}')")
+
+def _close_frame(frame):
+    current, current_op, groups = frame
+    if current:
+        if current_op == 'or' and len(current) > 1:
+            groups.append({'or': current})
+        elif current_op == 'and' and len(current) > 1:
+            groups.append({'and': current})
+        else:
+            groups.extend(current)
+    return groups[0] if len(groups) == 1 else {'and': groups}
+
+def parse_iterative(tokens, strict=False):
+    if not tokens:
+        return 0, {}
+
+    parsed_groups = []
+    stack = [[[], None, []]]    # frames of [current, current_op, groups]
+    opened = []                 # token positions of the open '('
+    depth = 0                   # same running count parse() keeps
+    group_result = None         # set once a stray ')' ends the group early
+    in_group = False
+    expect_operand = True       # strict: an operator needs something on both sides
+
+    for pos, token in enumerate(tokens):
+        is_op = token.lower() == 'or' or token in (',', ';')
+
+        # empty ';'-separated groups are skipped by parse(), so allow them
+        if strict and expect_operand and (is_op or token == ')') \
+                and not (token == ';' and depth == 0 and not in_group):
+            raise PrereqSyntaxError(f"unexpected '{token}'", pos, tokens)
+
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+
+        if token == ';' and depth == 0:
+            if in_group:
+                if group_result is None:
+                    group_result = _close_frame(stack[0])
+                parsed_groups.append(group_result)
+            stack = [[[], None, []]]
+            opened = []
+            group_result = None
+            in_group = False
+            expect_operand = True
+            continue
+
+        in_group = True
+        if group_result is not None:
+            continue            # parse_expr already stopped at a stray ')'
+
+        frame = stack[-1]
+        if token == '(':
+            stack.append([[], None, []])
+            opened.append(pos)
+            expect_operand = True
+        elif token == ')':
+            if len(stack) == 1:
+                if strict:
+                    raise PrereqSyntaxError("unmatched ')'", pos, tokens)
+                group_result = _close_frame(frame)
+            else:
+                stack.pop()
+                opened.pop()
+                stack[-1][0].append(_close_frame(frame))
+                expect_operand = False
+        elif token.lower() == 'or':
+            frame[1] = 'or'
+            expect_operand = True
+        elif token == ';':
+            if frame[0]:
+                if frame[1] == 'or' and len(frame[0]) > 1:
+                    frame[2].append({'or': frame[0]})
+                else:
+                    frame[2].append(frame[0][0])
+                frame[0] = []
+            frame[1] = None
+            expect_operand = True
+        elif token == ',':
+            if frame[1] == 'or' and len(frame[0]) > 1:
+                frame[2].append({'or': frame[0]})
+                frame[0] = []
+            frame[1] = 'and'
+            expect_operand = True
+        else:
+            frame[0].append(token)
+            expect_operand = False
+
+    if strict:
+        if opened:
+            raise PrereqSyntaxError("unclosed '('", opened[-1], tokens)
+        if in_group and expect_operand:
+            raise PrereqSyntaxError("expression ends with an operator", len(tokens) - 1, tokens)
+
+    if in_group:
+        if group_result is None:
+            while len(stack) > 1:
+                sub = _close_frame(stack.pop())
+                stack[-1][0].append(sub)
+            group_result = _close_frame(stack[0])
+        parsed_groups.append(group_result)
+
+    if not parsed_groups:
+        return 0, {}
+
+    return 0, {'and': parsed_groups} if len(parsed_groups) > 1 else parsed_groups[0]
+
 # --- Label Generator ---
 def part_label_gen():
     counter = count(1)
@@ -143,7 +301,13 @@ def build_json(tree, label_gen):
         }
 
 # --- Integration method ---
-def parse_prereq_json(course_codes, prereq_texts):
+@inst.timed()
+def parse_prereq_json(course_codes, prereq_texts, parser=parse, cache=None):
+    if cache is not None:
+        return parse_prereq_json_bulk(
+            course_codes, prereq_texts, max_workers=1, parser=parser, cache=cache
+        )
+
     all_output = {}
     for course_code, expr in zip(course_codes, prereq_texts):
         tokens = tokenize(expr)
@@ -154,23 +318,106 @@ def parse_prereq_json(course_codes, prereq_texts):
                 "note": "No prerequisites"
             }
             continue
-        _, parsed = parse(tokens)
+        _, parsed = parser(tokens)
         label_gen = part_label_gen()
         json_data = build_json(parsed, label_gen)
         all_output[course_code] = json_data
     return all_output
 
+# --- Bulk integration ---
+# Same output as parse_prereq_json (json.dump gives identical bytes).
+# Each distinct prerequisite string is tokenized and parsed once and
+# kept as a JSON string, which is cheap to send back from a worker and
+# gives every course its own copy through json.loads. Batches with
+# many distinct strings are spread over a process pool.
+BULK_POOL_MIN = 2000
+
+def _parse_one_json(expr, parser=parse):
+    tokens = tokenize_fast(expr)
+    if not tokens:
+        json_data = {
+            "label": "Part 1",
+            "type": "none",
+            "note": "No prerequisites"
+        }
+    else:
+        _, parsed = parser(tokens)
+        json_data = build_json(parsed, part_label_gen())
+    return json.dumps(json_data)
+
+def _parse_chunk(texts, parser=parse):
+    return [_parse_one_json(t, parser) for t in texts]
+
+def parse_prereq_json_bulk(course_codes, prereq_texts, max_workers=None,
+                           chunk_size=500, stats=None, parser=parse, cache=None):
+    start = time.perf_counter()
+    pairs = list(zip(course_codes, prereq_texts))
+    unique = list(dict.fromkeys(expr for _, expr in pairs))
+
+    # cache: anything with get_many(texts, parser) -> {text: json string}
+    # and put_many({text: json string}, parser), e.g. prereq_cache.PrereqCache
+    by_text = cache.get_many(unique, parser) if cache is not None else {}
+    todo = [expr for expr in unique if expr not in by_text]
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers > 1 and len(todo) >= BULK_POOL_MIN:
+        chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_parse_chunk, chunks, repeat(parser))
+            encoded = [j for chunk in results for j in chunk]
+    else:
+        encoded = _parse_chunk(todo, parser)
+
+    fresh = dict(zip(todo, encoded))
+    if cache is not None and fresh:
+        cache.put_many(fresh, parser)
+    by_text.update(fresh)
+
+    all_output = {}
+    for course_code, expr in pairs:
+        all_output[course_code] = json.loads(by_text[expr])
+
+    if stats is not None:
+        elapsed = time.perf_counter() - start
+        stats.update({
+            "courses": len(pairs),
+            "unique_texts": len(unique),
+            "parsed_texts": len(todo),
+            "seconds": elapsed,
+            "courses_per_sec": len(pairs) / elapsed if elapsed else float("inf")
+        })
+    return all_output
+
+# --- Parser diff ---
+# Runs both parsers over the same texts and returns
+# (text, parse tree, parse_iterative tree) for every disagreement.
+def diff_parsers(prereq_texts, strict=False):
+    diffs = []
+    for expr in dict.fromkeys(prereq_texts):
+        tokens = tokenize_fast(expr)
+        _, old = parse(tokens)
+        try:
+            _, new = parse_iterative(tokens, strict=strict)
+        except PrereqSyntaxError as e:
+            new = e
+        if old != new:
+            diffs.append((expr, old, new))
+    return diffs
+
 # --- Example to test ---
 def main():
     course_codes = ["ECS 017"]
     prereq_texts = [""]
 
-    output = parse_prereq_json(course_codes, prereq_texts)
+    stats = {}
+    output = parse_prereq_json_bulk(course_codes, prereq_texts, stats=stats)
 
     with open("parsed_prereqs.json", "w") as f:
         json.dump(output, f, indent=2)
 
     print("\u2705 Prerequisite structure saved to parsed_prereqs.json")
+    print(f"Parsed {stats['courses']} courses ({stats['unique_texts']} unique) "
+          f"at {stats['courses_per_sec']:.0f} courses/sec")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,117 @@
+import hashlib
+import sqlite3
+import time
+
+from prereq_alg import PARSER_VERSION, parse
+
+
+# ───────────────────────── Keys ─────────────────────────
+
+def normalize_text(text: str) -> str:
+    # only changes that can never change the parse: tokenize() is
+    # whitespace-sensitive inside the text ("or  better"), not at the ends
+    return text.strip()
+
+
+def cache_key(text: str, parser=parse) -> str:
+    raw = f"{PARSER_VERSION}\0{parser.__name__}\0{normalize_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ───────────────────────── SQLite Cache ─────────────────────────
+# Maps hash(parser version + parser + normalized text) to the
+# build_json() output for that text, stored as a JSON string.
+# Least recently used entries are evicted past max_entries.
+
+class PrereqCache:
+    BATCH = 500   # keep IN (...) lists under SQLite's variable limit
+
+    def __init__(self, path: str, max_entries: int = 200_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS prereq_cache ("
+            " key TEXT PRIMARY KEY,"
+            " json TEXT NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS prereq_cache_lru ON prereq_cache(last_used)"
+        )
+        self.conn.commit()
+
+    def get_many(self, texts, parser=parse):
+        keys = {}
+        for t in texts:
+            keys.setdefault(cache_key(t, parser), []).append(t)
+        found = {}
+        hit_keys = []
+        key_list = list(keys)
+
+        for i in range(0, len(key_list), self.BATCH):
+            batch = key_list[i:i + self.BATCH]
+            rows = self.conn.execute(
+                "SELECT key, json FROM prereq_cache WHERE key IN "
+                f"({','.join('?' * len(batch))})",
+                batch
+            ).fetchall()
+            for key, data in rows:
+                hit_keys.append(key)
+                for t in keys[key]:
+                    found[t] = data
+
+        if hit_keys:
+            now = time.time()
+            self.conn.executemany(
+                "UPDATE prereq_cache SET last_used = ? WHERE key = ?",
+                [(now, key) for key in hit_keys]
+            )
+            self.conn.commit()
+
+        self.hits += len(hit_keys)
+        self.misses += len(keys) - len(hit_keys)
+        return found
+
+    def put_many(self, encoded, parser=parse):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO prereq_cache (key, json, last_used) VALUES (?, ?, ?)",
+            [(cache_key(t, parser), data, now) for t, data in encoded.items()]
+        )
+        self._evict()
+        self.conn.commit()
+
+    def _evict(self):
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM prereq_cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM prereq_cache WHERE key IN ("
+                " SELECT key FROM prereq_cache ORDER BY last_used LIMIT ?)",
+                (excess,)
+            )
+            self.evictions += excess
+
+    def stats(self):
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM prereq_cache").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def clear(self):
+        self.conn.execute("DELETE FROM prereq_cache")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
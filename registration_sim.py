@@ -0,0 +1,227 @@
+import time
+from datetime import date
+
+import numpy as np
+
+import class_algorithmn as ca
+import fill_model as fm
+
+
+# Monte Carlo check of how likely a plan is to survive registration.
+# course_available() compares one fill day against the student's Pass 1
+# day; here each course's fill time is a distribution instead:
+#   - from the seat history, the time the fitted open-seat line hits 0
+#     (less one day, onto the scale below), spread by the fit's
+#     residuals (sd / |slope| days)
+#   - an observed zero caps it at the day it was seen
+#   - courses without history fall back to COURSE_FILL_DAYS, spread by
+#     DEFAULT_SIGMA days; courses not listed there never fill
+# Each trial also shifts every course of a semester by one shared draw
+# (TERM_SIGMA days), since a heavy term fills everything earlier.
+# A course is secured when ceil(fill time) >= its semester's Pass 1
+# day, which is course_available() again once the spread goes to 0.
+# All trials of a plan are one (courses x trials) array.
+
+TRIALS = 20_000
+MIN_SIGMA = 0.25      # days; no fill time is ever exact
+DEFAULT_SIGMA = 1.0   # days, for courses only known from COURSE_FILL_DAYS
+TERM_SIGMA = 0.5      # days, shared by every course in a semester
+
+
+# ───────────────────────── Fill-Time Model ─────────────────────────
+
+class FillDistribution:
+    # per course: mean fill time (inf = never fills) and spread, in Pass 1 days
+    def __init__(self, courses, mean, sd):
+        self.courses = list(courses)
+        self.index = {c: i for i, c in enumerate(self.courses)}
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.sd = np.asarray(sd, dtype=np.float64)
+
+    def lookup(self, courses):
+        # -> (mean, sd) arrays for the given courses; unknown courses never fill
+        rows = np.array([self.index.get(c, -1) for c in courses], dtype=np.int64)
+        known = rows >= 0
+        mean = np.full(len(rows), np.inf)
+        sd = np.zeros(len(rows))
+        mean[known] = self.mean[rows[known]]
+        sd[known] = self.sd[rows[known]]
+        return mean, sd
+
+
+def fit_distribution(names, idx, t, y, total_days=ca.PASS1_TOTAL_DAYS):
+    n_courses = len(names)
+    idx, t, y = fm.in_window(idx, t, y, total_days)
+    _, slope, intercept, resid_sd, ok = fm.fit_lines(idx, t, y, n_courses)
+
+    filling = ok & (slope < 0)
+    mean = np.full(n_courses, np.inf)
+    sd = np.zeros(n_courses)
+    # the line reaches 0 at t, inside Pass 1 day floor(t); fill times
+    # here run one day behind (fill day d <=> fill time in d - 1 .. d)
+    mean[filling] = -intercept[filling] / slope[filling] - 1
+    sd[filling] = resid_sd[filling] / -slope[filling]
+
+    # seen full on day d: fill time inside day d - 1 .. d
+    observed_day = fm.observed_fill_days(idx, t, y, n_courses, total_days)
+    observed = observed_day <= total_days
+    mean[observed] = np.minimum(mean[observed], observed_day[observed] - 0.5)
+
+    sd = np.where(np.isfinite(mean), np.maximum(sd, MIN_SIGMA), 0.0)
+
+    # only courses the history says something about; the rest are left
+    # to COURSE_FILL_DAYS
+    known = ok | observed
+    return FillDistribution([str(c) for c in names[known]], mean[known], sd[known])
+
+
+def table_distribution(fill_days=None):
+    # from a {course: fill day or None} table, COURSE_FILL_DAYS by default
+    fill_days = ca.COURSE_FILL_DAYS if fill_days is None else fill_days
+    courses = list(fill_days)
+    mean = np.array([np.inf if d is None else d - 0.5 for d in fill_days.values()])
+    sd = np.where(np.isfinite(mean), DEFAULT_SIGMA, 0.0)
+    return FillDistribution(courses, mean, sd)
+
+
+def load_distribution(db_path: str = None, pass1_start: date = None):
+    # seat history where there is some, COURSE_FILL_DAYS for the rest
+    table = table_distribution()
+    pass1_start = pass1_start or fm.PASS1_START
+    if db_path is None or pass1_start is None:
+        return table
+
+    names, idx, t, y = fm.load_history(db_path, pass1_start)
+    fitted = fit_distribution(names, idx, t, y)
+    extra = [c for c in table.courses if c not in fitted.index]
+    mean, sd = table.lookup(extra)
+    return FillDistribution(
+        fitted.courses + extra,
+        np.concatenate([fitted.mean, mean]),
+        np.concatenate([fitted.sd, sd])
+    )
+
+
+# ───────────────────────── Simulation ─────────────────────────
+
+def _plan_rows(plan):
+    # flattened (course, semester position) rows; a course listed twice
+    # in one semester is registered once
+    courses, semester_of, starts = [], [], []
+    for s, semester in enumerate(plan):
+        starts.append(len(courses))
+        for c in dict.fromkeys(semester["courses"]):
+            courses.append(c)
+            semester_of.append(s)
+    return courses, np.array(semester_of, dtype=np.int64), np.array(starts, dtype=np.int64)
+
+
+def simulate_plan(plan, model: FillDistribution, trials: int = TRIALS, rng=None, draws=None):
+    # plan: build_schedule output. -> {"trials", "p_plan", "semesters": [
+    #   {"semester", "pass1_day", "p_all", "expected_courses", "courses": {course: p}}]}
+    # draws: optional (rows, trials) float32 standard normals to use
+    # instead of fresh ones, one row per semester plus one per course
+    courses, semester_of, starts = _plan_rows(plan)
+    if not courses:
+        return {"trials": trials, "p_plan": 1.0, "semesters": []}
+
+    pass1_day = np.array([s["pass1_day"] for s in plan], dtype=np.float64)
+    mean, sd = model.lookup(courses)
+
+    # only courses that can fill are drawn; the rest are always secured.
+    # ceil(fill time) >= day  <=>  fill time > day - 1
+    filling = np.flatnonzero(np.isfinite(mean))
+    sem = semester_of[filling]
+    if draws is None:
+        rng = rng if rng is not None else np.random.default_rng()
+        draws = rng.standard_normal((len(plan) + len(filling), trials), dtype=np.float32)
+    trials = draws.shape[1]
+    term_shift = draws[:len(plan)] * TERM_SIGMA
+    fill_time = draws[len(plan):len(plan) + len(filling)] * sd[filling, None].astype(np.float32)
+    fill_time += term_shift[sem]
+    missed = fill_time <= (pass1_day[sem] - 1 - mean[filling])[:, None].astype(np.float32)
+
+    p_course = np.ones(len(courses))
+    p_course[filling] = 1.0 - missed.mean(axis=1)
+
+    # courses missed per semester and trial, as one matrix product
+    membership = np.zeros((len(plan), len(filling)), dtype=np.float32)
+    membership[sem, np.arange(len(filling))] = 1.0
+    n_missed = membership @ missed.astype(np.float32)
+    all_secured = n_missed == 0
+    n_courses = np.diff(np.append(starts, len(courses)))
+
+    semesters = []
+    for s, semester in enumerate(plan):
+        lo = starts[s]
+        hi = lo + n_courses[s]
+        semesters.append({
+            "semester": semester["semester"],
+            "pass1_day": semester["pass1_day"],
+            "p_all": float(all_secured[s].mean()),
+            "expected_courses": float(n_courses[s] - n_missed[s].mean()),
+            "courses": {c: float(p) for c, p in zip(courses[lo:hi], p_course[lo:hi])}
+        })
+
+    return {
+        "trials": trials,
+        "p_plan": float(all_secured.all(axis=0).mean()),
+        "semesters": semesters
+    }
+
+
+def plan_signature(plan):
+    return tuple((s["pass1_day"], tuple(s["courses"])) for s in plan)
+
+
+def simulate_cohort(plans, model: FillDistribution, trials: int = TRIALS, seed: int = None):
+    # plans: build_schedule / plan_cohort output per student, in order.
+    # Students with the same plan share one simulation; a RuntimeError
+    # (no feasible plan) comes back as None. Drawing the normals is most
+    # of the cost, so every plan reads the same block of them (common
+    # random numbers): each plan's rows are still independent, and plans
+    # are compared under the same simulated terms.
+    rng = np.random.default_rng(seed)
+    draws = np.empty((0, trials), dtype=np.float32)
+    results = {}
+    out = []
+    for plan in plans:
+        if isinstance(plan, Exception):
+            out.append(None)
+            continue
+        key = plan_signature(plan)
+        result = results.get(key)
+        if result is None:
+            need = len(plan) + sum(len(set(s["courses"])) for s in plan)
+            if need > len(draws):
+                extra = rng.standard_normal((need - len(draws), trials), dtype=np.float32)
+                draws = np.concatenate([draws, extra])
+            result = results[key] = simulate_plan(plan, model, draws=draws)
+        out.append(result)
+    return out
+
+
+if __name__ == "__main__":
+    from cohort_planner import plan_cohort
+
+    db = r"C:/Users/PC4/OneDrive/Desktop/reg classproject/seat_history.sqlite"
+    model = load_distribution(db)
+
+    result = simulate_plan(ca.build_schedule(start_units=32), model, rng=np.random.default_rng(0))
+    for s in result["semesters"]:
+        print(f"\nSemester {s['semester']} (Pass 1 day {s['pass1_day']}): "
+              f"{s['p_all']:.1%} all secured, {s['expected_courses']:.2f} courses expected")
+        for course, p in s["courses"].items():
+            print(f"   - {course}: {p:.1%}")
+    print(f"\n✅ Whole plan survives registration in {result['p_plan']:.1%} of {result['trials']} trials")
+
+    profiles = [(units, ()) for units in range(0, 140, 4)] * 50
+    plans = [None] * len(profiles)
+    for i, plan in plan_cohort(profiles):
+        plans[i] = plan
+
+    t0 = time.perf_counter()
+    results = simulate_cohort(plans, model, seed=0)
+    elapsed = time.perf_counter() - t0
+    at_risk = sum(r is not None and r["p_plan"] < 0.5 for r in results)
+    print(f"✅ Simulated {len(plans)} students in {elapsed:.2f}s ({at_risk} plans under 50%)")
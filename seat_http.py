@@ -0,0 +1,400 @@
+import os
+import time
+import threading
+import http.client
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, urljoin, urlencode, parse_qs
+
+import instrumentation as inst
+
+
+# Browserless backend for data_collect_webscrap.scrape_subject: posts
+# the same search form over plain HTTP and reads table#mc_win from the
+# returned HTML. Rows come back in the same 7-column layout.
+
+SEARCH_URL = "https://registrar-apps.ucdavis.edu/courses/search/index.cfm"
+TERM_CODE = "202603"
+
+
+# ───────────────────────── Keep-Alive Session ─────────────────────────
+
+class HttpSession:
+    # One persistent connection per (thread, host), reused across
+    # subjects; a dropped keep-alive connection is reopened once.
+
+    def __init__(self, timeout: float = 20):
+        self.timeout = timeout
+        self.local = threading.local()
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (reg-classproject seat tracker)",
+            "Connection": "keep-alive",
+        }
+
+    def _connection(self, scheme, netloc):
+        conns = self.local.__dict__.setdefault("conns", {})
+        conn = conns.get((scheme, netloc))
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = conns[(scheme, netloc)] = cls(netloc, timeout=self.timeout)
+        return conn
+
+    def request(self, method: str, url: str, form=None) -> str:
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        body = None
+        headers = dict(self.headers)
+        if form is not None:
+            body = urlencode(form).encode()   # bytes go out with the headers in one send
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+                break
+            except (http.client.HTTPException, ConnectionError, OSError):
+                conn.close()
+                self.local.conns.pop((parts.scheme, parts.netloc), None)
+                if attempt:
+                    raise
+
+        if resp.status >= 400:
+            raise RuntimeError(f"{method} {url} returned HTTP {resp.status}")
+        charset = resp.headers.get_content_charset() or "utf-8"
+        return data.decode(charset, errors="replace")
+
+    def close(self):
+        for conn in self.local.__dict__.get("conns", {}).values():
+            conn.close()
+        self.local.conns = {}
+
+
+# ───────────────────────── HTML Parsing ─────────────────────────
+
+VOID_TAGS = {"br", "img", "input", "meta", "link", "hr", "col", "area", "base", "wbr"}
+BLOCK_TAGS = {"p", "div", "tr", "table", "li", "ul", "ol", "h1", "h2", "h3", "h4"}
+
+
+class Node:
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = dict(attrs)
+        self.children = []
+        self.parent = parent
+
+    def iter(self, tag=None):
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Node):
+                if tag is None or node.tag == tag:
+                    yield node
+                stack.extend(reversed(node.children))
+
+    def find(self, tag):
+        return next(self.iter(tag), None)
+
+    def cells(self):
+        return [c for c in self.children if isinstance(c, Node) and c.tag == "td"]
+
+    def text(self):
+        # roughly what WebDriver's .text gives: <br> and block
+        # elements break lines, runs of whitespace collapse
+        out = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                out.append(node)
+            elif node.tag == "br":
+                out.append("\n")
+            else:
+                if node.tag in BLOCK_TAGS:
+                    out.append("\n")
+                stack.extend(reversed(node.children))
+        lines = (" ".join(line.split()) for line in "".join(out).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("document", (), None)
+        self.cur = self.root
+
+    def handle_starttag(self, tag, attrs):
+        # an unclosed <td>/<tr> is closed by the next sibling
+        if tag in ("td", "th"):
+            self._close_open(("td", "th"), stop=("tr", "table"))
+        elif tag == "tr":
+            self._close_open(("tr",), stop=("table",))
+        node = Node(tag, attrs, self.cur)
+        self.cur.children.append(node)
+        if tag not in VOID_TAGS:
+            self.cur = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.cur.children.append(Node(tag, attrs, self.cur))
+
+    def handle_endtag(self, tag):
+        node = self.cur
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.cur = node.parent
+
+    def handle_data(self, data):
+        self.cur.children.append(data)
+
+    def _close_open(self, tags, stop):
+        node = self.cur
+        while node is not self.root and node.tag not in stop:
+            if node.tag in tags:
+                self.cur = node.parent
+                return
+            node = node.parent
+
+
+def parse_html(html: str) -> Node:
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def extract_rows(html: str, subject_code: str):
+    # same fields and fallbacks as the Selenium loop in scrape_subject
+    doc = parse_html(html)
+    data = []
+
+    for row in doc.iter("tr"):
+        if "bgcolor" not in row.attrs:
+            continue
+        tds = row.cells()
+        if len(tds) < 5:
+            continue
+
+        strong = tds[0].find("strong")
+        crn = strong.text().strip() if strong else ""
+        if not crn.isdigit():
+            continue
+
+        em = tds[0].find("em")
+        time_days = (em and em.text()) or "N/A"
+
+        course = tds[1].text().split("\n")[0]
+        section = tds[2].text().split("\n")[0]
+
+        em = tds[2].find("em")
+        open_wait = (em and em.text()) or "N/A"
+
+        instructor = tds[4].text().split("\n")[0] or "TBA"
+
+        data.append([
+            subject_code,
+            crn,
+            time_days,
+            course,
+            section,
+            open_wait,
+            instructor
+        ])
+
+    return data
+
+
+class _FormFinder(HTMLParser):
+    # picks up the action/method of the form holding the termCode select
+    def __init__(self):
+        super().__init__()
+        self.forms = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self.forms.append({"action": attrs.get("action", ""),
+                               "method": (attrs.get("method") or "get").upper(),
+                               "fields": set()})
+        elif tag in ("select", "input", "button") and self.forms and attrs.get("name"):
+            self.forms[-1]["fields"].add(attrs["name"])
+
+
+class _SelectOptions(HTMLParser):
+    # option values of every named <select>, in page order
+    def __init__(self):
+        super().__init__()
+        self.options = {}
+        self.current = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "select":
+            self.current = self.options.setdefault(attrs.get("name"), [])
+        elif tag == "option" and self.current is not None:
+            self.current.append((attrs.get("value") or "").strip())
+
+    def handle_endtag(self, tag):
+        if tag == "select":
+            self.current = None
+
+
+def form_options(html: str, field: str):
+    # non-blank option values of the <select name=field>; the blank
+    # "any" entry is dropped
+    finder = _SelectOptions()
+    finder.feed(html)
+    return [v for v in finder.options.get(field, []) if v]
+
+
+# ───────────────────────── Scraping Logic ─────────────────────────
+
+_form_cache = {}
+_form_lock = threading.Lock()
+
+
+def search_form(session: HttpSession, search_url: str):
+    with _form_lock:
+        if search_url in _form_cache:
+            return _form_cache[search_url]
+
+    finder = _FormFinder()
+    finder.feed(session.request("GET", search_url))
+    form = next((f for f in finder.forms if "termCode" in f["fields"]), None)
+    if form is None:
+        raise RuntimeError(f"No termCode search form found at {search_url}")
+
+    found = (urljoin(search_url, form["action"]), form["method"])
+    with _form_lock:
+        _form_cache[search_url] = found
+    return found
+
+
+def search_options(session: HttpSession, field: str, search_url: str = SEARCH_URL):
+    # e.g. search_options(session, "subject") -> every subject code
+    return form_options(session.request("GET", search_url), field)
+
+
+def fetch_subject_html(subject_code: str, session: HttpSession,
+                       search_url: str = SEARCH_URL, term_code: str = TERM_CODE,
+                       extra=None) -> str:
+    # extra: further search fields, e.g. one shard of a large subject
+    action, method = search_form(session, search_url)
+    form = {"termCode": term_code, "subject": subject_code, **(extra or {}), "search": "Search"}
+    inst.count("pages_loaded")
+    if method == "POST":
+        return session.request("POST", action, form=form)
+    return session.request("GET", action + ("&" if "?" in action else "?") + urlencode(form))
+
+
+@inst.timed()
+def scrape_subject_http(subject_code: str, session: HttpSession = None,
+                        search_url: str = SEARCH_URL, term_code: str = TERM_CODE,
+                        extra=None):
+    own = session is None
+    session = session or HttpSession()
+    try:
+        html = fetch_subject_html(subject_code, session, search_url, term_code, extra)
+        return extract_rows(html, subject_code)
+    finally:
+        if own:
+            session.close()
+
+
+# ───────────────────────── Recording / Stand-In Server ─────────────────────────
+# record_pages() saves the live search page and one result page per
+# subject; start_recorded_server() serves them back so the backend
+# can be exercised without touching the registrar.
+
+def record_pages(subjects, out_dir: str, search_url: str = SEARCH_URL,
+                 term_code: str = TERM_CODE):
+    os.makedirs(out_dir, exist_ok=True)
+    session = HttpSession()
+    try:
+        with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+            f.write(session.request("GET", search_url))
+        for subject in subjects:
+            html = fetch_subject_html(subject, session, search_url, term_code)
+            with open(os.path.join(out_dir, f"{subject}.html"), "w", encoding="utf-8") as f:
+                f.write(html)
+    finally:
+        session.close()
+
+
+def start_recorded_server(pages_dir: str, port: int = 0):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive, like the real server
+        disable_nagle_algorithm = True
+
+        def _send(self, name):
+            path = os.path.join(pages_dir, name)
+            if not os.path.exists(path):
+                self.send_error(404)
+                return
+            with open(path, "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _form(self):
+            query = parse_qs(urlsplit(self.path).query)
+            if self.command == "POST":
+                length = int(self.headers.get("Content-Length", 0))
+                query.update(parse_qs(self.rfile.read(length).decode()))
+            return query
+
+        def do_GET(self):
+            subject = self._form().get("subject")
+            self._send(f"{subject[0]}.html" if subject else "index.html")
+
+        def do_POST(self):
+            subject = self._form().get("subject", [""])[0]
+            self._send(f"{subject}.html")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/courses/search/index.cfm"
+
+
+# ───────────────────────── Backend Comparison ─────────────────────────
+
+def compare_backends(subjects, driver_path: str):
+    from data_collect_webscrap import scrape_subject
+
+    session = HttpSession()
+    report = []
+    try:
+        for subject in subjects:
+            t0 = time.perf_counter()
+            selenium_rows = scrape_subject(subject, driver_path)
+            t1 = time.perf_counter()
+            http_rows = scrape_subject_http(subject, session)
+            t2 = time.perf_counter()
+
+            report.append({
+                "subject": subject,
+                "selenium_s": t1 - t0,
+                "http_s": t2 - t1,
+                "rows": len(http_rows),
+                "match": selenium_rows == http_rows
+            })
+            print(f"{subject}: selenium {t1 - t0:.2f}s, http {t2 - t1:.2f}s, "
+                  f"{len(http_rows)} rows, "
+                  f"{'same rows' if selenium_rows == http_rows else 'ROWS DIFFER'}")
+    finally:
+        session.close()
+    return report
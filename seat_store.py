@@ -0,0 +1,183 @@
+import os
+import re
+import csv
+import sqlite3
+from datetime import date, datetime
+
+
+# Append-only history of seat counts: one row per section per poll.
+# "First Seen" / "Total Open" / "Days to Zero" are derived from it, and
+# course_open_tracker.csv is now just an export of those queries.
+
+_SEAT_FIELD = re.compile(r"(Open|Reserved|Waitlist)\s*:\s*(\d+)", re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    ts       TEXT NOT NULL,
+    day      TEXT NOT NULL,
+    subject  TEXT NOT NULL,
+    course   TEXT NOT NULL,
+    crn      TEXT NOT NULL,
+    open     INTEGER NOT NULL,
+    reserved INTEGER NOT NULL,
+    waitlist INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_course_ts ON snapshots(course, ts);
+CREATE INDEX IF NOT EXISTS snapshots_day ON snapshots(day);
+
+-- First Seen / Days to Zero / Total Open carried over from the old CSV
+-- tracker, which only kept the latest value per course; courses not
+-- polled since are exported from here
+CREATE TABLE IF NOT EXISTS course_seed (
+    course       TEXT PRIMARY KEY,
+    first_seen   TEXT NOT NULL,
+    days_to_zero INTEGER,
+    total_open   INTEGER
+);
+"""
+
+
+def parse_seat_counts(text: str):
+    # "Open: 5 / Reserved: 0 / Waitlist: 2" -> (5, 0, 2); missing parts are 0
+    counts = {"open": 0, "reserved": 0, "waitlist": 0}
+    for name, value in _SEAT_FIELD.findall(text or ""):
+        counts[name.lower()] = int(value)
+    return counts["open"], counts["reserved"], counts["waitlist"]
+
+
+class SeatStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # stores seeded before total_open was kept
+        columns = [r[1] for r in self.conn.execute("PRAGMA table_info(course_seed)")]
+        if "total_open" not in columns:
+            self.conn.execute("ALTER TABLE course_seed ADD COLUMN total_open INTEGER")
+        self.conn.commit()
+
+    # ---------- writes ----------
+
+    def record_snapshot(self, rows, when: datetime = None):
+        # rows in scraper layout: [subject, crn, time_days, course,
+        # section, open_wait, instructor]
+        self.record_counts(
+            [(row[0], row[3], row[1], *parse_seat_counts(row[5])) for row in rows],
+            when
+        )
+
+    def record_counts(self, counts, when: datetime = None):
+        # counts already parsed: [(subject, course, crn, open, reserved, waitlist)]
+        when = when or datetime.now()
+        ts = when.isoformat(timespec="microseconds")
+        day = when.date().isoformat()
+        self.conn.executemany(
+            "INSERT INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(ts, day, *c) for c in counts]
+        )
+        self.conn.commit()
+
+    def import_tracker_csv(self, tracker_file: str):
+        # one-off: seeds are only read when the store has none yet
+        (seeded,) = self.conn.execute("SELECT COUNT(*) FROM course_seed").fetchone()
+        if seeded or not os.path.exists(tracker_file):
+            return 0
+        with open(tracker_file, newline="", encoding="utf-8") as f:
+            seeds = [
+                (r["Course"], r["First Seen"],
+                 int(r["Days to Zero"]) if r["Days to Zero"] != "" else None,
+                 int(r["Total Open"]) if r["Total Open"] != "" else None)
+                for r in csv.DictReader(f)
+            ]
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO course_seed (course, first_seen, days_to_zero, total_open) "
+            "VALUES (?, ?, ?, ?)", seeds
+        )
+        self.conn.commit()
+        return len(seeds)
+
+    # ---------- derived queries ----------
+
+    def course_history(self, course: str):
+        # [(ts, total open, total reserved, total waitlist)] oldest first
+        return self.conn.execute(
+            "SELECT ts, SUM(open), SUM(reserved), SUM(waitlist) FROM snapshots "
+            "WHERE course = ? GROUP BY ts ORDER BY ts",
+            (course,)
+        ).fetchall()
+
+    def day_snapshots(self, day: str):
+        return self.conn.execute(
+            "SELECT ts, subject, course, crn, open, reserved, waitlist "
+            "FROM snapshots WHERE day = ? ORDER BY ts, course, crn",
+            (day,)
+        ).fetchall()
+
+    def tracker_rows(self):
+        # same columns as the old course_open_tracker.csv; every polled
+        # course plus seeded courses the store has not polled yet
+        query = """
+        WITH totals AS (
+            SELECT course, ts, day, SUM(open) AS total_open
+            FROM snapshots GROUP BY course, ts
+        ),
+        latest AS (
+            SELECT course, total_open FROM (
+                SELECT course, total_open,
+                       ROW_NUMBER() OVER (PARTITION BY course ORDER BY ts DESC) AS rn
+                FROM totals
+            ) WHERE rn = 1
+        ),
+        seen AS (
+            SELECT course, MIN(day) AS first_seen FROM totals GROUP BY course
+        ),
+        zero AS (
+            SELECT course, MIN(day) AS zero_day FROM totals
+            WHERE total_open = 0 GROUP BY course
+        ),
+        courses AS (
+            SELECT course FROM seen UNION SELECT course FROM course_seed
+        )
+        SELECT k.course,
+               CASE WHEN s.first_seen IS NULL THEN c.first_seen
+                    WHEN c.first_seen IS NULL THEN s.first_seen
+                    ELSE MIN(s.first_seen, c.first_seen) END,
+               COALESCE(l.total_open, c.total_open),
+               c.days_to_zero,
+               z.zero_day
+        FROM courses k
+        LEFT JOIN latest l ON l.course = k.course
+        LEFT JOIN seen s ON s.course = k.course
+        LEFT JOIN zero z ON z.course = k.course
+        LEFT JOIN course_seed c ON c.course = k.course
+        ORDER BY k.course
+        """
+        out = []
+        for course, first_seen, total_open, seeded_zero, zero_day in self.conn.execute(query):
+            if seeded_zero is not None:
+                days_to_zero = seeded_zero
+            elif zero_day is not None:
+                days_to_zero = (date.fromisoformat(zero_day) - date.fromisoformat(first_seen)).days
+            else:
+                days_to_zero = ""
+            out.append({
+                "Course": course,
+                "First Seen": first_seen,
+                "Total Open": total_open if total_open is not None else "",
+                "Days to Zero": days_to_zero
+            })
+        return out
+
+    def export_tracker_csv(self, tracker_file: str):
+        with open(tracker_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(
+                f,
+                fieldnames=["Course", "First Seen", "Total Open", "Days to Zero"]
+            )
+            writer.writeheader()
+            writer.writerows(self.tracker_rows())
+
+    def close(self):
+        self.conn.close()
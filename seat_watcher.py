@@ -0,0 +1,252 @@
+import re
+import time
+import random
+import asyncio
+from collections import deque
+from datetime import datetime
+
+import class_algorithmn as ca
+from class_algorithmn import PASS1_TOTAL_DAYS
+from seat_http import HttpSession, scrape_subject_http
+from seat_store import SeatStore, parse_seat_counts
+
+
+# Long-running watcher for the registration window. Pages are fetched
+# per subject (that is what the search form returns), but every watched
+# course keeps its own polling interval, derived from how fast its open
+# seats have been moving; a subject is polled as often as its hottest
+# course needs. All fetches share one rate limiter and concurrency cap.
+
+MIN_INTERVAL = 15            # seconds between polls, hottest courses
+MAX_INTERVAL = 15 * 60       # coldest courses
+HOT_INTERVAL = 60            # start for courses known to fill in Pass 1
+DEFAULT_INTERVAL = 5 * 60    # start for everything else
+VELOCITY_WINDOW = 30 * 60    # seconds of history behind the seat velocity
+SEATS_PER_POLL = 1.0         # aim to see about one seat change per poll
+
+REQUESTS_PER_SECOND = 1.0
+MAX_CONCURRENT = 3
+BACKOFF_BASE = 10
+BACKOFF_MAX = 10 * 60
+
+_COURSE_CODE = re.compile(r"^[A-Z]{2,4} \d")
+
+
+def backoff_delay(failures: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_MAX) -> float:
+    # exponential, capped, with +-50% jitter so failed subjects spread out
+    delay = min(cap, base * 2 ** (failures - 1))
+    return delay * random.uniform(0.5, 1.5)
+
+
+# ───────────────────────── Rate Limiting ─────────────────────────
+
+class RateLimiter:
+    # token bucket shared by every subject task
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# ───────────────────────── Per-Course State ─────────────────────────
+
+class CourseWatch:
+    def __init__(self, course: str, interval: float):
+        self.course = course
+        self.subject = course.split()[0]
+        self.interval = interval
+        self.sections = None        # crn -> open seats, None before the first poll
+        self.history = deque()      # (monotonic time, total open)
+
+    def observe(self, now: float, total_open: int):
+        self.history.append((now, total_open))
+        # keep one point older than the window as the starting anchor
+        while len(self.history) > 2 and self.history[1][0] < now - VELOCITY_WINDOW:
+            self.history.popleft()
+
+    def velocity(self):
+        # seats moved per second (either direction) over the window
+        if len(self.history) < 2:
+            return None
+        span = self.history[-1][0] - self.history[0][0]
+        if span <= 0:
+            return None
+        points = list(self.history)
+        moved = sum(abs(b[1] - a[1]) for a, b in zip(points, points[1:]))
+        return moved / span
+
+    def adapt(self):
+        v = self.velocity()
+        if v is None:
+            return
+        if v == 0:
+            # nothing moving: back off gradually instead of jumping to the cap
+            self.interval = min(MAX_INTERVAL, self.interval * 1.5)
+        else:
+            self.interval = max(MIN_INTERVAL, min(MAX_INTERVAL, SEATS_PER_POLL / v))
+
+
+# ───────────────────────── Watcher ─────────────────────────
+
+class SeatWatcher:
+    def __init__(self, courses, scrape=None, store: SeatStore = None, on_event=None,
+                 rate: float = REQUESTS_PER_SECOND, max_concurrent: int = MAX_CONCURRENT):
+        self.watches = {}
+        self.by_subject = {}
+        for course in courses:
+            hot = ca.COURSE_FILL_DAYS.get(course) is not None
+            watch = CourseWatch(course, HOT_INTERVAL if hot else DEFAULT_INTERVAL)
+            self.watches[course] = watch
+            self.by_subject.setdefault(watch.subject, []).append(watch)
+
+        self.scrape = scrape or scrape_subject_http
+        self.store = store
+        self.on_event = on_event or print_event
+        self.rate = rate
+        self.max_concurrent = max_concurrent
+        self.stats = {"polls": 0, "failures": 0, "events": 0}
+        self._stopping = None
+
+    async def _fetch(self, subject):
+        async with self._slots:
+            await self._limiter.acquire()
+            return await asyncio.to_thread(self.scrape, subject)
+
+    def _apply(self, subject, rows):
+        now = time.monotonic()
+        when = datetime.now()
+        parsed = [(row, parse_seat_counts(row[5])) for row in rows]
+
+        if self.store is not None:
+            self.store.record_counts(
+                [(row[0], row[3], row[1], *counts) for row, counts in parsed], when
+            )
+
+        sections = {}
+        for row, counts in parsed:
+            if row[3] in self.watches:
+                sections.setdefault(row[3], {})[row[1]] = counts[0]
+
+        for watch in self.by_subject[subject]:
+            current = sections.get(watch.course, {})
+            if watch.sections is not None:
+                for crn in sorted(watch.sections.keys() | current.keys()):
+                    before = watch.sections.get(crn, 0)
+                    after = current.get(crn, 0)
+                    if before != after:
+                        self._emit({
+                            "ts": when.isoformat(timespec="seconds"),
+                            "kind": "opened" if after > before else "closed",
+                            "course": watch.course,
+                            "crn": crn,
+                            "before": before,
+                            "after": after
+                        })
+            watch.sections = current
+            watch.observe(now, sum(current.values()))
+            watch.adapt()
+
+    def _emit(self, event):
+        self.stats["events"] += 1
+        self.on_event(event)
+
+    async def _sleep(self, delay):
+        try:
+            await asyncio.wait_for(self._stopping.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _watch_subject(self, subject):
+        failures = 0
+        while not self._stopping.is_set():
+            try:
+                rows = await self._fetch(subject)
+                if not rows:
+                    # an empty page is a hiccup, not every section closing
+                    raise RuntimeError("no rows returned")
+            except Exception as e:
+                failures += 1
+                self.stats["failures"] += 1
+                delay = backoff_delay(failures)
+                print(f"⚠️ {subject} poll failed ({e}); retrying in {delay:.0f}s")
+            else:
+                failures = 0
+                self.stats["polls"] += 1
+                self._apply(subject, rows)
+                delay = min(w.interval for w in self.by_subject[subject])
+            await self._sleep(delay)
+
+    async def run(self, duration: float = None):
+        self._stopping = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._limiter = RateLimiter(self.rate)
+
+        tasks = [asyncio.create_task(self._watch_subject(s)) for s in self.by_subject]
+        try:
+            await asyncio.wait_for(self._stopping.wait(), duration)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._stopping.set()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self):
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def intervals(self):
+        return {course: w.interval for course, w in self.watches.items()}
+
+
+def print_event(event):
+    icon = "🟢" if event["kind"] == "opened" else "🔴"
+    print(f"{icon} {event['ts']} {event['course']} CRN {event['crn']}: "
+          f"{event['before']} → {event['after']} open")
+
+
+# ───────────────────────── Main ─────────────────────────
+
+def main(courses=None, duration: float = PASS1_TOTAL_DAYS * 24 * 3600):
+    # defaults to every real course code in COURSE_FILL_DAYS, for the
+    # length of Pass 1
+    courses = courses or [c for c in ca.COURSE_FILL_DAYS if _COURSE_CODE.match(c)]
+
+    save_dir = r"C:/Users/PC4/OneDrive/Desktop/reg classproject"
+    session = HttpSession()
+    store = SeatStore(save_dir + "/seat_history.sqlite")
+    watcher = SeatWatcher(
+        courses,
+        scrape=lambda subject: scrape_subject_http(subject, session),
+        store=store
+    )
+
+    print(f"👀 Watching {len(courses)} courses in {len(watcher.by_subject)} subjects")
+    try:
+        asyncio.run(watcher.run(duration))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+        session.close()
+
+    stats = watcher.stats
+    print(f"Stopped after {stats['polls']} polls, {stats['failures']} failures, "
+          f"{stats['events']} seat changes")
+
+
+if __name__ == "__main__":
+    main()
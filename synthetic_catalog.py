@@ -0,0 +1,106 @@
+import random
+
+
+# Seeded synthetic catalogs for benchmarking: course codes in the
+# registrar's "SUB 123A" form, and prerequisite prose written the way
+# the catalog writes it -- grade notes, "(can be concurrent)",
+# {braced remarks}, nested and/or groups joined by ",", "or" and ";".
+# A course only ever requires lower-numbered codes of the same
+# generation order, so every catalog is acyclic and schedulable.
+# Common sequences ("MAT 021A or MAT 017A or ...") are generated once
+# and reused by many courses, like the real shared subtrees.
+
+SUBJECTS = [
+    "ECS", "MAT", "STA", "PHY", "CHE", "BIS", "ECN", "PSC",
+    "UWP", "ENL", "EEC", "ARE", "NPB", "MCB", "EVE", "PLS"
+]
+SUFFIXES = ["", "", "", "A", "B", "C", "L", "H", "Y", "AV"]
+
+GRADE_NOTES = [" C- or better", " C or better", " D- or better", " B or better"]
+REMARKS = [
+    " (can be concurrent)",
+    " {Pass One restricted to majors}",
+    " {or equivalent}",
+]
+
+
+def course_codes(n: int, rng: random.Random):
+    codes = []
+    seen = set()
+    while len(codes) < n:
+        code = f"{rng.choice(SUBJECTS)} {rng.randint(1, 199):03d}{rng.choice(SUFFIXES)}"
+        if code not in seen:
+            seen.add(code)
+            codes.append(code)
+    return codes
+
+
+def _course_text(code, rng):
+    text = code
+    r = rng.random()
+    if r < 0.15:
+        text += rng.choice(GRADE_NOTES)
+    elif r < 0.2:
+        text += rng.choice(REMARKS)
+    return text
+
+
+def _or_text(pool, rng):
+    k = min(len(pool), rng.choice([1, 2, 2, 3, 4]))
+    return " or ".join(_course_text(c, rng) for c in rng.sample(pool, k))
+
+
+def _group_text(pool, shared, rng, depth, max_depth):
+    # one and/or group, possibly wrapping deeper groups in parentheses
+    r = rng.random()
+    if shared and r < 0.25:
+        return rng.choice(shared)
+    if depth >= max_depth or r < 0.55:
+        return _or_text(pool, rng)
+
+    joiner = rng.choice([", ", ", ", " or "])
+    parts = [
+        "(" + _group_text(pool, shared, rng, depth + 1, max_depth) + ")"
+        if rng.random() < 0.6 else _or_text(pool, rng)
+        for _ in range(rng.randint(2, 3))
+    ]
+    return joiner.join(parts)
+
+
+def generate_catalog(n_courses: int, seed: int = 0, max_depth: int = 4,
+                     prereq_rate: float = 0.7, shared_count: int = None):
+    # -> (course codes, prerequisite texts), same order; "" means none
+    rng = random.Random(seed)
+    codes = course_codes(n_courses, rng)
+    foundation = codes[:max(4, n_courses // 20)]
+
+    shared_count = shared_count if shared_count is not None else max(8, n_courses // 50)
+    shared = [
+        _group_text(foundation, [], rng, 1, 2)
+        for _ in range(shared_count)
+    ]
+
+    texts = []
+    for i, code in enumerate(codes):
+        if i < len(foundation) or rng.random() > prereq_rate:
+            texts.append("")
+            continue
+        # prerequisites come from nearby earlier courses plus the
+        # foundation sequences, which keeps chains long
+        pool = codes[max(0, i - 200):i]
+        groups = [
+            _group_text(pool, shared, rng, 1, max_depth)
+            for _ in range(rng.choice([1, 1, 2, 2, 3]))
+        ]
+        text = "; ".join(groups) + "."
+        if rng.random() < 0.05:
+            text += " Restricted to upper division standing."
+        texts.append(text)
+
+    return codes, texts
+
+
+if __name__ == "__main__":
+    codes, texts = generate_catalog(20, seed=1)
+    for code, text in zip(codes, texts):
+        print(f"{code}: {text or '(none)'}")
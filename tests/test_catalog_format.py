@@ -0,0 +1,33 @@
+import json
+
+import class_algorithmn as ca
+from catalog_format import write_catalog, load_catalog, convert_json
+
+
+# parse_scraped stores {} for a course with no prerequisite text
+PREREQS = {
+    "STA 035B": {},
+    "STA 035C": {"type": "single", "course": "STA 035B"},
+    "STA 108": {"type": "or", "courses": ["STA 035C", "MAT 021B"]},
+    "ECS 032A": {},
+}
+
+
+def test_empty_tree_means_no_prerequisites(tmp_path):
+    path = str(tmp_path / "catalog.rgc")
+    assert write_catalog(PREREQS, path) == 5
+
+    circuit = load_catalog(path)
+    assert list(circuit.courses) == sorted(ca.collect_all_courses(PREREQS))
+    assert circuit.resolve("STA 035B", set()) == set()
+    assert circuit.resolve("STA 035C", set()) == {"STA 035B"}
+    assert circuit.tree("ECS 032A") is None
+
+    compiled = ca.compile_prerequisites(PREREQS)
+    assert ca.build_schedule(0, circuit) == ca.build_schedule(0, compiled)
+
+
+def test_convert_json_with_empty_trees(tmp_path):
+    json_file = tmp_path / "parsed_prereqs.json"
+    json_file.write_text(json.dumps(PREREQS))
+    assert convert_json(str(json_file), str(tmp_path / "catalog.rgc")) == 5
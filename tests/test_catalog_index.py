@@ -0,0 +1,28 @@
+import catalog_index as ci
+
+
+def test_index_for_prerequisites_hashes_once(monkeypatch):
+    prereqs = {
+        "B": {"type": "single", "course": "A"},
+        "C": {"type": "or", "courses": ["A", "B"]}
+    }
+    hashed = []
+    fingerprint = ci.prerequisites_fingerprint
+    monkeypatch.setattr(ci, "prerequisites_fingerprint",
+                        lambda p: hashed.append(1) or fingerprint(p))
+    monkeypatch.setattr(ci, "_last_seen", None)
+
+    index = ci.index_for_prerequisites(prereqs)
+    for _ in range(5):
+        assert ci.index_for_prerequisites(prereqs) is index
+    assert len(hashed) == 1
+
+    # a replaced tree is a new catalog
+    prereqs["C"] = {"type": "single", "course": "B"}
+    changed = ci.index_for_prerequisites(prereqs)
+    assert changed is not index
+    assert len(hashed) == 2
+    assert changed.requires("C") == ["A", "B"]
+
+    # an equal catalog loaded separately shares the index
+    assert ci.index_for_prerequisites(dict(prereqs)) is changed
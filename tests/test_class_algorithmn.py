@@ -0,0 +1,180 @@
+import random
+
+import pytest
+
+import class_algorithmn as ca
+
+
+def random_tree(rng, pool, depth=0):
+    r = rng.random()
+    if depth > 3 or r < 0.3:
+        return {"type": "single", "course": rng.choice(pool)}
+    if r < 0.5:
+        return {"type": "or", "courses": rng.sample(pool, rng.randint(1, 3))}
+    node = {
+        "type": rng.choice(["and", "or"]),
+        "parts": [random_tree(rng, pool, depth + 1) for _ in range(rng.randint(1, 3))]
+    }
+    if rng.random() < 0.3:
+        node["courses"] = rng.sample(pool, rng.randint(1, 2))
+    return node
+
+
+def random_catalog(seed, n=30):
+    # prerequisites only point at lower-numbered courses, like a real catalog
+    rng = random.Random(seed)
+    codes = [f"C{i:03d}" for i in range(n)]
+    return {
+        codes[i]: random_tree(rng, codes[:i])
+        for i in range(n // 3, n) if rng.random() < 0.7
+    }
+
+
+def baseline_schedule(prereqs, start_units, completed=()):
+    # build_schedule before the circuit, on resolve_prereq. It walked the
+    # needed set in hash order; sorted is the order the circuit uses.
+    completed = set(completed)
+    remaining = ca.collect_all_courses(prereqs) - completed
+    total_units = start_units
+    semester = 1
+    plan = []
+
+    while remaining:
+        pass1_day = ca.estimate_pass1_day(total_units)
+        available = []
+        for c in sorted(remaining):
+            if not ca.course_available(c, pass1_day):
+                continue
+            if c not in prereqs:
+                available.append(c)
+                continue
+            needed = ca.resolve_prereq(prereqs[c], completed)
+            if needed.issubset(completed):
+                available.append(c)
+            else:
+                for n in sorted(needed):
+                    if n in remaining and ca.course_available(n, pass1_day):
+                        available.append(n)
+
+        if not available:
+            raise RuntimeError(
+                f"No feasible courses (semester {semester}, Pass 1 day {pass1_day})"
+            )
+        taking = available[:ca.MAX_COURSES_PER_SEMESTER]
+        plan.append({
+            "semester": semester,
+            "units_before": total_units,
+            "pass1_day": pass1_day,
+            "courses": taking
+        })
+        completed |= set(taking)
+        remaining -= set(taking)
+        total_units += len(taking) * ca.UNITS_PER_COURSE
+        semester += 1
+
+    return plan
+
+
+def _outcome(fn, *args):
+    try:
+        return fn(*args)
+    except RuntimeError as e:
+        return str(e)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_circuit_matches_resolve_prereq(seed):
+    prereqs = random_catalog(seed)
+    circuit = ca.compile_prerequisites(prereqs)
+    rng = random.Random(seed)
+    for _ in range(25):
+        done = set(rng.sample(circuit.courses, rng.randint(0, len(circuit.courses))))
+        for course, tree in prereqs.items():
+            assert circuit.resolve(course, done) == ca.resolve_prereq(tree, done)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_build_schedule_matches_baseline(seed, monkeypatch):
+    prereqs = random_catalog(seed)
+    circuit = ca.compile_prerequisites(prereqs)
+    rng = random.Random(seed)
+    monkeypatch.setattr(ca, "COURSE_FILL_DAYS", {
+        c: rng.choice([None, 3, 6, 9, 12]) for c in rng.sample(circuit.courses, 8)
+    })
+    for start_units in (0, 48, 92, 140):
+        done = rng.sample(circuit.courses, rng.randint(0, 5))
+        assert _outcome(ca.build_schedule, start_units, circuit, done) == \
+            _outcome(baseline_schedule, prereqs, start_units, done)
+
+
+@pytest.mark.parametrize("start_units", [0, 32, 60, 100, 140])
+def test_embedded_catalog_matches_baseline(start_units):
+    assert _outcome(ca.build_schedule, start_units) == \
+        _outcome(baseline_schedule, ca.prerequisites, start_units)
+
+
+def naive_ready_schedule(prereqs, start_units, completed=(), priority=None):
+    # build_schedule_ready spelled out: each semester, every remaining
+    # course whose own prerequisites are met and that is still open, in
+    # priority order, up to the cap
+    priority = priority or (lambda course: course)
+    completed = set(completed)
+    remaining = ca.collect_all_courses(prereqs) - completed
+    total_units = start_units
+    semester = 1
+    plan = []
+
+    while remaining:
+        pass1_day = ca.estimate_pass1_day(total_units)
+        ready = [
+            c for c in remaining
+            if (c not in prereqs or ca.resolve_prereq(prereqs[c], completed) <= completed)
+            and ca.course_available(c, pass1_day)
+        ]
+        taking = sorted(ready, key=priority)[:ca.MAX_COURSES_PER_SEMESTER]
+        if not taking:
+            raise RuntimeError(
+                f"No feasible courses (semester {semester}, Pass 1 day {pass1_day})"
+            )
+        plan.append({
+            "semester": semester,
+            "units_before": total_units,
+            "pass1_day": pass1_day,
+            "courses": taking
+        })
+        completed |= set(taking)
+        remaining -= set(taking)
+        total_units += len(taking) * ca.UNITS_PER_COURSE
+        semester += 1
+
+    return plan
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_build_schedule_ready_matches_naive_loop(seed, monkeypatch):
+    from catalog_index import catalog_index
+
+    prereqs = random_catalog(seed)
+    circuit = ca.compile_prerequisites(prereqs)
+    rng = random.Random(seed)
+    monkeypatch.setattr(ca, "COURSE_FILL_DAYS", {
+        c: rng.choice([None, 3, 6, 9, 12]) for c in rng.sample(circuit.courses, 8)
+    })
+    critical = catalog_index(circuit).priority
+    for start_units in (0, 48, 92, 140):
+        done = rng.sample(circuit.courses, rng.randint(0, 5))
+        for priority in (None, critical):
+            assert _outcome(ca.build_schedule_ready, start_units, circuit, done, priority) == \
+                _outcome(naive_ready_schedule, prereqs, start_units, done, priority)
+
+
+@pytest.mark.parametrize("start_units", [0, 32, 60, 100, 140])
+def test_build_schedule_ready_on_embedded_catalog(start_units):
+    ready = _outcome(ca.build_schedule_ready, start_units)
+    assert ready == _outcome(naive_ready_schedule, ca.prerequisites, start_units)
+    greedy = _outcome(ca.build_schedule, start_units)
+    if isinstance(greedy, list) and isinstance(ready, list):
+        # same plan format as build_schedule, every course taken once
+        assert all(list(s) == list(greedy[0]) for s in ready)
+        taken = [c for s in ready for c in s["courses"]]
+        assert sorted(taken) == sorted(set(c for s in greedy for c in s["courses"]))
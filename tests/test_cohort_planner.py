@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+import class_algorithmn as ca
+from cohort_planner import plan_cohort
+from test_class_algorithmn import random_catalog
+
+
+def _outcome(fn, *args):
+    try:
+        return fn(*args)
+    except RuntimeError as e:
+        return ("RuntimeError", str(e))
+
+
+@pytest.mark.parametrize("max_workers, chunk_size", [(1, 64), (2, 4)])
+def test_plan_cohort_matches_build_schedule(max_workers, chunk_size, monkeypatch):
+    circuit = ca.compile_prerequisites(random_catalog(3, n=40))
+    rng = random.Random(3)
+    # a few courses that are full before Pass 1 make some students infeasible
+    monkeypatch.setattr(ca, "COURSE_FILL_DAYS", {
+        c: rng.choice([0, 6, 9, None]) for c in rng.sample(circuit.courses, 6)
+    })
+    unique = [
+        (rng.choice([0, 20, 48, 92, 140]), rng.sample(circuit.courses, rng.randint(0, 6)))
+        for _ in range(30)
+    ]
+    # duplicates, with their completed courses in another order
+    profiles = unique + [(u, done[::-1]) for u, done in rng.sample(unique, 15)] + unique[:5]
+    rng.shuffle(profiles)
+
+    seen = {}
+    for i, plan in plan_cohort(profiles, circuit, max_workers=max_workers,
+                               chunk_size=chunk_size):
+        assert i not in seen
+        seen[i] = plan
+    assert sorted(seen) == list(range(len(profiles)))
+
+    failed = 0
+    for i, (units, done) in enumerate(profiles):
+        expected = _outcome(ca.build_schedule, units, circuit, done)
+        plan = seen[i]
+        if isinstance(plan, RuntimeError):
+            failed += 1
+            plan = ("RuntimeError", str(plan))
+        assert plan == expected
+    assert 0 < failed < len(profiles)
@@ -0,0 +1,51 @@
+import json
+from datetime import date, datetime
+
+import numpy as np
+
+import class_algorithmn as ca
+import fill_model as fm
+from seat_store import SeatStore
+
+
+PASS1_START = date(2026, 2, 9)
+
+
+def test_fit_fill_days_marks_unfitted_courses_unknown():
+    # course 0: two polls draining to 0 by day 3; course 1: one poll only;
+    # course 2: only polls before Pass 1; course 3: one poll that saw 0
+    idx = np.array([0, 0, 1, 2, 2, 3])
+    t = np.array([1.5, 2.5, 1.2, -3.0, -2.0, 4.5])
+    y = np.array([20.0, 10.0, 30.0, 5.0, 4.0, 0.0])
+    assert fm.fit_fill_days(idx, t, y, 4).tolist() == [3, -1, -1, 4]
+
+
+def test_fitted_and_observed_fill_days_agree():
+    # a line reaching 0 at t = 3.5 fills during day 3; a poll on that
+    # line seeing the zero later that day must not move it
+    idx = np.array([0, 0])
+    t = np.array([1.5, 2.5])
+    y = np.array([20.0, 10.0])
+    assert fm.fit_fill_days(idx, t, y, 1).tolist() == [3]
+    idx = np.append(idx, 0)
+    t = np.append(t, 3.6)
+    y = np.append(y, 0.0)
+    assert fm.fit_fill_days(idx, t, y, 1).tolist() == [3]
+
+
+def test_single_poll_keeps_embedded_fill_day(tmp_path):
+    db = str(tmp_path / "seat_history.sqlite")
+    table = str(tmp_path / "fill_days.json")
+    store = SeatStore(db)
+    store.record_counts([("UWP", "UWP 101", "12345", 25, 0, 0)], datetime(2026, 2, 9, 10))
+    store.close()
+
+    fm.refit(db, table, PASS1_START)
+    with open(table, encoding="utf-8") as f:
+        assert "UWP 101" not in json.load(f)["fill_days"]
+
+    try:
+        ca.load_fill_days(table)
+        assert ca.COURSE_FILL_DAYS["UWP 101"] == 3
+    finally:
+        ca.load_fill_days()
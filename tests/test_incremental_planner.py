@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+import class_algorithmn as ca
+import incremental_planner as ip
+from test_class_algorithmn import random_catalog
+
+
+def _outcome(fn, *args, **kwargs):
+    try:
+        return fn(*args, **kwargs)
+    except RuntimeError as e:
+        return str(e)
+
+
+def random_deltas(rng, circuit, n=60):
+    # (start_units, completed, added, removed, new_start_units)
+    for _ in range(n):
+        completed = rng.sample(circuit.courses, rng.randint(0, 4))
+        added = rng.sample(circuit.courses, rng.randint(0, 3))
+        removed = rng.sample(completed, min(len(completed), rng.randint(0, 1)))
+        units = rng.choice([0, 20, 48, 92])
+        new_units = rng.choice([None, units, units + 12, units + 40])
+        yield units, completed, added, removed, new_units
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_replan_matches_rebuild(seed, monkeypatch):
+    prereqs = random_catalog(seed)
+    circuit = ca.compile_prerequisites(prereqs)
+    rng = random.Random(seed)
+    monkeypatch.setattr(ca, "COURSE_FILL_DAYS", {
+        c: rng.choice([None, 6, 9, 12]) for c in rng.sample(circuit.courses, 6)
+    })
+    planner = ip.IncrementalPlanner(circuit)
+    config = planner.plan_config()
+
+    for units, completed, added, removed, new_units in random_deltas(rng, circuit):
+        old = _outcome(ca.build_schedule, units, circuit, completed)
+        if isinstance(old, str):
+            continue
+        done = (set(completed) - set(removed)) | set(added)
+        start = units if new_units is None else new_units
+        assert _outcome(planner.replan, old, units, completed, added, removed, new_units,
+                        config=config) == _outcome(ca.build_schedule, start, circuit, done)
+    assert planner.reused > 0
+
+
+def test_replan_ignores_plan_from_other_fill_days(monkeypatch):
+    circuit = ca.compile_prerequisites(ca.prerequisites)
+    planner = ip.IncrementalPlanner(circuit)
+    config = planner.plan_config()
+    old = ca.build_schedule(32, circuit)
+
+    # a refit that moves a course the old plan takes late
+    course = old[-1]["courses"][0]
+    fill_days = dict(ca.COURSE_FILL_DAYS)
+    fill_days[course] = 1
+    monkeypatch.setattr(ca, "COURSE_FILL_DAYS", fill_days)
+    assert planner.plan_config() != config
+
+    first = old[0]["courses"]
+    new_units = 32 + len(first) * ca.UNITS_PER_COURSE
+    expected = _outcome(ca.build_schedule, new_units, circuit, first)
+    for stale in (config, None):
+        assert _outcome(planner.replan, old, 32, added=first, new_start_units=new_units,
+                        config=stale) == expected
+    assert planner.reused == 0
+
+    # reusing it anyway would hand back the stale tail
+    reused = planner.replan(old, 32, added=first, new_start_units=new_units,
+                            config=planner.plan_config())
+    assert planner.reused > 0
+    assert reused != expected
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+import class_algorithmn as ca
+import optimal_planner as op
+from test_class_algorithmn import random_catalog
+
+
+def random_path(rng, circuit, steps=6):
+    # growing completed masks, each with the courses just added
+    done = 0
+    for _ in range(steps):
+        taken = circuit.mask_of(rng.sample(circuit.courses, rng.randint(1, 4))) & ~done
+        done |= taken
+        yield done, taken
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_incremental_bounds_match_full(seed):
+    circuit = ca.compile_prerequisites(random_catalog(seed))
+    rng = random.Random(seed)
+    for _ in range(10):
+        earliest = op.earliest_semesters(circuit, 0)
+        ready = op._ready(circuit, 0)
+        for done, taken in random_path(rng, circuit):
+            earliest = op.earliest_semesters(circuit, done, earliest, taken)
+            ready = op._ready(circuit, done, ready, taken)
+            assert earliest == op.earliest_semesters(circuit, done)
+            assert earliest == op._earliest_fixpoint(circuit, done)
+            assert ready == sum(
+                1 << i for i in range(len(circuit.courses))
+                if not circuit.needed_mask(i, done) & ~done
+            )
+
+
+def test_earliest_semesters_with_a_cycle():
+    circuit = ca.compile_prerequisites({
+        "A": {"type": "single", "course": "B"},
+        "B": {"type": "single", "course": "A"},
+        "C": {"type": "single", "course": "D"}
+    })
+    earliest = op.earliest_semesters(circuit, 0)
+    n = len(circuit.courses)
+    assert earliest[circuit.index["A"]] == earliest[circuit.index["B"]] == n + 1
+    assert earliest[circuit.index["C"]] == 2
+    assert earliest[circuit.index["D"]] == 1
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_optimal_is_feasible_and_no_longer_than_ready(seed):
+    circuit = ca.compile_prerequisites(random_catalog(seed, n=14))
+    stats = {}
+    try:
+        ready = ca.build_schedule_ready(0, circuit)
+    except RuntimeError:
+        return
+    plan = op.build_schedule_optimal(0, circuit, search_stats=stats)
+    assert stats["optimal"]
+    assert len(plan) <= len(ready)
+
+    done = set()
+    for s in plan:
+        assert len(s["courses"]) <= ca.MAX_COURSES_PER_SEMESTER
+        for c in s["courses"]:
+            assert ca.course_available(c, s["pass1_day"])
+            assert circuit.resolve(c, done) <= done
+        done |= set(s["courses"])
+    assert done == set(circuit.courses)
@@ -0,0 +1,73 @@
+import json
+import threading
+import http.client
+
+import pytest
+
+import class_algorithmn as ca
+import plan_service as ps
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(ca, "COURSE_FILL_DAYS", ca.COURSE_FILL_DAYS)
+    service = ps.PlanService(fill_table=str(tmp_path / "fill_days.json"))
+    httpd = ps.serve(service, port=0)
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    yield service, httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post(port, path, body):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read())
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("body", [
+    b"[1, 2]",
+    b"\"STA 013\"",
+    b"null",
+    b"not json",
+    b'{"completed": "STA 013"}',
+    b'{"completed": [["STA 013"]]}',
+    b'{"completed": {"STA 013": true}}',
+    b'{"start_units": [32]}',
+    b'{"start_units": true}',
+    b'{"start_units": "lots"}',
+    b'{"planner": ["greedy"]}',
+    b'{"planner": "fastest"}',
+])
+def test_bad_bodies_get_400(server, body):
+    service, port = server
+    status, data = post(port, "/plan", body)
+    assert status == 400
+    assert "error" in data
+    assert service.errors == 1
+
+
+def test_post_plan_matches_build_schedule(server):
+    service, port = server
+    status, data = post(port, "/plan", json.dumps(
+        {"start_units": 32, "completed": ["STA 013"]}).encode())
+    assert status == 200
+    assert data["plan"] == ca.build_schedule(32, service.circuit, ["STA 013"])
+
+
+def test_reload_swaps_fill_days(server, tmp_path):
+    service, _ = server
+    before = ca.COURSE_FILL_DAYS
+    with open(tmp_path / "fill_days.json", "w", encoding="utf-8") as f:
+        json.dump({"fill_days": {"STA 013": 9}}, f)
+    service.reload()
+
+    # a new dict, so a plan holding the old one never sees it emptied
+    assert ca.COURSE_FILL_DAYS is not before
+    assert before == ca.read_fill_days(str(tmp_path / "missing.json"))
+    assert ca.COURSE_FILL_DAYS["STA 013"] == 9
+    assert service.plan(32) == ca.build_schedule(32, service.circuit)
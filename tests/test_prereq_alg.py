@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+import prereq_alg as pa
+from synthetic_catalog import generate_catalog
+
+
+# the cases where merging tokenize()'s passes could go wrong
+TOKENIZER_EDGE_CASES = [
+    "",
+    ".",
+    "ECS 036A C- or better.",
+    "ECS 036A c- or BETTER; MAT 021A (can be concurrent)",
+    "MAT 021A (Can Be Concurrent) or MAT 017A {or equivalent}.",
+    "A{x}B or better",                  # brace removal joins words first
+    "STA B 035A",                       # grade removal joins subject and number
+    "STA {note} 035A",
+    "ECS 020 C- C- or better",          # C- before another "<grade> or better"
+    "ECS 020 C- B or better",
+    "ECS 020 or C-better",              # leaves an "or better" behind
+    "ECS 020 or C-C-better",
+    "ECS 020 or better",
+    "C- or better in ECS 020, D or better in ECS 032A",
+    "(ECS 036A or ECS 036B), (MAT 021A; MAT 021B).",
+    "{unclosed ECS 020 or ECS 032A",
+    "ECS 020,MAT 021A;STA 013.Restricted",
+]
+
+
+@pytest.mark.parametrize("expr", TOKENIZER_EDGE_CASES)
+def test_tokenize_fast_matches_tokenize(expr):
+    assert pa.tokenize_fast(expr) == pa.tokenize(expr)
+
+
+def test_tokenize_fast_matches_tokenize_on_catalog():
+    _, texts = generate_catalog(2000, seed=5)
+    for expr in texts:
+        assert pa.tokenize_fast(expr) == pa.tokenize(expr)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_bulk_json_matches_parse_prereq_json(max_workers, monkeypatch):
+    codes, texts = generate_catalog(1500, seed=3)
+    monkeypatch.setattr(pa, "BULK_POOL_MIN", 100)   # make the pool path run too
+    expected = pa.parse_prereq_json(codes, texts)
+    stats = {}
+    bulk = pa.parse_prereq_json_bulk(codes, texts, max_workers=max_workers,
+                                     chunk_size=200, stats=stats)
+    assert json.dumps(bulk, indent=2) == json.dumps(expected, indent=2)
+    assert stats["courses"] == len(codes)
+
+
+def random_tokens(rng, n):
+    # includes malformed lists: stray ')', unclosed '(', dangling operators
+    pool = ["ECS 020", "MAT 021A", "STA 013", "PHY 009A", "(", ")", "or", "OR", ",", ";"]
+    weights = [3, 3, 3, 3, 2, 2, 2, 1, 2, 2]
+    return rng.choices(pool, weights, k=n)
+
+
+def test_parse_iterative_matches_parse():
+    import random
+    rng = random.Random(6)
+    for _ in range(20_000):
+        tokens = random_tokens(rng, rng.randint(0, 14))
+        assert pa.parse_iterative(tokens) == pa.parse(tokens), tokens
+
+
+def test_parse_iterative_matches_parse_on_catalog():
+    _, texts = generate_catalog(2000, seed=7)
+    assert pa.diff_parsers(texts) == []
+
+
+@pytest.mark.parametrize("expr, position, token", [
+    ("ECS 020 or , MAT 021A", 2, ","),
+    (", ECS 020", 0, ","),
+    ("(ECS 020 or MAT 021A", 0, "("),
+    ("(ECS 020, (MAT 021A or STA 013)", 0, "("),
+    ("ECS 020 ) , MAT 021A", 1, ")"),
+    ("( ) ECS 020", 1, ")"),
+    ("ECS 020 or", 1, "or"),
+    ("ECS 020; MAT 021A,", 3, ","),
+])
+def test_parse_iterative_strict_errors(expr, position, token):
+    tokens = pa.tokenize_fast(expr)
+    with pytest.raises(pa.PrereqSyntaxError) as e:
+        pa.parse_iterative(tokens, strict=True)
+    assert (e.value.position, e.value.token) == (position, token)
+
+
+@pytest.mark.parametrize("expr", [
+    "",
+    "ECS 020",
+    "; ; ECS 020 ; MAT 021A;",        # empty ';' groups are allowed
+    "(ECS 020 or MAT 021A), (STA 013; PHY 009A).",
+])
+def test_parse_iterative_strict_accepts(expr):
+    tokens = pa.tokenize_fast(expr)
+    assert pa.parse_iterative(tokens, strict=True) == pa.parse(tokens)
@@ -0,0 +1,64 @@
+from datetime import date, datetime
+
+import numpy as np
+
+import class_algorithmn as ca
+import fill_model as fm
+import registration_sim as rs
+from seat_store import SeatStore
+
+
+def test_unfitted_history_falls_back_to_table(tmp_path):
+    db = str(tmp_path / "seat_history.sqlite")
+    store = SeatStore(db)
+    store.record_counts([("UWP", "UWP 101", "12345", 25, 0, 0)], datetime(2026, 2, 9, 10))
+    store.close()
+
+    model = rs.load_distribution(db, date(2026, 2, 9))
+    mean, _ = model.lookup(["UWP 101"])
+    assert mean[0] == ca.COURSE_FILL_DAYS["UWP 101"] - 0.5
+
+
+def test_zero_spread_matches_course_available(monkeypatch):
+    fill_days = {"STA 013": None, "STA 032": 12, "UWP 101": 9, "MAT 021A": 6, "ECS 036A": 3}
+    plan = [
+        {"semester": 1, "units_before": 60, "pass1_day": 9, "courses": list(fill_days)},
+        {"semester": 2, "units_before": 140, "pass1_day": 3, "courses": list(fill_days)},
+    ]
+    monkeypatch.setattr(rs, "TERM_SIGMA", 0.0)
+    monkeypatch.setattr(ca, "COURSE_FILL_DAYS", fill_days)
+    model = rs.table_distribution(fill_days)
+    model.sd[:] = 0
+
+    result = rs.simulate_plan(plan, model, trials=100, rng=np.random.default_rng(0))
+    for semester in result["semesters"]:
+        for course, p in semester["courses"].items():
+            assert p == float(ca.course_available(course, semester["pass1_day"]))
+    assert result["semesters"][0]["p_all"] == 0.0
+    assert result["semesters"][1]["p_all"] == 1.0
+
+
+def test_fitted_course_matches_fit_fill_days(monkeypatch):
+    # course 0 drains to 0 at t = 3.5 (day 3), course 1 at t = 6.25 (day 6),
+    # course 2 was seen full on day 5
+    names = np.array(["ECS 036A", "MAT 021A", "STA 032"], dtype=object)
+    idx = np.array([0, 0, 1, 1, 2])
+    t = np.array([1.5, 2.5, 1.25, 2.25, 5.4])
+    y = np.array([20.0, 10.0, 50.0, 40.0, 0.0])
+    fill_days = {str(c): int(d) for c, d in zip(names, fm.fit_fill_days(idx, t, y, 3))}
+    assert fill_days == {"ECS 036A": 3, "MAT 021A": 6, "STA 032": 5}
+
+    monkeypatch.setattr(rs, "TERM_SIGMA", 0.0)
+    monkeypatch.setattr(rs, "MIN_SIGMA", 0.0)
+    monkeypatch.setattr(ca, "COURSE_FILL_DAYS", fill_days)
+    model = rs.fit_distribution(names, idx, t, y)
+    model.sd[:] = 0
+
+    plan = [
+        {"semester": s, "units_before": 0, "pass1_day": day, "courses": list(fill_days)}
+        for s, day in enumerate(range(1, ca.PASS1_TOTAL_DAYS + 1), start=1)
+    ]
+    result = rs.simulate_plan(plan, model, trials=10, rng=np.random.default_rng(0))
+    for semester in result["semesters"]:
+        for course, p in semester["courses"].items():
+            assert p == float(ca.course_available(course, semester["pass1_day"]))
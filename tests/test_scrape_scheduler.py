@@ -0,0 +1,67 @@
+import os
+import time
+from functools import partial
+
+import pytest
+
+pytest.importorskip("undetected_chromedriver")
+pytest.importorskip("selenium")
+
+import data_collect_webscrap as dc
+
+
+def fake_scrape(marks, subject, extra, stats):
+    # a stand-in backend; "first" is per subject across worker processes
+    mark = os.path.join(marks, subject)
+    first = not os.path.exists(mark)
+    open(mark, "a").close()
+    if subject == "FLAKY" and first:
+        raise ConnectionError("reset by peer")
+    if subject == "DIE" and first:
+        os._exit(3)
+    if subject == "HANG" and first:
+        time.sleep(60)
+    if subject == "ALWAYSDIE":
+        os._exit(4)
+    stats["rows"] = 1
+    return [[subject, "1", "N/A", f"{subject} 001", "A01", "Open: 1", "TBA"]]
+
+
+@pytest.fixture(autouse=True)
+def quick_retries(monkeypatch):
+    monkeypatch.setattr(dc, "RETRY_BASE", 0.05)
+    monkeypatch.setattr(dc, "RETRY_MAX", 0.1)
+    monkeypatch.setattr(dc, "STOP_GRACE", 5)
+
+
+def run(tmp_path, subjects, **kwargs):
+    errors, totals = [], {}
+    backend = partial(fake_scrape, str(tmp_path))
+    out = dict(dc.scrape_all(subjects, backend, workers=3, errors=errors,
+                             totals=totals, **kwargs))
+    return out, errors, totals
+
+
+def test_failed_shard_is_retried(tmp_path):
+    out, errors, totals = run(tmp_path, ["A", "FLAKY", "B"])
+    assert sorted(out) == ["A", "B", "FLAKY"]
+    assert out["FLAKY"][0][3] == "FLAKY 001"
+    assert errors == []
+    assert totals["retries"] == 1
+    assert totals["rows"] == 3
+
+
+def test_dead_worker_is_replaced_and_its_shard_requeued(tmp_path):
+    out, errors, totals = run(tmp_path, ["A", "DIE", "B", "ALWAYSDIE", "C"])
+    assert sorted(out) == ["A", "B", "C", "DIE"]
+    assert errors == [("ALWAYSDIE", "scraper process exited with code 4")]
+    assert totals["retries"] == 1 + (dc.MAX_ATTEMPTS - 1)
+
+
+def test_hung_shard_times_out_and_is_retried(tmp_path):
+    t0 = time.monotonic()
+    out, errors, totals = run(tmp_path, ["A", "HANG", "B"], task_timeout=1)
+    assert time.monotonic() - t0 < 30
+    assert sorted(out) == ["A", "B", "HANG"]
+    assert errors == []
+    assert totals["retries"] == 1
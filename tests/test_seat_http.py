@@ -0,0 +1,75 @@
+import pytest
+
+import seat_http as sh
+
+
+# pages as record_pages() saves them: the search form, and one result
+# page per subject with table#mc_win as the registrar lays it out
+INDEX_HTML = """<html><body>
+<form name="search" action="course_search_results.cfm" method="post">
+<select name="termCode"><option value="">--</option><option value="202603">Spring Quarter 2026</option></select>
+<select name="subject"><option value="">Any</option><option value="ECL">ECL</option><option value="STA">STA</option></select>
+<select name="level"><option value=""> Any </option><option value="LD">Lower Division</option><option value="UD">Upper Division</option></select>
+<input type="submit" name="search" value="Search">
+</form></body></html>"""
+
+ECL_HTML = """<html><body><table id="mc_win"><tbody>
+<tr bgcolor="#CCCCCC"><td><strong>CRN</strong></td><td>Course</td><td>Section</td><td>Units</td><td>Instructor</td></tr>
+<tr bgcolor="#FFFFFF"><td><strong>40123</strong><br><em>10:00 - 10:50 AM, MWF</em></td><td>ECL 010<br>Intro &amp; Stuff</td><td>A01<br><em>Open: 5 / Reserved: 0 / Waitlist: 0</em></td><td>4</td><td>Smith, J<br>Extra</td></tr>
+<tr bgcolor="#EEEEEE"><td><strong>40124</strong></td><td>ECL 010</td><td>A02</td><td>4</td><td></td>
+<tr bgcolor="#EEEEEE"><td><strong>40125</strong><br><em>TBA</em></td><td>ECL 190</td><td>001<br><em>Open: 0 / Reserved: 2 / Waitlist: 7</em></td><td>1-5</td><td>  Lee,   K  </td></tr>
+<tr><td><strong>99999</strong></td><td>no bgcolor</td><td>x</td><td>x</td><td>x</td></tr>
+</tbody></table></body></html>"""
+
+# what scrape_with_driver builds from the same page: first line of each
+# cell, "N/A" for a missing time or seat count, "TBA" for no instructor
+ECL_ROWS = [
+    ["ECL", "40123", "10:00 - 10:50 AM, MWF", "ECL 010", "A01",
+     "Open: 5 / Reserved: 0 / Waitlist: 0", "Smith, J"],
+    ["ECL", "40124", "N/A", "ECL 010", "A02", "N/A", "TBA"],
+    ["ECL", "40125", "TBA", "ECL 190", "001",
+     "Open: 0 / Reserved: 2 / Waitlist: 7", "Lee, K"],
+]
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / "index.html").write_text(INDEX_HTML, encoding="utf-8")
+    (tmp_path / "ECL.html").write_text(ECL_HTML, encoding="utf-8")
+    httpd, url = sh.start_recorded_server(str(tmp_path))
+    sh._form_cache.clear()
+    yield url
+    httpd.shutdown()
+    httpd.server_close()
+    sh._form_cache.clear()
+
+
+def test_recorded_page_rows_match_selenium_layout(server):
+    session = sh.HttpSession()
+    try:
+        assert sh.search_form(session, server) == (
+            server.rsplit("/", 1)[0] + "/course_search_results.cfm", "POST"
+        )
+        rows = sh.scrape_subject_http("ECL", session, search_url=server)
+        # a shard's extra field goes along with the form
+        assert sh.scrape_subject_http("ECL", session, search_url=server,
+                                      extra={"level": "LD"}) == rows
+    finally:
+        session.close()
+    assert rows == ECL_ROWS
+    assert all(len(row) == 7 for row in rows)
+
+
+def test_missing_subject_page_is_an_error(server):
+    with pytest.raises(RuntimeError, match="HTTP 404"):
+        sh.scrape_subject_http("STA", search_url=server)
+
+
+def test_form_options(server):
+    session = sh.HttpSession()
+    try:
+        assert sh.search_options(session, "subject", server) == ["ECL", "STA"]
+        assert sh.search_options(session, "level", server) == ["LD", "UD"]
+        assert sh.search_options(session, "college", server) == []
+    finally:
+        session.close()
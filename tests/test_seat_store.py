@@ -0,0 +1,60 @@
+import csv
+import sqlite3
+from datetime import datetime
+
+from seat_store import SeatStore
+
+
+TRACKER_HEADER = ["Course", "First Seen", "Total Open", "Days to Zero"]
+
+
+def write_tracker(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=TRACKER_HEADER)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def read_tracker(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return {r["Course"]: r for r in csv.DictReader(f)}
+
+
+def test_export_keeps_seeded_courses_not_polled_yet(tmp_path):
+    tracker = str(tmp_path / "course_open_tracker.csv")
+    write_tracker(tracker, [
+        {"Course": "STA 013", "First Seen": "2026-01-20", "Total Open": 40, "Days to Zero": ""},
+        {"Course": "UWP 101", "First Seen": "2026-01-21", "Total Open": 0, "Days to Zero": 5},
+        {"Course": "ECS 036A", "First Seen": "2026-01-22", "Total Open": "", "Days to Zero": ""},
+    ])
+    store = SeatStore(str(tmp_path / "seat_history.sqlite"))
+    assert store.import_tracker_csv(tracker) == 3
+    store.record_counts([("STA", "STA 013", "11111", 12, 0, 0),
+                         ("MAT", "MAT 021A", "22222", 0, 0, 3)], datetime(2026, 2, 9, 10))
+    store.export_tracker_csv(tracker)
+    store.close()
+
+    rows = read_tracker(tracker)
+    assert sorted(rows) == ["ECS 036A", "MAT 021A", "STA 013", "UWP 101"]
+    assert rows["STA 013"] == {"Course": "STA 013", "First Seen": "2026-01-20",
+                               "Total Open": "12", "Days to Zero": ""}
+    assert rows["UWP 101"] == {"Course": "UWP 101", "First Seen": "2026-01-21",
+                               "Total Open": "0", "Days to Zero": "5"}
+    assert rows["ECS 036A"]["Total Open"] == ""
+    assert rows["MAT 021A"] == {"Course": "MAT 021A", "First Seen": "2026-02-09",
+                                "Total Open": "0", "Days to Zero": "0"}
+
+
+def test_store_seeded_before_total_open_column(tmp_path):
+    db = str(tmp_path / "seat_history.sqlite")
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE course_seed (course TEXT PRIMARY KEY, "
+                 "first_seen TEXT NOT NULL, days_to_zero INTEGER)")
+    conn.execute("INSERT INTO course_seed VALUES ('UWP 101', '2026-01-21', 5)")
+    conn.commit()
+    conn.close()
+
+    store = SeatStore(db)
+    assert store.tracker_rows() == [{"Course": "UWP 101", "First Seen": "2026-01-21",
+                                     "Total Open": "", "Days to Zero": 5}]
+    store.close()
@@ -0,0 +1,35 @@
+from timetable import Section, parse_meetings, meeting_mask, solve_semester
+
+
+def test_space_separated_days():
+    assert parse_meetings("12:10 - 1:00 PM, Tu Th") == [("TR", 730, 780)]
+    assert parse_meetings("10:00 - 10:50 AM, M W F") == [("MWF", 600, 650)]
+    assert parse_meetings("10:00 - 10:50 AM, MWF\n2:10 - 3:00 PM, R") == [
+        ("MWF", 600, 650), ("R", 850, 900)
+    ]
+    assert parse_meetings("TBA") == []
+
+
+def test_clash_on_second_day_is_seen():
+    assert meeting_mask("12:10 - 1:00 PM, Tu Th") & meeting_mask("12:30 - 1:20 PM, R")
+
+
+def _sections(course, *times):
+    return [Section(str(100 + n), course, f"A0{n}", t, 5, "TBA") for n, t in enumerate(times)]
+
+
+def test_no_fit_and_budget_are_different():
+    by_course = {
+        "STA 013": _sections("STA 013", "12:10 - 1:00 PM, Tu Th"),
+        "STA 032": _sections("STA 032", "12:30 - 1:20 PM, R"),
+    }
+    assert solve_semester(["STA 013", "STA 032"], by_course) is None
+
+    by_course["STA 032"] += _sections("STA 032", "9:00 - 9:50 AM, M W F")
+    table = solve_semester(["STA 013", "STA 032"], by_course)
+    assert table["status"] == "ok"
+    assert table["sections"]["STA 032"]["time_days"] == "9:00 - 9:50 AM, M W F"
+
+    stopped = solve_semester(["STA 013", "STA 032"], by_course, max_nodes=0)
+    assert stopped["status"] == "budget_exhausted"
+    assert stopped["sections"] == {}
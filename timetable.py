@@ -0,0 +1,247 @@
+import re
+import csv
+
+import class_algorithmn as ca
+from seat_store import parse_seat_counts
+
+
+# Section-level check of a course plan. Every section's Time/Days text
+# becomes a weekly bitmask of 5-minute slots, so two sections clash
+# exactly when their masks AND to non-zero. For each planned semester
+# a depth-first search picks one section per course:
+#   - sections of a course with the same meeting times are one option
+#     (the one with the most open seats represents the rest)
+#   - the course with the fewest options is placed first
+#   - after each placement every later course must still have an
+#     option that fits (forward check), otherwise the branch is cut
+#   - options with open seats are tried first; the combination with
+#     the most open sections wins, and the search stops once no later
+#     course could add another
+# Only the current term's sections are scraped, so later semesters
+# are checked against the same timetable.
+
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+DAY_INDEX = {"M": 0, "T": 1, "W": 2, "R": 3, "F": 4, "S": 5, "U": 6}
+
+_TIME_RANGE = re.compile(
+    r"(\d{1,2}):(\d{2})\s*([AP]M)?\s*-\s*(\d{1,2}):(\d{2})\s*([AP]M)?", re.IGNORECASE
+)
+_DAY_ALIASES = re.compile(r"Tu|Th|Sa|Su")
+_DAYS = re.compile(r"\b([MTWRFSU]{1,7})\b")
+_COURSE_CODE = re.compile(r"\b([A-Z]{2,4}) (\d{3}[A-Z]{0,2})\b")
+
+MAX_NODES = 100_000
+
+
+# ───────────────────────── Meeting Times ─────────────────────────
+
+def _to_minutes(hour, minute, meridiem):
+    hour = int(hour) % 12 if meridiem else int(hour)
+    if meridiem and meridiem.upper() == "PM":
+        hour += 12
+    return hour * 60 + int(minute)
+
+
+def parse_meetings(text: str):
+    # "10:00 - 10:50 AM, MWF\n2:10 - 3:00 PM, Tu Th" ->
+    #   [("MWF", 600, 650), ("TR", 850, 900)]; TBA / N/A -> []
+    meetings = []
+    for line in (text or "").splitlines():
+        line = _DAY_ALIASES.sub(lambda m: {"Tu": "T", "Th": "R", "Sa": "S", "Su": "U"}[m.group()], line)
+        times = list(_TIME_RANGE.finditer(line))
+        for n, m in enumerate(times):
+            # every day token up to the next time range belongs to this one
+            # ("M W F" as well as "MWF"); failing that, the ones before it
+            after = line[m.end():times[n + 1].start() if n + 1 < len(times) else len(line)]
+            before = line[times[n - 1].end() if n else 0:m.start()]
+            d = "".join(_DAYS.findall(after)) or "".join(_DAYS.findall(before))
+            if not d:
+                continue
+            h1, m1, ap1, h2, m2, ap2 = m.groups()
+            end = _to_minutes(h2, m2, ap2)
+            start = _to_minutes(h1, m1, ap1 or ap2)
+            if start > end and not ap1:
+                # "11:00 - 12:50 PM": only the end carries the meridiem
+                start = _to_minutes(h1, m1, "AM")
+            meetings.append(("".join(dict.fromkeys(d)), start, end))
+    return meetings
+
+
+def meeting_mask(text: str) -> int:
+    mask = 0
+    for days, start, end in parse_meetings(text):
+        first = start // SLOT_MINUTES
+        last = -(-end // SLOT_MINUTES)   # a class ending 9:50 holds 9:45-9:50
+        span = ((1 << (last - first)) - 1) << first
+        for d in days:
+            mask |= span << (DAY_INDEX[d] * SLOTS_PER_DAY)
+    return mask
+
+
+# ───────────────────────── Section Index ─────────────────────────
+
+class Section:
+    __slots__ = ("crn", "course", "section", "time_days", "mask", "open", "instructor")
+
+    def __init__(self, crn, course, section, time_days, open_seats, instructor):
+        self.crn = crn
+        self.course = course
+        self.section = section
+        self.time_days = time_days
+        self.mask = meeting_mask(time_days)
+        self.open = open_seats
+        self.instructor = instructor
+
+    def as_dict(self):
+        return {
+            "crn": self.crn,
+            "section": self.section,
+            "time_days": self.time_days,
+            "open": self.open,
+            "instructor": self.instructor
+        }
+
+
+def course_code(text: str):
+    m = _COURSE_CODE.search(text or "")
+    return f"{m.group(1)} {m.group(2)}" if m else (text or "").strip()
+
+
+def index_sections(rows):
+    # scraper rows: [subject, crn, time_days, course, section, open_wait, instructor]
+    by_course = {}
+    seen = set()
+    for row in rows:
+        if row[1] in seen:
+            continue
+        seen.add(row[1])
+        code = course_code(row[3])
+        by_course.setdefault(code, []).append(
+            Section(row[1], code, row[4], row[2], parse_seat_counts(row[5])[0], row[6])
+        )
+    return by_course
+
+
+def load_sections(courses_csv: str):
+    with open(courses_csv, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return index_sections(reader)
+
+
+# ───────────────────────── Solver ─────────────────────────
+
+def _options(sections):
+    # one option per distinct meeting mask, best-stocked section first
+    groups = {}
+    for s in sections:
+        groups.setdefault(s.mask, []).append(s)
+    options = [
+        (mask, sorted(group, key=lambda s: -s.open))
+        for mask, group in groups.items()
+    ]
+    options.sort(key=lambda o: -o[1][0].open)
+    return options
+
+
+def solve_semester(courses, sections_by_course, max_nodes=MAX_NODES):
+    # -> {"status", "sections": {course: section dict + alternatives},
+    #     "missing": [...], "open_sections": n, "nodes": n}, or None when no
+    #     combination fits. status is "ok", or "budget_exhausted" when the
+    #     search stopped after max_nodes: "sections" is then the best
+    #     combination found so far, or {} if none was
+    courses = list(dict.fromkeys(courses))   # build_schedule can list a course twice
+    missing = [c for c in courses if not sections_by_course.get(c)]
+    courses = [c for c in courses if sections_by_course.get(c)]
+    options = sorted(
+        ((c, _options(sections_by_course[c])) for c in courses),
+        key=lambda o: len(o[1])
+    )
+    n = len(options)
+
+    # bound: each later course adds at most one open section, and only
+    # if it has one at all
+    can_open = [int(opts[0][1][0].open > 0) for _, opts in options]
+    open_left = [0] * (n + 1)
+    for d in range(n - 1, -1, -1):
+        open_left[d] = open_left[d + 1] + can_open[d]
+
+    chosen = [None] * n
+    best = None
+    best_score = (-1, -1)
+    nodes = 0
+
+    def search(d, used, n_open, seats):
+        nonlocal best, best_score, nodes
+        if best is not None and n_open + open_left[d] <= best_score[0]:
+            return
+        if d == n:
+            best_score = (n_open, seats)
+            best = list(chosen)
+            return
+
+        nodes += 1
+        if nodes > max_nodes:
+            return
+
+        for mask, group in options[d][1]:
+            if mask & used:
+                continue
+            now_used = used | mask
+            if any(all(m & now_used for m, _ in options[e][1]) for e in range(d + 1, n)):
+                continue
+            chosen[d] = group
+            top = group[0]
+            search(d + 1, now_used, n_open + (top.open > 0), seats + top.open)
+            if best_score[0] == open_left[0]:
+                return   # nothing left to improve
+
+    search(0, 0, 0, 0)
+    exhausted = nodes > max_nodes
+    if best is None and not exhausted:
+        return None
+
+    sections = {}
+    for (course, _), group in zip(options, best or ()):
+        picked = group[0].as_dict()
+        picked["alternatives"] = [s.crn for s in group[1:]]
+        sections[course] = picked
+    return {
+        "status": "budget_exhausted" if exhausted else "ok",
+        "sections": sections,
+        "missing": missing,
+        "open_sections": max(best_score[0], 0),
+        "nodes": nodes
+    }
+
+
+def timetable_plan(plan, sections_by_course, max_nodes=MAX_NODES):
+    # copy of a build_schedule plan with a "timetable" entry per
+    # semester (None when its courses cannot all be fitted; see
+    # solve_semester for a search that ran out of nodes)
+    out = []
+    for semester in plan:
+        entry = dict(semester)
+        entry["timetable"] = solve_semester(semester["courses"], sections_by_course, max_nodes)
+        out.append(entry)
+    return out
+
+
+if __name__ == "__main__":
+    save_dir = r"C:/Users/PC4/OneDrive/Desktop/reg classproject"
+    sections = load_sections(save_dir + "/all_courses.csv")
+
+    for s in timetable_plan(ca.build_schedule(start_units=32), sections):
+        print(f"\nSemester {s['semester']}")
+        table = s["timetable"]
+        if table is None:
+            print("  ❌ No conflict-free combination of sections")
+            continue
+        if table["status"] == "budget_exhausted":
+            print(f"  ⚠️ Search stopped after {table['nodes']} nodes; "
+                  + ("best combination so far" if table["sections"] else "nothing fitted yet"))
+        for course, sec in table["sections"].items():
+            print(f"   - {course} CRN {sec['crn']} {sec['time_days']!r} ({sec['open']} open)")
+        if table["missing"]:
+            print(f"  ⚠️ No sections found for {', '.join(table['missing'])}")